@@ -0,0 +1,285 @@
+"""Record and replay of LLM answers, keyed by the hash of the rendered prompt.
+
+``CassetteChatModel`` wraps the chat model of a backend. In "record" mode
+every call goes to the wrapped model and its answer is appended to the
+cassette; in "replay" mode answers come from the cassette without any
+network access, after an optional synthetic latency; "passthrough" only
+forwards calls, to measure the wrapper itself. A prompt that was never
+recorded raises ``CassetteMissError`` on replay.
+
+The key covers the messages, the bound tools and the wrapped model, so a
+change to a prompt template or schema is a miss rather than a stale answer.
+Cassettes are gzipped JSON Lines, appended to as calls are recorded.
+"""
+
+import gzip
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    message_chunk_to_message,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from core.exceptions import CassetteMissError, ConfigurationError
+
+CASSETTE_MODES = ("record", "replay", "passthrough")
+
+# the wrapper reports the run; the wrapped model must not stream its tokens
+# to the same callbacks a second time
+WRAPPED_CONFIG = {"callbacks": []}
+
+
+class Cassette:
+    """Recorded answers by prompt hash, loaded from and appended to a file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.answers: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            # every recorded call is its own gzip member, read as one stream
+            with gzip.open(self.path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    entry = json.loads(line)
+                    self.answers[entry["key"]] = entry["message"]
+
+    def get(self, key: str) -> Optional[AIMessage]:
+        answer = self.answers.get(key)
+
+        return messages_from_dict([answer])[0] if answer is not None else None
+
+    def put(self, key: str, message: BaseMessage):
+        # replayed answers get a new id every time, like live ones
+        answer = message_to_dict(message.model_copy(update={"id": None}))
+        line = json.dumps({"key": key, "message": answer}, ensure_ascii=False)
+
+        with self._lock:
+            self.answers[key] = answer
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            with gzip.open(self.path, "at", encoding="utf-8") as file:
+                file.write(line + "\n")
+
+
+_cassettes: Dict[str, Cassette] = {}
+
+
+def open_cassette(path: str) -> Cassette:
+    """Get the process-wide cassette of a file, shared by every wrapped model."""
+    if path not in _cassettes:
+        _cassettes[path] = Cassette(path)
+
+    return _cassettes[path]
+
+
+class CassetteChatModel(BaseChatModel):
+    """Chat model recording or replaying the answers of a wrapped model.
+
+    Replayed answers are delayed by ``latency`` plus
+    ``latency_per_output_char`` for each character, and streamed
+    ``stream_chunk_chars`` at a time, like the fake model.
+    """
+
+    wrapped: BaseChatModel
+    cassette: Any
+    mode: str = "replay"
+    latency: float = 0.0
+    latency_per_output_char: float = 0.0
+    stream_chunk_chars: int = 16
+
+    @property
+    def _llm_type(self) -> str:
+        # the provider's scheduler and rate limits still apply
+        return self.wrapped._llm_type
+
+    @property
+    def model_id(self) -> str:
+        """Identifier of the wrapped model, used to version cached translations."""
+        return (
+            getattr(self.wrapped, "model", None)
+            or getattr(self.wrapped, "model_id", None)
+            or self.wrapped._llm_type
+        )
+
+    def bind_tools(
+        self, tools: Sequence[Any], tool_choice: Any = None, **kwargs: Any
+    ) -> Any:
+        return self.bind(tools=list(tools), tool_choice=tool_choice, **kwargs)
+
+    def _key(self, messages: List[BaseMessage], kwargs: Dict[str, Any]) -> str:
+        prompt = {
+            "model": self.model_id,
+            "messages": [[message.type, message.content] for message in messages],
+            "tools": [convert_to_openai_tool(tool) for tool in kwargs.get("tools", [])],
+            "tool_choice": kwargs.get("tool_choice"),
+        }
+        encoded = json.dumps(prompt, sort_keys=True, ensure_ascii=False, default=str)
+
+        return hashlib.sha256(encoded.encode()).hexdigest()[:32]
+
+    def _wrapped_call(self, kwargs: Dict[str, Any]) -> Tuple[BaseChatModel, dict]:
+        """The wrapped model and the arguments of a call, with any tools bound."""
+        tools = kwargs.pop("tools", None)
+
+        if not tools:
+            return self.wrapped, {}
+
+        # the binding's own invoke would merge in the callbacks of the current run
+        binding = self.wrapped.bind_tools(tools, **kwargs)
+
+        return binding.bound, binding.kwargs
+
+    def _replayed(self, key: str) -> AIMessage:
+        message = self.cassette.get(key)
+
+        if message is None:
+            raise CassetteMissError(key)
+
+        return message
+
+    def _output(self, message: AIMessage) -> str:
+        if message.tool_calls:
+            return json.dumps(message.tool_calls[0]["args"], ensure_ascii=False)
+
+        return message.text()
+
+    def _latency_for(self, message: AIMessage) -> float:
+        return self.latency + self.latency_per_output_char * len(self._output(message))
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        key = self._key(messages, kwargs)
+
+        if self.mode == "replay":
+            message = self._replayed(key)
+            time.sleep(self._latency_for(message))
+        else:
+            model, call_kwargs = self._wrapped_call(kwargs)
+            message = model.invoke(messages, WRAPPED_CONFIG, stop=stop, **call_kwargs)
+
+            if self.mode == "record":
+                self.cassette.put(key, message)
+
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        key = self._key(messages, kwargs)
+
+        if self.mode == "replay":
+            message = self._replayed(key)
+            await asyncio.sleep(self._latency_for(message))
+        else:
+            model, call_kwargs = self._wrapped_call(kwargs)
+            message = await model.ainvoke(
+                messages, WRAPPED_CONFIG, stop=stop, **call_kwargs
+            )
+
+            if self.mode == "record":
+                self.cassette.put(key, message)
+
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        key = self._key(messages, kwargs)
+
+        if self.mode == "replay":
+            chunks = self._replay_chunks(self._replayed(key))
+        else:
+            model, call_kwargs = self._wrapped_call(kwargs)
+            chunks = model.astream(messages, WRAPPED_CONFIG, stop=stop, **call_kwargs)
+
+        gathered = None
+
+        async for chunk in chunks:
+            gathered = chunk if gathered is None else gathered + chunk
+            yield ChatGenerationChunk(message=chunk)
+
+        if self.mode == "record" and gathered is not None:
+            self.cassette.put(key, message_chunk_to_message(gathered))
+
+    async def _replay_chunks(self, message: AIMessage) -> AsyncIterator[AIMessageChunk]:
+        """A recorded answer as the wrapped model would have streamed it."""
+        output = self._output(message)
+        pieces = [
+            output[start : start + self.stream_chunk_chars]
+            for start in range(0, len(output), self.stream_chunk_chars)
+        ] or [""]
+        # paced against the start so sleep overshoot does not accumulate
+        started = time.perf_counter()
+        generated = 0
+
+        for index, piece in enumerate(pieces):
+            generated += len(piece)
+            deadline = self.latency + self.latency_per_output_char * generated
+            await asyncio.sleep(max(0.0, deadline - (time.perf_counter() - started)))
+            first, last = index == 0, index == len(pieces) - 1
+            extra = {"usage_metadata": message.usage_metadata} if last else {}
+
+            if message.tool_calls:
+                call = message.tool_calls[0]
+                yield AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": call["name"] if first else None,
+                            "args": piece,
+                            "id": call["id"] if first else None,
+                            "index": 0,
+                        }
+                    ],
+                    **extra,
+                )
+            else:
+                yield AIMessageChunk(content=piece, **extra)
+
+
+def wrap_with_cassette(
+    llm: BaseChatModel,
+    mode: str,
+    path: str,
+    latency: float = 0.0,
+    latency_per_output_char: float = 0.0,
+) -> CassetteChatModel:
+    if mode not in CASSETTE_MODES:
+        raise ConfigurationError(
+            f"Unknown LLM cassette mode '{mode}'. Available: {', '.join(CASSETTE_MODES)}"
+        )
+
+    return CassetteChatModel(
+        wrapped=llm,
+        cassette=open_cassette(path),
+        mode=mode,
+        latency=latency,
+        latency_per_output_char=latency_per_output_char,
+    )
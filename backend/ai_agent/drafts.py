@@ -0,0 +1,128 @@
+"""Incremental drafts of a streamed TranslationState.
+
+The translate node streams its answer a few characters at a time. Parsing
+the whole answer again on every update (``parse_partial_json``) costs time
+quadratic in its length; ``DraftParser`` keeps its position instead and
+decodes every complete key of a JSON translation once.
+"""
+
+import re
+import json
+from typing import Any, Dict, Optional
+
+FIELD = re.compile(r'"current_translation"\s*:\s*')
+WHITESPACE = re.compile(r"\s*")
+# a backslash escape cut off at the end of the stream
+PARTIAL_ESCAPE = re.compile(r"(?<!\\)((?:\\\\)*)\\(u[0-9a-fA-F]{0,3})?$")
+
+_decoder = json.JSONDecoder(strict=False)
+
+
+class DraftParser:
+    """Complete part of one streamed answer, fed as it grows.
+
+    ``feed`` takes the whole answer streamed so far (which only ever grows)
+    and returns the keys completed since the last call for a JSON
+    translation, or the text so far without its last, possibly unfinished,
+    word for a text translation.
+    """
+
+    def __init__(self):
+        self.streamed = ""
+        # index of the current_translation value, once it started streaming
+        self.start: Optional[int] = None
+        self.position = 0
+
+    @property
+    def keyed(self) -> bool:
+        """The translation streams as a JSON object, decoded key by key."""
+        return self.start is not None and self.streamed[self.start] == "{"
+
+    def feed(self, streamed: str) -> Any:
+        self.streamed = streamed
+
+        if self.start is None and not self._find_start():
+            return None
+
+        if streamed[self.start] == "{":
+            return self._new_keys() or None
+
+        if streamed[self.start] == '"':
+            return self._text()
+
+        return None
+
+    def _find_start(self) -> bool:
+        # reasoning before the answer may mention the field
+        thought = self.streamed.rfind("</think>")
+
+        if "<think>" in self.streamed and thought == -1:
+            return False
+
+        match = FIELD.search(self.streamed, max(thought, 0))
+
+        if match is None or match.end() == len(self.streamed):
+            return False
+
+        self.start = match.end()
+        self.position = self.start + 1
+
+        return True
+
+    def _skip(self, position: int) -> int:
+        return WHITESPACE.match(self.streamed, position).end()
+
+    def _new_keys(self) -> Dict[str, Any]:
+        streamed, completed = self.streamed, {}
+
+        while True:
+            position = self._skip(self.position)
+
+            if streamed.startswith(",", position):
+                position = self._skip(position + 1)
+
+            if not streamed.startswith('"', position):
+                return completed
+
+            try:
+                key, position = json.decoder.scanstring(streamed, position + 1, False)
+            except ValueError:
+                return completed
+
+            position = self._skip(position)
+
+            if not streamed.startswith(":", position):
+                return completed
+
+            try:
+                value, end = _decoder.raw_decode(streamed, self._skip(position + 1))
+            except ValueError:
+                return completed
+
+            # a number or literal is only complete once something follows it
+            if self._skip(end) == len(streamed):
+                return completed
+
+            completed[key] = value
+            self.position = end
+
+    def _text(self) -> Optional[str]:
+        try:
+            text, _ = json.decoder.scanstring(self.streamed, self.start + 1, False)
+
+            return text
+        except ValueError:
+            pass
+
+        body = PARTIAL_ESCAPE.sub(r"\1", self.streamed[self.start + 1 :])
+
+        try:
+            text = json.loads(f'"{body}"', strict=False)
+        except ValueError:
+            return None
+
+        if " " not in text:
+            return None
+
+        # drop the last, possibly unfinished, word
+        return text.rsplit(" ", 1)[0]
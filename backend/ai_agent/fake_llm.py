@@ -0,0 +1,321 @@
+import re
+import ast
+import json
+import time
+import zlib
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from .masking import TOKEN_PATTERN, placeholders_match, protected_spans
+
+
+class FakeTranslatorChatModel(BaseChatModel):
+    """Deterministic chat model that answers every TranslatorGraph node offline.
+
+    The node is recognised from the output schema embedded in the system
+    prompt, and the answer is derived from the human message, so the graph
+    runs end to end without network access. ``latency`` is slept on every
+    call to stand in for the provider round trip, plus
+    ``latency_per_output_char`` for each generated character.
+
+    ``defect_rate`` makes the reviewer flag that share of keys as defective
+    until they have been re-translated, to exercise REDO cycles.
+    ``placeholder_error_rate`` makes the first translation of that share of
+    values drop a placeholder, tag or link; masked ``⟦n⟧`` tokens are kept,
+    as they carry nothing to translate. The reviewer flags keys whose
+    placeholders differ from the source. Streaming yields the answer
+    ``stream_chunk_chars`` at a time.
+
+    Bound tools (structured output) are answered with a tool call. Free-text
+    answers are prefixed with prose for ``malformed_rate`` of the prompts, so
+    they fail to parse and go through the retry parser.
+    """
+
+    latency: float = 0.0
+    latency_per_output_char: float = 0.0
+    defect_rate: float = 0.0
+    placeholder_error_rate: float = 0.0
+    stream_chunk_chars: int = 16
+    malformed_rate: float = 0.0
+    calls: int = 0
+    calls_by_schema: Dict[str, int] = {}
+    input_chars: int = 0
+    output_chars: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-translator"
+
+    def bind_tools(
+        self, tools: Sequence[Any], tool_choice: Any = None, **kwargs: Any
+    ) -> Any:
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        result = self._respond(messages, kwargs.get("tools"))
+        time.sleep(self._latency_for(result))
+
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        result = self._respond(messages, kwargs.get("tools"))
+        await asyncio.sleep(self._latency_for(result))
+
+        return result
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        result = self._respond(messages, kwargs.get("tools"))
+        message = result.generations[0].message
+        content = (
+            json.dumps(message.tool_calls[0]["args"], ensure_ascii=False)
+            if message.tool_calls
+            else message.content
+        )
+        pieces = [
+            content[start : start + self.stream_chunk_chars]
+            for start in range(0, len(content), self.stream_chunk_chars)
+        ]
+        # the first token arrives after the round trip, the rest as generated;
+        # paced against the start so sleep overshoot does not accumulate
+        started = time.perf_counter()
+        generated = 0
+
+        for piece in pieces:
+            generated += len(piece)
+            deadline = self.latency + self.latency_per_output_char * generated
+            await asyncio.sleep(max(0.0, deadline - (time.perf_counter() - started)))
+            if message.tool_calls:
+                first = generated == len(piece)
+                chunk_message = AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": message.tool_calls[0]["name"] if first else None,
+                            "args": piece,
+                            "id": message.tool_calls[0]["id"] if first else None,
+                            "index": 0,
+                        }
+                    ],
+                )
+            else:
+                chunk_message = AIMessageChunk(content=piece)
+
+            chunk = ChatGenerationChunk(message=chunk_message)
+
+            if run_manager:
+                await run_manager.on_llm_new_token(piece, chunk=chunk)
+
+            yield chunk
+
+    def _latency_for(self, result: ChatResult) -> float:
+        message = result.generations[0].message
+        output = (
+            json.dumps(message.tool_calls[0]["args"], ensure_ascii=False)
+            if message.tool_calls
+            else message.content
+        )
+        return self.latency + self.latency_per_output_char * len(output)
+
+    def _respond(
+        self, messages: List[BaseMessage], tools: Optional[List[dict]] = None
+    ) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        query = str(messages[-1].content)
+
+        # the retry parser quotes the original prompt and the failed completion
+        retry = re.search(
+            r"\nCompletion:\n(.*)\n\nAbove, the Completion", prompt, re.DOTALL
+        )
+
+        if retry:
+            self.calls += 1
+            self.calls_by_schema["retry"] = self.calls_by_schema.get("retry", 0) + 1
+            self.input_chars += len(prompt)
+            content = retry.group(1)[retry.group(1).find("{") :]
+            self.output_chars += len(content)
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content))])
+
+        schema = re.search(r'"title": "(\w+)", "type": "object"}$', prompt, re.M)
+        schema = schema.group(1) if schema else "unknown"
+
+        self.calls += 1
+        self.calls_by_schema[schema] = self.calls_by_schema.get(schema, 0) + 1
+        self.input_chars += len(prompt)
+
+        if '"title": "QueryInfoState"' in prompt:
+            payload = self._assess(query.split(": ", 1)[-1])
+        elif '"title": "FixedMalformedJsonState"' in prompt:
+            payload = self._fix(query.split(": ", 1)[-1])
+        elif '"title": "TranslationState"' in prompt:
+            language, _, text = query.partition(": \n\n")
+            language = language.rsplit(" ", 1)[-1]
+            # previous translations in the prompt mean this is a REDO
+            marker = (
+                f"[{language}:fixed]" if f"[{language}" in prompt else f"[{language}]"
+            )
+            payload = {"current_translation": self._translate(text, marker)}
+        elif '"title": "ReviewState"' in prompt:
+            payload = self._review(query)
+        else:
+            payload = {
+                "final_translation": self._literal(query.split(": ", 1)[-1]),
+                "final_translation_rating": 5,
+            }
+
+        content = json.dumps(payload, ensure_ascii=False)
+        self.output_chars += len(content)
+
+        if tools:
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": tools[0]["function"]["name"],
+                        "args": payload,
+                        "id": f"call_{self.calls}",
+                    }
+                ],
+            )
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+        if zlib.crc32(prompt.encode()) % 1000 < self.malformed_rate * 1000:
+            content = f"Here is the result:\n{content}"
+
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content))])
+
+    def _assess(self, text: str) -> dict:
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            data = None
+
+        stripped = text.strip()
+        is_malformed_json = data is None and (
+            (stripped.startswith("{") and ":" in stripped)
+            or (stripped.startswith("[") and ('"' in stripped or "'" in stripped))
+        )
+
+        return {
+            "string_content_type": (
+                None
+                if data is not None
+                else "malformed_json" if is_malformed_json else "sentence"
+            ),
+            "is_malformed_json": is_malformed_json,
+            "json_keys_count": len(data) if isinstance(data, dict) else None,
+            "json_items_count": len(data) if isinstance(data, list) else None,
+            "malformed_json_issues": None,
+            "content_summary": "Offline assessment",
+        }
+
+    def _fix(self, text: str) -> dict:
+        try:
+            fixed = json.loads(text)
+        except json.JSONDecodeError:
+            fixed = self._literal(text)
+
+        return {
+            "malformed_json_content": text,
+            "fixed_json_content": fixed if isinstance(fixed, dict) else {},
+        }
+
+    def _translate(self, text: str, marker: str) -> Any:
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return f"{marker} {text}"
+
+        if isinstance(data, dict):
+            return {
+                key: self._translate_value(value, marker) for key, value in data.items()
+            }
+
+        return self._translate_value(text, marker)
+
+    def _translate_value(self, value: Any, marker: str) -> str:
+        value = str(value)
+        spans = [
+            span for span in protected_spans(value) if not TOKEN_PATTERN.match(span)
+        ]
+
+        if (
+            spans
+            and ":fixed]" not in marker
+            and zlib.crc32(value.encode()) % 1000 < self.placeholder_error_rate * 1000
+        ):
+            value = value.replace(spans[0], "", 1)
+
+        return f"{marker} {value}"
+
+    def _review(self, query: str) -> dict:
+        translation = re.search(
+            r"Review the following translation: \n(.*?) \n\s*The original text is:",
+            query,
+            re.DOTALL,
+        )
+        original = re.search(
+            r"The original text is: \n(.*?)\n\s*The target language is:",
+            query,
+            re.DOTALL,
+        )
+        language = re.search(r"The target language is: \n(\S+)", query)
+        translation = self._literal(translation.group(1)) if translation else None
+        original = self._source(original.group(1)) if original else None
+        fixed = f"[{language.group(1) if language else ''}:fixed]"
+
+        defective_keys = []
+
+        if isinstance(translation, dict):
+            defective_keys = [
+                key
+                for key, value in translation.items()
+                if not str(value).startswith(fixed)
+                and zlib.crc32(key.encode()) % 1000 < self.defect_rate * 1000
+                or isinstance(original, dict)
+                and key in original
+                and not placeholders_match(original[key], value)
+            ]
+
+        return {
+            "review_decision": "REDO" if defective_keys else "APPROVE",
+            "review_reasoning": (
+                "Some keys are inaccurate" if defective_keys else "Accurate translation"
+            ),
+            "defective_keys": defective_keys,
+            "review_translation_rating": 3 if defective_keys else 5,
+        }
+
+    def _source(self, text: str) -> Any:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return self._literal(text)
+
+    def _literal(self, text: str) -> Any:
+        try:
+            return ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return text
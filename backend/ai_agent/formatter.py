@@ -0,0 +1,143 @@
+"""Deterministic formatting of JSON translations.
+
+Replaces the LLM format round trip for structured inputs: the translation
+is checked for key parity with the source and placeholders mangled by the
+model are restored from the source value.
+"""
+
+import re
+from typing import Any, List, Tuple
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*[^{}]+?\s*\}\}|\{[A-Za-z_][\w.]*\}")
+
+
+def restore_placeholders(source: str, translation: str) -> Tuple[str, bool]:
+    """Put the source placeholders back, in order, if the model altered them.
+
+    Only applied when both sides have the same number of placeholders, so a
+    translated ``{{ nom }}`` or a reformatted ``{{name}}`` becomes the
+    original ``{{ name }}`` again. Returns the text and whether it changed.
+    """
+    source_placeholders = PLACEHOLDER_PATTERN.findall(source)
+    translated_placeholders = PLACEHOLDER_PATTERN.findall(translation)
+
+    if (
+        not source_placeholders
+        or len(source_placeholders) != len(translated_placeholders)
+        or source_placeholders == translated_placeholders
+    ):
+        return translation, False
+
+    replacements = iter(source_placeholders)
+    restored = PLACEHOLDER_PATTERN.sub(lambda _: next(replacements), translation)
+
+    return restored, True
+
+
+def format_json_translation(
+    source: Any, translation: Any
+) -> Tuple[Any, List[str], List[str]]:
+    """Align a translated JSON value with its source.
+
+    Returns the value, the issues, and the keys of a source object that kept
+    their source value, in whole or in part, because the translation dropped
+    them or did not match their type. Those keys were not translated.
+    """
+    if not isinstance(source, dict) or not isinstance(translation, dict):
+        formatted, issues, kept_source = _align(source, translation, "")
+        fallback_keys = list(source) if kept_source and isinstance(source, dict) else []
+
+        return formatted, issues, fallback_keys
+
+    formatted, issues, fallback_keys = {}, [], []
+
+    for key, value in source.items():
+        if key not in translation:
+            issues.append(f"{key}: missing, kept the source value")
+            formatted[key] = value
+            fallback_keys.append(key)
+            continue
+
+        formatted[key], key_issues, kept_source = _align(value, translation[key], key)
+        issues.extend(key_issues)
+
+        if kept_source:
+            fallback_keys.append(key)
+
+    issues.extend(
+        f"{key}: unexpected key dropped" for key in translation if key not in source
+    )
+
+    return formatted, issues, fallback_keys
+
+
+def _align(source: Any, translation: Any, path: str) -> Tuple[Any, List[str], bool]:
+    """Align a nested value. Returns it, its issues and whether any part kept the source."""
+    issues = []
+    kept_source = False
+
+    if isinstance(source, dict):
+        if not isinstance(translation, dict):
+            return (
+                source,
+                [f"{path or 'root'}: expected an object, kept the source"],
+                True,
+            )
+
+        formatted = {}
+
+        for key, value in source.items():
+            key_path = f"{path}.{key}" if path else key
+
+            if key not in translation:
+                issues.append(f"{key_path}: missing, kept the source value")
+                formatted[key] = value
+                kept_source = True
+                continue
+
+            formatted[key], nested_issues, nested_kept = _align(
+                value, translation[key], key_path
+            )
+            issues.extend(nested_issues)
+            kept_source = kept_source or nested_kept
+
+        for key in translation:
+            if key not in source:
+                key_path = f"{path}.{key}" if path else key
+                issues.append(f"{key_path}: unexpected key dropped")
+
+        return formatted, issues, kept_source
+
+    if isinstance(source, list):
+        if not isinstance(translation, list) or len(translation) != len(source):
+            return (
+                source,
+                [f"{path or 'root'}: list length changed, kept the source"],
+                True,
+            )
+
+        formatted = []
+
+        for index, (item, translated_item) in enumerate(zip(source, translation)):
+            value, nested_issues, nested_kept = _align(
+                item, translated_item, f"{path}[{index}]"
+            )
+            formatted.append(value)
+            issues.extend(nested_issues)
+            kept_source = kept_source or nested_kept
+
+        return formatted, issues, kept_source
+
+    if isinstance(source, str) and isinstance(translation, str):
+        restored, changed = restore_placeholders(source, translation)
+
+        if changed:
+            issues.append(f"{path}: placeholders restored")
+
+        return restored, issues, False
+
+    if isinstance(source, str):
+        return source, [f"{path}: translation is not a string, kept the source"], True
+
+    # numbers, booleans and null are never translated
+    return source, issues, False
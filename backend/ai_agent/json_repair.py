@@ -0,0 +1,164 @@
+"""Deterministic repair of malformed JSON.
+
+Rebuilds the token stream from ``json_scanner`` into valid JSON, fixing the
+mechanical mistakes that otherwise cost an LLM round trip. Every fix that
+was applied is recorded so it can be surfaced alongside the result.
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+from .json_scanner import (
+    CLOSERS,
+    FOREIGN_LITERALS,
+    JSON_LITERALS,
+    Token,
+    scan,
+)
+
+
+def _unquote_single(text: str) -> str:
+    """Convert a single-quoted string token into a JSON string."""
+    body = text[1:-1] if len(text) > 1 and text.endswith("'") else text[1:]
+    body = body.replace("\\'", "'").replace('"', '\\"')
+
+    return f'"{body}"'
+
+
+def _significant(tokens: List[Token], index: int) -> Optional[Token]:
+    for token in tokens[index + 1 :]:
+        if token.kind not in ("line_comment", "block_comment"):
+            return token
+
+    return None
+
+
+def repair_json(text: str) -> Tuple[Optional[Any], List[str]]:
+    """Try to turn malformed JSON into a value.
+
+    Returns ``(value, applied_fixes)``. ``value`` is None when the text is not
+    JSON-like or could not be repaired locally.
+    """
+    result = scan(text)
+    fixes = []
+
+    def fixed(description: str):
+        if description not in fixes:
+            fixes.append(description)
+
+    if not result.is_json_like:
+        return None, []
+
+    if result.code_fenced:
+        fixed("Removed markdown code fence")
+
+    output: List[str] = []
+    stack: List[str] = []
+    previous = None
+
+    for index, token in enumerate(result.tokens):
+        kind, value = token.kind, token.text
+
+        if kind in ("line_comment", "block_comment"):
+            fixed("Removed comments")
+            continue
+
+        # anything after the top-level value is ambiguous; leave it to the LLM
+        if previous == "close" and not stack:
+            return None, []
+
+        is_value_start = kind in ("dstring", "sstring", "number", "word") or (
+            value in CLOSERS
+        )
+
+        if is_value_start and previous in ("value", "close"):
+            output.append(",")
+            fixed("Inserted missing commas")
+
+        if kind == "dstring":
+            if len(value) < 2 or not value.endswith('"') or value.endswith('\\"'):
+                value += '"'
+                fixed("Closed unterminated strings")
+
+            output.append(value)
+            previous = "value"
+
+        elif kind == "sstring":
+            output.append(_unquote_single(value))
+            fixed("Replaced single quotes with double quotes")
+            previous = "value"
+
+        elif kind == "number":
+            output.append(value)
+            previous = "value"
+
+        elif kind == "word":
+            next_token = _significant(result.tokens, index)
+
+            if next_token is not None and next_token.text == ":":
+                output.append(json.dumps(value))
+                fixed("Quoted unquoted keys")
+            elif value in FOREIGN_LITERALS:
+                output.append(FOREIGN_LITERALS[value])
+                fixed("Replaced non-JSON literals")
+            elif value in JSON_LITERALS:
+                output.append(value)
+            else:
+                return None, []
+
+            previous = "value"
+
+        elif value in CLOSERS:
+            output.append(value)
+            stack.append(value)
+            previous = "open"
+
+        elif value in ("}", "]"):
+            if previous == "comma":
+                output.pop()
+                fixed("Removed trailing commas")
+
+            if not stack:
+                return None, []
+
+            expected = CLOSERS[stack.pop()]
+
+            if value != expected:
+                fixed("Fixed mismatched brackets")
+
+            output.append(expected)
+            previous = "close"
+
+        elif value == ",":
+            if previous in ("open", "comma", "colon"):
+                fixed("Removed stray commas")
+                continue
+
+            output.append(value)
+            previous = "comma"
+
+        elif value == ":":
+            output.append(value)
+            previous = "colon"
+
+        else:
+            return None, []
+
+    if stack:
+        # a truncated payload ends mid-item; drop the dangling separator or key
+        if previous == "comma":
+            output.pop()
+        elif previous == "colon":
+            output.append("null")
+        elif previous == "value" and stack[-1] == "{" and output[-2] in ("{", ","):
+            output.append(": null")
+
+        output.extend(CLOSERS[opener] for opener in reversed(stack))
+        fixed("Closed truncated brackets")
+
+    try:
+        value = json.loads("".join(output))
+    except json.JSONDecodeError:
+        return None, []
+
+    return value, fixes
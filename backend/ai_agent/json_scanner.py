@@ -0,0 +1,171 @@
+"""Tolerant JSON tokenizer.
+
+Splits JSON-like text into tokens without failing on the mistakes people
+and models commonly make (single quotes, comments, unquoted keys, trailing
+commas, truncation), and reports which of those mistakes are present.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<ws>\s+)
+    |(?P<line_comment>(?://|\#)[^\n]*)
+    |(?P<block_comment>/\*.*?(?:\*/|$))
+    |(?P<dstring>"(?:[^"\\]|\\.)*(?:"|$))
+    |(?P<sstring>'(?:[^'\\]|\\.)*(?:'|$))
+    |(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+    |(?P<word>[A-Za-z_$][\w$]*)
+    |(?P<punct>[{}\[\]:,])
+    |(?P<other>.)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+JSON_LITERALS = {"true", "false", "null"}
+# literals that have an unambiguous JSON equivalent
+FOREIGN_LITERALS = {
+    "True": "true",
+    "False": "false",
+    "None": "null",
+    "undefined": "null",
+    "NaN": "null",
+    "Infinity": "null",
+}
+
+CODE_FENCE_PATTERN = re.compile(r"^```[\w-]*\s*\n(?P<body>.*?)\n?```$", re.DOTALL)
+
+CLOSERS = {"{": "}", "[": "]"}
+
+
+@dataclass
+class Token:
+    kind: str
+    text: str
+
+
+@dataclass
+class ScanResult:
+    tokens: List[Token]
+    issues: List[str] = field(default_factory=list)
+    # False when the text contains prose rather than (possibly broken) JSON
+    is_json_like: bool = True
+    code_fenced: bool = False
+
+
+def tokenize(text: str) -> List[Token]:
+    """Split text into tokens, dropping whitespace."""
+    return [
+        Token(match.lastgroup, match.group())
+        for match in _TOKEN_PATTERN.finditer(text)
+        if match.lastgroup != "ws"
+    ]
+
+
+def _add_issue(issues: List[str], issue: str):
+    if issue not in issues:
+        issues.append(issue)
+
+
+def _next_kind(tokens: List[Token], index: int) -> Optional[str]:
+    for token in tokens[index + 1 :]:
+        if token.kind not in ("line_comment", "block_comment"):
+            return token.text if token.kind == "punct" else token.kind
+
+    return None
+
+
+def scan(text: str) -> ScanResult:
+    """Tokenize JSON-like text and list the problems that stop ``json.loads``."""
+    stripped = text.strip()
+    fence = CODE_FENCE_PATTERN.match(stripped)
+
+    if fence:
+        stripped = fence.group("body").strip()
+
+    tokens = tokenize(stripped)
+    result = ScanResult(tokens=tokens, code_fenced=bool(fence))
+    issues = result.issues
+
+    if fence:
+        _add_issue(issues, "JSON is wrapped in a markdown code fence")
+
+    if not tokens or tokens[0].text not in CLOSERS:
+        result.is_json_like = False
+        return result
+
+    stack = []
+    previous = None
+    closed_at_top_level = False
+
+    for index, token in enumerate(tokens):
+        kind, value = token.kind, token.text
+
+        if kind in ("line_comment", "block_comment"):
+            _add_issue(issues, "Contains comments")
+            continue
+
+        if closed_at_top_level:
+            _add_issue(issues, "Extra content after the JSON value")
+
+        is_value_start = kind in ("dstring", "sstring", "number", "word") or (
+            value in CLOSERS
+        )
+
+        # a value directly after another value means a comma is missing
+        if is_value_start and previous in ("value", "close"):
+            _add_issue(issues, "Missing commas between items")
+
+        if kind == "other":
+            result.is_json_like = False
+            return result
+
+        if kind == "sstring":
+            _add_issue(issues, "Uses single quotes instead of double quotes")
+
+        if kind in ("dstring", "sstring") and (
+            len(value) < 2 or value[-1] != value[0] or value.endswith("\\" + value[0])
+        ):
+            _add_issue(issues, "Unterminated string")
+
+        if kind == "word":
+            if _next_kind(tokens, index) == ":":
+                _add_issue(issues, "Unquoted keys")
+            elif value in FOREIGN_LITERALS:
+                _add_issue(issues, f"Invalid literal '{value}'")
+            elif value not in JSON_LITERALS:
+                # bare words in value position are prose, not JSON
+                result.is_json_like = False
+                return result
+
+        if value in CLOSERS and kind == "punct":
+            stack.append(value)
+            previous = "open"
+            continue
+
+        if value in ("}", "]"):
+            if previous == "comma":
+                _add_issue(issues, "Trailing commas")
+
+            if not stack or CLOSERS[stack[-1]] != value:
+                _add_issue(issues, "Mismatched brackets")
+            else:
+                stack.pop()
+
+            closed_at_top_level = not stack
+            previous = "close"
+            continue
+
+        if value == ",":
+            previous = "comma"
+        elif value == ":":
+            previous = "colon"
+        else:
+            previous = "value"
+
+    if stack:
+        _add_issue(issues, "Unclosed brackets (truncated JSON)")
+
+    return result
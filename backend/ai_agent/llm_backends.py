@@ -0,0 +1,161 @@
+"""Chat model backends, selected by name through settings.
+
+A backend spec is ``"<backend>"`` or ``"<backend>:<model>"``, e.g.
+``"anthropic"``, ``"ollama:qwen2.5:7b"`` or ``"fake"``. ``LLM_BACKEND`` is
+used for every node unless ``LLM_NODE_BACKENDS`` names another one for it,
+so cheap or local models can handle assessment and formatting while the
+strong model translates and reviews.
+
+Provider packages are imported when their backend is first used, so only
+the ones actually configured need to be installed.
+"""
+
+from typing import Callable, Dict, Optional
+
+from langchain_core.language_models import BaseChatModel
+
+from config.settings import settings
+from core.exceptions import ConfigurationError
+from core.http_pool import HttpPool
+
+
+def anthropic_backend(
+    model: Optional[str], pool: Optional[HttpPool] = None
+) -> BaseChatModel:
+    """Anthropic Messages API, through the shared HTTP connection pool."""
+    try:
+        from .pooled_anthropic import PooledChatAnthropic
+    except ImportError as e:
+        raise ConfigurationError(
+            "The 'anthropic' LLM backend requires the 'langchain-anthropic' package"
+        ) from e
+
+    llm = PooledChatAnthropic(
+        model=model or "claude-sonnet-4-20250514",
+        temperature=0.0,
+        max_tokens=20000,
+        top_p=1.0,
+        default_request_timeout=settings.LLM_HTTP_TIMEOUT,
+        # the provider scheduler retries rate limits, overloads and connection
+        # errors within its rate limits; SDK retries would bypass them
+        max_retries=0,
+    )
+
+    if pool is not None:
+        llm._pool = pool
+
+    return llm
+
+
+def ollama_backend(model: Optional[str]) -> BaseChatModel:
+    try:
+        from langchain_ollama import ChatOllama
+    except ImportError as e:
+        raise ConfigurationError(
+            "The 'ollama' LLM backend requires the 'langchain-ollama' package"
+        ) from e
+
+    return ChatOllama(
+        model=model or "qwen2.5:7b",
+        base_url=settings.OLLAMA_HOST,
+        temperature=0.0,
+    )
+
+
+def huggingface_backend(model: Optional[str]) -> BaseChatModel:
+    """Hugging Face Inference endpoint, authenticated with ``HF_TOKEN``."""
+    try:
+        from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
+    except ImportError as e:
+        raise ConfigurationError(
+            "The 'huggingface' LLM backend requires the 'langchain-huggingface' package"
+        ) from e
+
+    endpoint = HuggingFaceEndpoint(
+        repo_id=model or "Qwen/Qwen2.5-7B-Instruct",
+        huggingfacehub_api_token=settings.HF_TOKEN,
+        temperature=0.01,
+        max_new_tokens=8192,
+    )
+
+    return ChatHuggingFace(llm=endpoint)
+
+
+def huggingface_local_backend(model: Optional[str]) -> BaseChatModel:
+    """Model run in process with transformers (and torch)."""
+    try:
+        from langchain_huggingface import ChatHuggingFace, HuggingFacePipeline
+        import transformers  # noqa: F401
+    except ImportError as e:
+        raise ConfigurationError(
+            "The 'huggingface_local' LLM backend requires the 'langchain-huggingface', "
+            "'transformers' and 'torch' packages"
+        ) from e
+
+    pipeline = HuggingFacePipeline.from_model_id(
+        model_id=model or "Qwen/Qwen2.5-1.5B-Instruct",
+        task="text-generation",
+        pipeline_kwargs={"max_new_tokens": 4096, "do_sample": False},
+    )
+
+    return ChatHuggingFace(llm=pipeline)
+
+
+def google_backend(model: Optional[str]) -> BaseChatModel:
+    try:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+    except ImportError as e:
+        raise ConfigurationError(
+            "The 'google' LLM backend requires the 'langchain-google-genai' package"
+        ) from e
+
+    return ChatGoogleGenerativeAI(
+        model=model or "gemini-2.0-flash",
+        google_api_key=settings.GOOGLE_API_KEY,
+        temperature=0.0,
+    )
+
+
+def fake_backend(model: Optional[str]) -> BaseChatModel:
+    """Deterministic offline model for load tests and benchmarks."""
+    from .fake_llm import FakeTranslatorChatModel
+
+    return FakeTranslatorChatModel(
+        latency=settings.FAKE_LLM_LATENCY,
+        latency_per_output_char=settings.FAKE_LLM_LATENCY_PER_OUTPUT_CHAR,
+    )
+
+
+LLM_BACKENDS: Dict[str, Callable[[Optional[str]], BaseChatModel]] = {
+    "anthropic": anthropic_backend,
+    "ollama": ollama_backend,
+    "huggingface": huggingface_backend,
+    "huggingface_local": huggingface_local_backend,
+    "google": google_backend,
+    "fake": fake_backend,
+}
+
+
+def create_llm(spec: str) -> BaseChatModel:
+    """Create a chat model from a ``"<backend>[:<model>]"`` spec."""
+    backend, _, model = spec.partition(":")
+
+    if backend not in LLM_BACKENDS:
+        raise ConfigurationError(
+            f"Unknown LLM backend '{backend}'. Available: {', '.join(LLM_BACKENDS)}"
+        )
+
+    llm = LLM_BACKENDS[backend](model or None)
+
+    if settings.LLM_CASSETTE_MODE:
+        from .cassette import wrap_with_cassette
+
+        return wrap_with_cassette(
+            llm,
+            settings.LLM_CASSETTE_MODE,
+            settings.LLM_CASSETTE_PATH,
+            latency=settings.LLM_CASSETTE_LATENCY,
+            latency_per_output_char=settings.LLM_CASSETTE_LATENCY_PER_OUTPUT_CHAR,
+        )
+
+    return llm
@@ -0,0 +1,227 @@
+"""Masking of the parts of a string that must not be translated.
+
+``{{ variables }}``, ICU MessageFormat syntax, HTML tags, URLs and email
+addresses are swapped for opaque ``⟦n⟧`` tokens before a value is sent to
+the model, and put back afterwards. For ICU ``plural`` and ``select``
+arguments only the syntax is masked; the message of every case is still
+translated. The same spans are compared between a source and its
+translation to check placeholders survived, without asking the model.
+"""
+
+import re
+from collections import Counter
+from typing import Any, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"⟦(\d+)⟧")
+
+PROTECTED_PATTERN = (
+    # tokens, so masked text is checked the same way as the source
+    r"⟦\d+⟧"
+    r"|\{\{.*?\}\}"
+    r"|</?[A-Za-z][^<>]*>"
+    # URLs, without trailing punctuation of the sentence
+    r"|(?:https?://|www\.)[^\s<>\"']*[^\s<>\"'.,;:!?)]"
+    r"|[\w.+-]+@[\w-]+(?:\.[\w-]+)+"
+)
+# protected spans, or characters that may start or end ICU syntax
+SCAN_PATTERN = re.compile(PROTECTED_PATTERN + r"|[{}#]")
+
+# {name}, {0}, {amount, number}, {date, date, short}
+SIMPLE_ARGUMENT = re.compile(r"\{\s*\w+\s*(?:,\s*\w+\s*(?:,[^{}]*)?)?\}")
+# {count, plural, offset:1 =0 {
+CASES_ARGUMENT = re.compile(
+    r"\{\s*\w+\s*,\s*(plural|selectordinal|select)\s*,\s*(?:offset:\d+\s*)?"
+    r"[^\s{}]+\s*\{"
+)
+# } other {
+NEXT_CASE = re.compile(r"\}\s*[^\s{}]+\s*\{")
+ARGUMENT_END = re.compile(r"\}\s*\}")
+
+
+def _scan(
+    text: str, start: int, spans: List[Tuple[int, int]], plural: bool, nested: bool
+) -> Optional[int]:
+    """Collect protected spans from ``start``.
+
+    Inside an ICU case (``nested``) stops at the closing brace of the case
+    and returns its index, or None if the case is never closed.
+    """
+    position = start
+
+    while True:
+        match = SCAN_PATTERN.search(text, position)
+
+        if match is None:
+            return None if nested else len(text)
+
+        char = match.group()
+
+        if char == "}":
+            if nested:
+                return match.start()
+
+            position = match.end()
+        elif char == "#":
+            # the number of an ICU plural case
+            if plural:
+                spans.append(match.span())
+
+            position = match.end()
+        elif char == "{":
+            end = _scan_argument(text, match.start(), spans, plural)
+            position = end if end is not None else match.end()
+        else:
+            spans.append(match.span())
+            position = match.end()
+
+
+def _scan_argument(
+    text: str, start: int, spans: List[Tuple[int, int]], plural: bool
+) -> Optional[int]:
+    """Spans of the ICU argument at ``start``. Returns its end, or None if it is not one."""
+    match = SIMPLE_ARGUMENT.match(text, start)
+
+    if match:
+        spans.append(match.span())
+        return match.end()
+
+    match = CASES_ARGUMENT.match(text, start)
+
+    if match is None:
+        return None
+
+    plural = plural or match.group(1) != "select"
+    argument_spans = [match.span()]
+    position = match.end()
+
+    while True:
+        end = _scan(text, position, argument_spans, plural, nested=True)
+
+        if end is None:
+            return None
+
+        match = NEXT_CASE.match(text, end)
+
+        if match:
+            argument_spans.append(match.span())
+            position = match.end()
+            continue
+
+        match = ARGUMENT_END.match(text, end)
+
+        if match is None:
+            return None
+
+        argument_spans.append(match.span())
+        spans.extend(sorted(argument_spans))
+
+        return match.end()
+
+
+def _span_positions(text: str) -> List[Tuple[int, int]]:
+    spans = []
+    _scan(text, 0, spans, plural=False, nested=False)
+
+    return spans
+
+
+def protected_spans(text: str) -> List[str]:
+    """The placeholders, markup and links of a text, in order."""
+    return [text[start:end] for start, end in _span_positions(text)]
+
+
+def mask(text: str, spans: Optional[List[str]] = None) -> Tuple[str, List[str]]:
+    """Replace protected spans with tokens. Returns the text and the spans.
+
+    Adjacent spans share a token. Tokens are numbered from the length of
+    ``spans``, which the new spans are appended to.
+    """
+    spans = [] if spans is None else spans
+    masked, position = [], 0
+    merged: List[List[int]] = []
+
+    for start, end in _span_positions(text):
+        if merged and merged[-1][1] == start:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    for start, end in merged:
+        masked.append(text[position:start])
+        masked.append(f"⟦{len(spans)}⟧")
+        spans.append(text[start:end])
+        position = end
+
+    masked.append(text[position:])
+
+    return "".join(masked), spans
+
+
+def unmask(text: str, spans: List[str]) -> str:
+    """Put the spans back in place of their tokens; unknown tokens are kept."""
+
+    def restore(match: re.Match) -> str:
+        index = int(match.group(1))
+        return spans[index] if index < len(spans) else match.group()
+
+    return TOKEN_PATTERN.sub(restore, text)
+
+
+def mask_value(value: Any, spans: Optional[List[str]] = None) -> Tuple[Any, List[str]]:
+    """Mask every string of a JSON value, numbering tokens across all of them."""
+    spans = [] if spans is None else spans
+
+    if isinstance(value, str):
+        return mask(value, spans)[0], spans
+
+    if isinstance(value, dict):
+        return {key: mask_value(item, spans)[0] for key, item in value.items()}, spans
+
+    if isinstance(value, list):
+        return [mask_value(item, spans)[0] for item in value], spans
+
+    return value, spans
+
+
+def unmask_value(value: Any, spans: List[str]) -> Any:
+    if isinstance(value, str):
+        return unmask(value, spans)
+
+    if isinstance(value, dict):
+        return {key: unmask_value(item, spans) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [unmask_value(item, spans) for item in value]
+
+    return value
+
+
+def is_translatable(value: Any) -> bool:
+    """Whether a masked value has any words left to translate."""
+    if isinstance(value, str):
+        return any(char.isalpha() for char in TOKEN_PATTERN.sub("", value))
+
+    if isinstance(value, dict):
+        return any(is_translatable(item) for item in value.values())
+
+    if isinstance(value, list):
+        return any(is_translatable(item) for item in value)
+
+    return False
+
+
+def _value_spans(value: Any) -> Counter:
+    if isinstance(value, str):
+        return Counter(protected_spans(value))
+
+    items = value.values() if isinstance(value, dict) else value
+
+    if isinstance(value, (dict, list)):
+        return sum((_value_spans(item) for item in items), Counter())
+
+    return Counter()
+
+
+def placeholders_match(source: Any, translation: Any) -> bool:
+    """Whether a translation has exactly the protected spans of its source, in any order."""
+    return _value_spans(source) == _value_spans(translation)
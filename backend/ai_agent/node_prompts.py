@@ -0,0 +1,75 @@
+"""Prompts and output parsers of the graph nodes, compiled once.
+
+Building a node's message templates, schema instructions and retry parser
+costs far more Python time than the call itself needs, so it is done once
+per (node, output model) when the graph is built instead of on every call.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Type
+
+from pydantic import BaseModel
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.prompt_values import PromptValue
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+from langchain.output_parsers import RetryWithErrorOutputParser
+from langchain.prompts import HumanMessagePromptTemplate, SystemMessagePromptTemplate
+
+from .prompts import output_format_instructions
+
+
+@dataclass
+class NodePrompt:
+    """Compiled prompt template and parsers of one graph node."""
+
+    template: ChatPromptTemplate
+    llm: BaseChatModel
+    parser: PydanticOutputParser
+    retry_parser: RetryWithErrorOutputParser
+    # the model with the output schema bound through tool calling, if supported;
+    # returns {"raw": message, "parsed": model or None, "parsing_error": ...}
+    structured_llm: Optional[Runnable] = None
+
+    def render(self, llm_input_query: str, partials: Dict[str, Any]) -> PromptValue:
+        """Render the messages of one call; reused for the retry parser."""
+        return self.template.invoke({"llm_input_query": llm_input_query, **partials})
+
+
+def compile_node_prompt(
+    system_prompt: Callable[[], str],
+    pydantic_object: Type[BaseModel],
+    llm: BaseChatModel,
+    structured: bool = False,
+) -> NodePrompt:
+    """Build the template, with format instructions filled in, and parsers.
+
+    With ``structured`` the schema is also bound to the model, unless the
+    model has no tool calling support.
+    """
+    parser = PydanticOutputParser(pydantic_object=pydantic_object)
+    structured_llm = None
+
+    if structured:
+        try:
+            structured_llm = llm.with_structured_output(
+                pydantic_object, include_raw=True
+            )
+        except NotImplementedError:
+            structured_llm = None
+
+    system = SystemMessagePromptTemplate.from_template(system_prompt())
+    human = HumanMessagePromptTemplate.from_template("{llm_input_query}")
+
+    format_instructions = output_format_instructions(
+        pydantic_object.model_json_schema()
+    )
+
+    return NodePrompt(
+        template=(system + human).partial(format_instructions=format_instructions),
+        llm=llm,
+        parser=parser,
+        retry_parser=RetryWithErrorOutputParser.from_llm(parser=parser, llm=llm),
+        structured_llm=structured_llm,
+    )
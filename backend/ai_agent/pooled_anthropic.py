@@ -0,0 +1,30 @@
+from functools import cached_property
+
+import anthropic
+from langchain_anthropic import ChatAnthropic
+from pydantic import PrivateAttr
+
+from core.http_pool import HttpPool, http_pool
+
+
+class PooledChatAnthropic(ChatAnthropic):
+    """ChatAnthropic whose SDK clients send their requests through an ``HttpPool``.
+
+    ChatAnthropic takes no HTTP client; the anthropic SDK clients do, as
+    ``http_client``. Their construction is overridden here to pass the
+    pool's clients, so the connection limits, keep-alive and metrics of the
+    pool apply to every model, and ``default_request_timeout`` still sets
+    the request timeout.
+    """
+
+    _pool: HttpPool = PrivateAttr(default_factory=lambda: http_pool)
+
+    @cached_property
+    def _client(self) -> anthropic.Client:
+        return anthropic.Client(**self._client_params, http_client=self._pool.client())
+
+    @cached_property
+    def _async_client(self) -> anthropic.AsyncClient:
+        return anthropic.AsyncClient(
+            **self._client_params, http_client=self._pool.async_client()
+        )
@@ -0,0 +1,118 @@
+"""Deterministic replacement for the LLM query assessment.
+
+Produces the same ``QueryInfoState`` the ``query_assessment`` node asks the
+model for, using ``json.loads``, the tolerant scanner and a few regexes.
+Returns ``None`` when the input is genuinely ambiguous so the graph can fall
+back to the LLM assessor.
+"""
+
+import re
+import json
+from typing import Any, Optional
+
+from .json_scanner import scan
+from .state import QueryInfoState
+
+CODE_FENCE_PATTERN = re.compile(r"```.*?(?:```|$)", re.DOTALL)
+HTML_TAG_PATTERN = re.compile(r"</?[a-zA-Z][\w-]*(?:\s[^<>]*)?/?>")
+SENTENCE_END_PATTERN = re.compile(r"[.!?。！？](?:\s+|$)")
+# JSON fragments embedded in prose, e.g. 'Use {"a": 1} here'
+EMBEDDED_JSON_PATTERN = re.compile(r"[{\[]\s*[\"'][^\"']*[\"']\s*[:,]")
+
+
+def _json_info(data: Any) -> QueryInfoState:
+    if isinstance(data, dict):
+        summary = f"JSON object with {len(data)} keys"
+    else:
+        summary = f"JSON list with {len(data)} items"
+
+    return QueryInfoState(
+        string_content_type=None,
+        is_malformed_json=False,
+        json_keys_count=len(data) if isinstance(data, dict) else None,
+        json_items_count=len(data) if isinstance(data, list) else None,
+        malformed_json_issues=None,
+        content_summary=summary,
+    )
+
+
+def _string_info(content_type: str, summary: str) -> QueryInfoState:
+    return QueryInfoState(
+        string_content_type=content_type,
+        is_malformed_json=False,
+        json_keys_count=None,
+        json_items_count=None,
+        malformed_json_issues=None,
+        content_summary=summary,
+    )
+
+
+def _classify_text(text: str) -> Optional[QueryInfoState]:
+    stripped = text.strip()
+
+    if not stripped:
+        return _string_info("sentence", "Empty string")
+
+    fences = CODE_FENCE_PATTERN.findall(stripped)
+
+    if fences:
+        prose = CODE_FENCE_PATTERN.sub("", stripped).strip()
+
+        if prose:
+            return _string_info("mixed", "Text with embedded code blocks")
+
+        return _string_info("code_block", "Code block")
+
+    if HTML_TAG_PATTERN.search(stripped):
+        return _string_info("html", "Text with HTML markup")
+
+    if EMBEDDED_JSON_PATTERN.search(stripped):
+        return None
+
+    sentences = len(SENTENCE_END_PATTERN.findall(stripped))
+
+    if "\n" in stripped or sentences > 1:
+        return _string_info("paragraph", "Multi-sentence paragraph")
+
+    return _string_info("sentence", "Single sentence")
+
+
+def classify_query(input_query: Any) -> Optional[QueryInfoState]:
+    """Assess the input query locally. Returns None if the LLM should decide."""
+    if isinstance(input_query, (dict, list)):
+        return _json_info(input_query)
+
+    text = str(input_query)
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = None
+    else:
+        if isinstance(data, (dict, list)):
+            return _json_info(data)
+
+        # JSON scalars such as '"Hello"' or '42' are plain text
+        return _classify_text(data if isinstance(data, str) else text)
+
+    result = scan(text)
+
+    if result.is_json_like:
+        # the text looks like JSON but json.loads rejected it
+        if not result.issues:
+            return None
+
+        return QueryInfoState(
+            string_content_type="malformed_json",
+            is_malformed_json=True,
+            json_keys_count=None,
+            json_items_count=None,
+            malformed_json_issues=result.issues,
+            content_summary=f"Malformed JSON: {', '.join(result.issues)}",
+        )
+
+    # text starting with a bracket that is not JSON, e.g. "[Beta] New feature"
+    if text.strip()[:1] in ("{", "["):
+        return None
+
+    return _classify_text(text)
@@ -43,6 +43,10 @@ class TranslationState(BaseModel):
     )
 
 
+# review reasoning of translations approved only because the iteration cap was hit
+ITERATION_LIMIT_REASONING = "Maximum iterations reached"
+
+
 class ReviewState(BaseModel):
     review_decision: Literal["APPROVE", "REDO", "END", None] = Field(
         default=None,
@@ -86,6 +90,16 @@ class FormatState(BaseModel):
         description="The rating of the final translation from 1 to 5. 1 is the worst and 5 is the best",
     )
 
+    format_issues: List[str] = Field(
+        default_factory=list,
+        description="Structural issues found and corrected while formatting the translation",
+    )
+
+    fallback_keys: List[str] = Field(
+        default_factory=list,
+        description="Keys of a JSON object that kept their source value because the translation dropped or mangled them",
+    )
+
 
 class FixedMalformedJsonState(BaseModel):
     malformed_json_content: str = Field(
@@ -96,6 +110,11 @@ class FixedMalformedJsonState(BaseModel):
         description="The fixed JSON content",
     )
 
+    applied_fixes: List[str] = Field(
+        default_factory=list,
+        description="The fixes that were applied to the malformed JSON content",
+    )
+
 
 class AgentState(BaseModel):
     original_input_query: Union[str, dict, List[str], Dict[str, str]] = ""
@@ -113,6 +132,11 @@ class AgentState(BaseModel):
         description="Informs whether the input query is a string",
     )
 
+    retranslated_keys: List[str] = Field(
+        default_factory=list,
+        description="Keys re-translated by the last REDO iteration; the next review only covers them",
+    )
+
     query_info: Optional[QueryInfoState] = None
     translation_state: Optional[TranslationState] = None
     review_state: Optional[ReviewState] = None
@@ -1,14 +1,31 @@
 import re
 import json
-from typing import Type
+import time
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Type
 
+from pydantic import BaseModel, ValidationError
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage
-from langchain_core.output_parsers import PydanticOutputParser
-from langchain.output_parsers import RetryWithErrorOutputParser
+from langchain_core.exceptions import OutputParserException
 from langgraph.graph import END, StateGraph
-from langchain_anthropic import ChatAnthropic
-from langchain.prompts import HumanMessagePromptTemplate, SystemMessagePromptTemplate
 
+from config.settings import settings
+from core.scheduler import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    ProviderScheduler,
+    provider_scheduler,
+)
+from core.exceptions import ConfigurationError
+from core.metrics import metrics
+from core.usage import (
+    record_llm_call,
+    record_node,
+    record_redo,
+    record_retry,
+    token_cost,
+)
 
 from .state import (
     AgentState,
@@ -17,20 +34,56 @@ from .state import (
     FormatState,
     QueryInfoState,
     FixedMalformedJsonState,
+    ITERATION_LIMIT_REASONING,
 )
 
 from .prompts import (
-    output_format_instructions,
     translate_system_prompt,
+    masked_translate_system_prompt,
     review_system_prompt,
     format_translation_system_prompt,
     query_assessment_system_prompt,
     malformed_json_system_prompt,
 )
 
+from .llm_backends import create_llm
+from .node_prompts import NodePrompt, compile_node_prompt
+from .drafts import DraftParser
+from .formatter import format_json_translation
+from .json_repair import repair_json
+from .masking import placeholders_match
+from .query_classifier import classify_query
+
+query_assessments = metrics.counter(
+    "query_assessments_total",
+    "Query assessments by mode; llm_fallback counts ambiguous inputs sent to the model",
+    ["mode"],
+)
+json_repairs = metrics.counter(
+    "json_repairs_total",
+    "Malformed JSON repairs by mode; llm counts payloads the local pass could not fix",
+    ["mode"],
+)
+llm_parse_failures = metrics.counter(
+    "llm_parse_failures_total",
+    "LLM answers that did not match the node's output schema, by node and output mode",
+    ["node", "mode"],
+)
+review_decisions = metrics.counter(
+    "review_decisions_total",
+    "Review decisions; mode local counts REDOs of the placeholder check, limit approvals at max iterations",
+    ["decision", "mode"],
+)
+llm_retries = metrics.counter(
+    "llm_retries_total",
+    "Extra LLM round trips made to recover from parse failures",
+    ["node", "mode"],
+)
+
 
 class TranslatorGraph:
     # Node names
+    LOCAL_QUERY_ASSESSMENT_NODE = "local_query_assessment"
     QUERY_ASSESSMENT_NODE = "query_assessment"
     FIX_MALFORMED_JSON_NODE = "fix_malformed_json"
     TRANSLATE_NODE = "translate"
@@ -38,18 +91,129 @@ class TranslatorGraph:
     FORMAT_NODE = "format"
     LAST_IDX = -1
 
+    # output tokens reserved for nodes whose answer does not grow with the
+    # input; the others are expected to answer about as much as they are sent
+    NODE_OUTPUT_TOKENS = {REVIEW_NODE: 256, QUERY_ASSESSMENT_NODE: 64}
+
+    # streamed characters between two drafts of a text translation, which is
+    # decoded from its start every time; JSON drafts follow completed keys
+    DRAFT_MIN_CHARS = 256
+
     def __init__(self):
-        self.llm = self.create_llm_instance()
-        self.graph = self._build_graph()
-
-    def create_llm_instance(self):
-        return ChatAnthropic(
-            model="claude-sonnet-4-20250514",
-            temperature=0.0,
-            max_tokens=20000,
-            top_p=1.0,
+        # system prompt and output model of every node calling the LLM
+        self.node_prompt_specs = {
+            (
+                self.QUERY_ASSESSMENT_NODE,
+                QueryInfoState,
+            ): query_assessment_system_prompt,
+            (
+                self.FIX_MALFORMED_JSON_NODE,
+                FixedMalformedJsonState,
+            ): malformed_json_system_prompt,
+            (self.TRANSLATE_NODE, TranslationState): self._translate_system_prompt,
+            (self.REVIEW_NODE, ReviewState): review_system_prompt,
+            (self.FORMAT_NODE, FormatState): format_translation_system_prompt,
+        }
+
+        llm_nodes = {node for node, _ in self.node_prompt_specs}
+        unknown_nodes = set(settings.LLM_NODE_BACKENDS) - llm_nodes
+
+        if unknown_nodes:
+            raise ConfigurationError(
+                f"LLM_NODE_BACKENDS names unknown nodes: {', '.join(sorted(unknown_nodes))}. "
+                f"Available: {', '.join(sorted(llm_nodes))}"
+            )
+
+        # clients, compiled prompts and the graph are built on first use, or
+        # by warmup(), so importing the module creates no provider client
+        self._node_llms: Optional[Dict[str, BaseChatModel]] = None
+        self._llm: Optional[BaseChatModel] = None
+        self._node_prompts: Optional[Dict[Tuple[str, type], NodePrompt]] = None
+        self._graph = None
+
+    def warmup(self):
+        """Build the models, node prompts and graph ahead of the first call."""
+        return self.node_prompts, self.graph
+
+    @property
+    def node_llms(self) -> Dict[str, BaseChatModel]:
+        """Models of nodes that do not use the default one."""
+        if self._node_llms is None:
+            self._node_llms = {
+                node: create_llm(spec)
+                for node, spec in settings.LLM_NODE_BACKENDS.items()
+            }
+
+        return self._node_llms
+
+    @property
+    def llm(self) -> BaseChatModel:
+        """Default model, used by every node without its own backend."""
+        if self._llm is None:
+            self._llm = self.create_llm_instance()
+
+        return self._llm
+
+    @llm.setter
+    def llm(self, llm: BaseChatModel):
+        # the retry parsers call the model, so they are rebuilt with it
+        self._llm = llm
+        self._node_prompts = None
+
+    @property
+    def node_prompts(self) -> Dict[Tuple[str, type], NodePrompt]:
+        if self._node_prompts is None:
+            self._node_prompts = {
+                key: compile_node_prompt(
+                    system_prompt,
+                    key[1],
+                    self.llm_for(key[0]),
+                    structured=settings.STRUCTURED_OUTPUT_MODE == "native",
+                )
+                for key, system_prompt in self.node_prompt_specs.items()
+            }
+
+        return self._node_prompts
+
+    @property
+    def graph(self):
+        """The compiled workflow graph."""
+        if self._graph is None:
+            self._graph = self._build_graph()
+
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph):
+        self._graph = graph
+
+    def _translate_system_prompt(self) -> str:
+        # masked inputs need no rules about placeholders, markup and links
+        if settings.PLACEHOLDER_MASKING:
+            return masked_translate_system_prompt()
+
+        return translate_system_prompt()
+
+    def llm_for(self, node: str) -> BaseChatModel:
+        """Model used by a node."""
+        return self.node_llms.get(node, self.llm)
+
+    @property
+    def model_name(self) -> str:
+        """Identifier of the translating model, used to version cached translations."""
+        return self._model_id(self.llm_for(self.TRANSLATE_NODE))
+
+    @staticmethod
+    def _model_id(llm: BaseChatModel) -> str:
+        return (
+            getattr(llm, "model", None)
+            or getattr(llm, "model_id", None)
+            or llm._llm_type
         )
 
+    def create_llm_instance(self) -> BaseChatModel:
+        return create_llm(settings.LLM_BACKEND)
+
     def execute(
         self,
         input_query: str,
@@ -57,77 +221,371 @@ class TranslatorGraph:
         is_json: bool = False,
         is_string: bool = False,
     ):
+        """Run the graph synchronously. Must not be called from a running event loop."""
+        return asyncio.run(
+            self.aexecute(
+                input_query, target_language, is_json=is_json, is_string=is_string
+            )
+        )
 
-        return self.graph.invoke(
-            {
-                "original_input_query": input_query,
-                "llm_input_query": input_query,
-                "target_language": target_language,
-                "is_json": is_json,
-                "is_string": is_string,
-                "translation_state": {
-                    "current_translation": ({} if is_json else {} if is_string else ""),
-                    "iteration": 0,
-                },
+    async def aexecute(
+        self,
+        input_query: str,
+        target_language: str,
+        is_json: bool = False,
+        is_string: bool = False,
+        query_info: Optional[QueryInfoState] = None,
+    ):
+        """Run the graph without blocking the event loop.
+
+        A ``query_info`` from ``aassess`` skips the assessment nodes, so inputs
+        translated into several languages are only assessed once.
+        """
+        return await self.graph.ainvoke(
+            self._initial_state(
+                input_query, target_language, is_json, is_string, query_info
+            )
+        )
+
+    def _initial_state(
+        self,
+        input_query: str,
+        target_language: str,
+        is_json: bool,
+        is_string: bool,
+        query_info: Optional[QueryInfoState],
+    ) -> dict:
+        return {
+            "original_input_query": input_query,
+            "llm_input_query": input_query,
+            "target_language": target_language,
+            "is_json": is_json,
+            "is_string": is_string,
+            "query_info": query_info,
+            "translation_state": {
+                "current_translation": ({} if is_json else {} if is_string else ""),
+                "iteration": 0,
+            },
+        }
+
+    async def astream_execute(
+        self,
+        input_query: str,
+        target_language: str,
+        is_json: bool = False,
+        is_string: bool = False,
+        query_info: Optional[QueryInfoState] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Run the graph, yielding progress as it happens.
+
+        Yields ``("draft", translation)`` while the translate node streams
+        tokens, ``("approved", translation)`` with the keys (or text) a review
+        accepted, and finally ``("result", state)`` with the same state
+        ``aexecute`` returns. For JSON, drafts only contain the keys completed
+        since the previous draft of the same answer, so a REDO drafts the keys
+        it translates again; keys already approved are not drafted again.
+        """
+        streamed, message_id, parser, drafted, result = "", None, None, None, None
+        parsed_length = 0
+        approved_keys = set()
+
+        async for mode, data in self.graph.astream(
+            self._initial_state(
+                input_query, target_language, is_json, is_string, query_info
+            ),
+            stream_mode=["messages", "updates", "values"],
+        ):
+            if mode == "messages":
+                message, metadata = data
+
+                if metadata.get("langgraph_node") != self.TRANSLATE_NODE:
+                    continue
+
+                if message.id != message_id:
+                    streamed, message_id, parsed_length = "", message.id, 0
+                    parser = DraftParser()
+
+                streamed += self._streamed_text(message)
+
+                # the keys of a JSON answer are decoded once each, as soon as
+                # they complete; text is decoded from its start every time
+                if (
+                    not parser.keyed
+                    and len(streamed) - parsed_length < self.DRAFT_MIN_CHARS
+                ):
+                    continue
+
+                parsed_length = len(streamed)
+                draft = self._new_draft(parser.feed(streamed), drafted, approved_keys)
+
+                if draft:
+                    drafted = draft
+                    yield "draft", draft
+
+            elif mode == "updates" and self.TRANSLATE_NODE in data:
+                # the end of the answer, which was short of DRAFT_MIN_CHARS
+                if parser is None or len(streamed) == parsed_length:
+                    continue
+
+                parsed_length = len(streamed)
+                draft = self._new_draft(parser.feed(streamed), drafted, approved_keys)
+
+                if draft:
+                    drafted = draft
+                    yield "draft", draft
+
+            elif mode == "updates" and self.REVIEW_NODE in data:
+                approved = self._approved_translation(data[self.REVIEW_NODE])
+
+                if isinstance(approved, dict):
+                    approved_keys.update(approved)
+
+                if approved:
+                    yield "approved", approved
+
+            elif mode == "values":
+                result = data
+
+        yield "result", result
+
+    def _streamed_text(self, message: BaseMessage) -> str:
+        """Text of a streamed chunk: content, or tool call arguments."""
+        if isinstance(message.content, str) and message.content:
+            return message.content
+
+        # structured output streams the TranslationState as tool call arguments
+        return "".join(
+            chunk.get("args") or ""
+            for chunk in getattr(message, "tool_call_chunks", [])
+        )
+
+    def _new_draft(self, draft: Any, drafted: Any, approved_keys: Set[str]) -> Any:
+        """A draft to send, unless it repeats the last one or was approved."""
+        if isinstance(draft, dict):
+            draft = {
+                key: value for key, value in draft.items() if key not in approved_keys
             }
+
+        return draft if draft and draft != drafted else None
+
+    def _approved_translation(self, state: Dict[str, Any]) -> Any:
+        """Keys (or text) accepted by a review update."""
+        review_state = state["review_state"]
+        current_translation = state["translation_state"].current_translation
+
+        if not isinstance(current_translation, dict):
+            return (
+                current_translation if review_state.review_decision != "REDO" else None
+            )
+
+        reviewed = state["retranslated_keys"] or list(current_translation)
+        defective = (
+            set(review_state.defective_keys)
+            if review_state.review_decision == "REDO"
+            else set()
         )
 
-    def shared_node_logic(
+        return {
+            key: current_translation[key]
+            for key in reviewed
+            if key in current_translation and key not in defective
+        }
+
+    async def aassess(
+        self, input_query: str, is_json: bool = False, is_string: bool = False
+    ) -> AgentState:
+        """Run only the language-independent stages: assessment and JSON repair.
+
+        The returned state carries the (repaired) input and a query_info that
+        can be passed to ``aexecute`` for every target language.
+        """
+        state = AgentState(
+            original_input_query=input_query,
+            llm_input_query=input_query,
+            target_language="",
+            is_json=is_json,
+            is_string=is_string,
+        )
+
+        if settings.QUERY_ASSESSMENT_MODE == "local":
+            state = await self.local_query_assessment_node(state)
+
+        if state.query_info is None:
+            state = await self.query_assessment_node(state)
+
+        if state.query_info.is_malformed_json:
+            state = await self.fix_malformed_json(state)
+            # describe the repaired JSON so it is not repaired again per language
+            state.query_info = classify_query(state.original_input_query)
+
+        return state
+
+    async def shared_node_logic(
         self,
         state: AgentState,
-        prompt: str,
+        node: str,
         pydantic_object: Type[
             QueryInfoState | TranslationState | ReviewState | FormatState
         ],
         partials: dict = {},
     ) -> AgentState:
-        """Shared node logic."""
-        llm_input_query = state.llm_input_query
+        """Shared node logic, using the prompt compiled for the node.
 
-        parser = PydanticOutputParser(pydantic_object=pydantic_object)
-
-        system = SystemMessagePromptTemplate.from_template(prompt)
-        human = HumanMessagePromptTemplate.from_template("{llm_input_query}")
+        With structured output the schema is bound to the model and the
+        answer arrives already validated. If it does not, the text of the
+        answer is parsed, and only then is the model asked again through the
+        free-text prompt and the retry parser.
+        """
+        node_prompt = self.node_prompts[(node, pydantic_object)]
+        prompt_value = node_prompt.render(state.llm_input_query, partials)
+
+        # every call is admitted by the provider's scheduler; short strings
+        # typed by a user go ahead of bulk dictionary chunks
+        scheduler = provider_scheduler(node_prompt.llm._llm_type)
+        prompt = "".join(str(message.content) for message in prompt_value.to_messages())
+        estimated_tokens = self._estimate_tokens(prompt, state, node)
+        priority = PRIORITY_BULK if state.is_json else PRIORITY_INTERACTIVE
+        model = self._model_id(node_prompt.llm)
+
+        async def call_llm(runnable, *args):
+            return await self._scheduled(
+                scheduler,
+                lambda: runnable(*args),
+                estimated_tokens,
+                priority,
+                node,
+                prompt,
+                model,
+            )
+
+        if node_prompt.structured_llm is not None:
+            output = await call_llm(node_prompt.structured_llm.ainvoke, prompt_value)
+
+            if output["parsed"] is not None:
+                return output["parsed"]
+
+            llm_parse_failures.inc(node=node, mode="structured")
+
+            # some models answer in text instead of calling the tool
+            try:
+                return node_prompt.parser.parse(self._parse_result(output["raw"]))
+            except OutputParserException:
+                llm_retries.inc(node=node, mode="structured_fallback")
+                record_retry(node)
+
+        result = await call_llm(node_prompt.llm.ainvoke, prompt_value)
+        cleaned_content = self._parse_result(result)
 
-        format_structure = pydantic_object.model_json_schema()
-        format_instructions = output_format_instructions(format_structure)
+        try:
+            return node_prompt.parser.parse(cleaned_content)
+        except OutputParserException:
+            llm_parse_failures.inc(node=node, mode="text")
+            llm_retries.inc(node=node, mode="retry_parser")
+            record_retry(node)
 
-        prompt = (system + human).partial(
-            format_instructions=format_instructions, **partials
+        return await call_llm(
+            node_prompt.retry_parser.aparse_with_prompt, cleaned_content, prompt_value
         )
 
-        # retry parser
-        retry_parser = RetryWithErrorOutputParser.from_llm(parser=parser, llm=self.llm)
+    async def _scheduled(
+        self,
+        scheduler: ProviderScheduler,
+        call,
+        estimated_tokens: int,
+        priority: int,
+        node: str,
+        prompt: str,
+        model: str,
+    ):
+        """Run an LLM call through the scheduler and account for it.
 
-        # llm call
-        llm_call = prompt | self.llm
-        result = llm_call.invoke({"llm_input_query": llm_input_query})
-        cleaned_content = self._parse_result(result)
+        The scheduler's token estimate is always settled with the usage of
+        the call: as the provider reports it or, without a report, estimated
+        at 4 characters a token.
+        """
+        in_call = 0.0
+
+        async def timed_call():
+            nonlocal in_call
+            started = time.perf_counter()
 
-        result = retry_parser.parse_with_prompt(
-            cleaned_content, prompt.invoke(llm_input_query)
+            try:
+                return await call()
+            finally:
+                in_call += time.perf_counter() - started
+
+        started = time.perf_counter()
+        result = await scheduler.run(timed_call, estimated_tokens, priority)
+        seconds = time.perf_counter() - started
+
+        message = result.get("raw") if isinstance(result, dict) else result
+        usage = getattr(message, "usage_metadata", None)
+        answer = self._answer_text(message)
+
+        if usage:
+            input_tokens, output_tokens = usage["input_tokens"], usage["output_tokens"]
+        else:
+            input_tokens, output_tokens = len(prompt) // 4, len(answer) // 4
+
+        scheduler.record_usage(estimated_tokens, input_tokens + output_tokens)
+
+        record_llm_call(
+            node,
+            seconds,
+            queue_seconds=seconds - in_call,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            request_bytes=len(prompt.encode()),
+            response_bytes=len(answer.encode()),
+            cost=token_cost(model, input_tokens, output_tokens),
         )
 
         return result
 
-    def fix_malformed_json(self, state: AgentState) -> AgentState:
+    def _answer_text(self, answer: Any) -> str:
+        """Text of an LLM answer: content and tool call arguments, or the parsed model."""
+        if isinstance(answer, BaseMessage):
+            tool_calls = getattr(answer, "tool_calls", None)
+
+            return answer.text() + (
+                json.dumps([call["args"] for call in tool_calls]) if tool_calls else ""
+            )
+
+        if isinstance(answer, BaseModel):
+            return answer.model_dump_json()
+
+        return str(answer)
+
+    def _estimate_tokens(self, prompt: str, state: AgentState, node: str) -> int:
+        """Rough input plus output tokens of a call, about 4 characters a token."""
+        if node in self.NODE_OUTPUT_TOKENS:
+            return len(prompt) // 4 + self.NODE_OUTPUT_TOKENS[node]
+
+        output_chars = len(state.llm_input_query) * settings.CHUNK_OUTPUT_TOKEN_RATIO
+
+        return int((len(prompt) + output_chars) / 4)
+
+    async def fix_malformed_json(self, state: AgentState) -> AgentState:
         """Fix malformed JSON from the input query."""
-        print("--------------------------------")
-        print("Calling fix_malformed_json")
-        print("--------------------------------")
+        result = self._repair_malformed_json_locally(state.original_input_query)
 
-        llm_input_query = (
-            f"Fix the following malformed JSON: {state.original_input_query}"
-        )
+        if result is None:
+            json_repairs.inc(mode="llm")
 
-        state.llm_input_query = llm_input_query
+            llm_input_query = (
+                f"Fix the following malformed JSON: {state.original_input_query}"
+            )
 
-        result: FixedMalformedJsonState = self.shared_node_logic(
-            state,
-            malformed_json_system_prompt(),
-            FixedMalformedJsonState,
-            {"issues": state.query_info.malformed_json_issues},
-        )
+            state.llm_input_query = llm_input_query
+
+            result: FixedMalformedJsonState = await self.shared_node_logic(
+                state,
+                self.FIX_MALFORMED_JSON_NODE,
+                FixedMalformedJsonState,
+                {"issues": state.query_info.malformed_json_issues},
+            )
+        else:
+            json_repairs.inc(mode="local")
 
         state.is_json = True
         state.is_string = False
@@ -135,18 +593,30 @@ class TranslatorGraph:
 
         return state
 
-    def query_assessment_node(self, state: AgentState) -> AgentState:
+    async def local_query_assessment_node(self, state: AgentState) -> AgentState:
+        """Assess the query info locally, leaving it empty if the input is ambiguous."""
+        if state.query_info is not None:
+            return state
+
+        state.query_info = classify_query(state.original_input_query)
+
+        query_assessments.inc(
+            mode="local" if state.query_info else "llm_fallback",
+        )
+
+        return state
+
+    async def query_assessment_node(self, state: AgentState) -> AgentState:
         """Assess the query info."""
-        print("--------------------------------")
-        print("Calling query_info_node")
-        print("--------------------------------")
+        if state.query_info is not None:
+            return state
 
         llm_input_query = f"Assess the following content: {state.original_input_query}"
         state.llm_input_query = llm_input_query
 
-        result: QueryInfoState = self.shared_node_logic(
+        result: QueryInfoState = await self.shared_node_logic(
             state,
-            query_assessment_system_prompt(),
+            self.QUERY_ASSESSMENT_NODE,
             QueryInfoState,
             {"is_string": state.is_string, "is_json": state.is_json},
         )
@@ -155,29 +625,50 @@ class TranslatorGraph:
 
         return state
 
-    def translate_node(self, state: AgentState) -> AgentState:
-        """Translate the text from English into a target language."""
-        print("--------------------------------")
-        print("Calling translate_node")
-        print("--------------------------------")
+    async def translate_node(self, state: AgentState) -> AgentState:
+        """Translate the text from English into a target language.
 
-        llm_input_query = f"Translate the following text into {state.target_language}: \n\n{state.original_input_query}"
-        state.llm_input_query = llm_input_query
+        On a REDO of a JSON object only the defective keys are sent, with their
+        current translations as context, and the results are patched into the
+        existing translation.
+        """
         initial_iteration = state.translation_state.iteration
+        redo_keys = self._redo_keys(state)
+
+        if redo_keys:
+            defective_keys = redo_keys
+            source = self._json_source(state)
+            input_query = json.dumps(
+                {key: source[key] for key in defective_keys},
+                ensure_ascii=False,
+                indent=2,
+            )
+            current_translation = {
+                key: state.translation_state.current_translation.get(key)
+                for key in defective_keys
+            }
+        else:
+            # full pass; any defective keys are only a hint in the prompt
+            defective_keys = (
+                state.review_state.defective_keys if state.review_state else []
+            )
+            input_query = state.original_input_query
+            current_translation = (
+                state.translation_state.current_translation
+                if state.translation_state
+                else ""
+            )
+
+        llm_input_query = f"Translate the following text into {state.target_language}: \n\n{input_query}"
+        state.llm_input_query = llm_input_query
 
-        result: TranslationState = self.shared_node_logic(
+        result: TranslationState = await self.shared_node_logic(
             state,
-            translate_system_prompt(),
+            self.TRANSLATE_NODE,
             TranslationState,
             {
-                "defective_keys": (
-                    state.review_state.defective_keys if state.review_state else []
-                ),
-                "current_translation": (
-                    state.translation_state.current_translation
-                    if state.translation_state
-                    else ""
-                ),
+                "defective_keys": defective_keys,
+                "current_translation": current_translation,
             },
         )
 
@@ -185,6 +676,18 @@ class TranslatorGraph:
         if state.review_state and len(state.review_state.defective_keys):
             state.review_state.defective_keys = []
 
+        if redo_keys:
+            patch = (
+                result.current_translation
+                if isinstance(result.current_translation, dict)
+                else {}
+            )
+            result.current_translation = {
+                **state.translation_state.current_translation,
+                **{key: value for key, value in patch.items() if key in redo_keys},
+            }
+
+        state.retranslated_keys = redo_keys
         state.translation_state = result
 
         state.translation_state.iteration = (
@@ -193,71 +696,264 @@ class TranslatorGraph:
 
         return state
 
-    def review_node(self, state: AgentState) -> AgentState:
+    async def review_node(self, state: AgentState) -> AgentState:
         """Review the translation of a text from English into a target language."""
-        print("--------------------------------")
-        print("Calling review_node")
-        print("--------------------------------")
+        # the iteration cap limits translations, not reviews: placeholders and
+        # the keys patched by a delta REDO are still checked at the cap
+        at_limit = bool(
+            state.translation_state
+            and state.translation_state.iteration == 2
+            and state.review_state
+        )
+        placeholders = None
+
+        if settings.PLACEHOLDER_VALIDATION:
+            placeholders = self._review_placeholders(state)
+
+        if at_limit and placeholders and placeholders.defective_keys:
+            # never approved: the formatter falls back to the source value of
+            # these keys and reports them as failed
+            state.translation_state.current_translation = {
+                key: value
+                for key, value in state.translation_state.current_translation.items()
+                if key not in placeholders.defective_keys
+            }
+            placeholders = None
+
+        current_translation = state.translation_state.current_translation
+        original_input_query = state.original_input_query
+        # after a delta REDO only the patched keys need another review, and
+        # keys with broken placeholders are redone without one
+        reviewed_keys = None
+
+        if isinstance(current_translation, dict):
+            reviewed_keys = [
+                key
+                for key in state.retranslated_keys or list(current_translation)
+                if key in current_translation
+                and not (placeholders and key in placeholders.defective_keys)
+            ]
+
+        if reviewed_keys is not None and (state.retranslated_keys or placeholders):
+            source = self._json_source(state) or {}
+            current_translation = {
+                key: current_translation[key] for key in reviewed_keys
+            }
+            original_input_query = json.dumps(
+                {key: source.get(key) for key in reviewed_keys},
+                ensure_ascii=False,
+                indent=2,
+            )
 
         llm_input_query = f"""
-        Review the following translation: \n{state.translation_state.current_translation} 
-        The original text is: \n{state.original_input_query}
+        Review the following translation: \n{current_translation} 
+        The original text is: \n{original_input_query}
         The target language is: \n{state.target_language}
         The translation is in JSON format: \n{state.is_json}
         The translation is in string format: \n{state.is_string}
         """
 
         state.llm_input_query = llm_input_query
+        result, mode = None, "local"
+
+        # keys with intact placeholders are reviewed even if others are broken
+        if reviewed_keys is not None:
+            reviewable = bool(reviewed_keys) or not (placeholders or at_limit)
+        else:
+            reviewable = placeholders is None
+
+        if reviewable and (not at_limit or state.retranslated_keys):
+            result = await self.shared_node_logic(
+                state,
+                self.REVIEW_NODE,
+                ReviewState,
+                {
+                    "current_translation": current_translation,
+                    "original_input_query": original_input_query,
+                },
+            )
+            mode = "llm"
+
+        if placeholders and result:
+            # the keys with broken placeholders are redone with the LLM's ones
+            result.defective_keys = placeholders.defective_keys + [
+                key
+                for key in result.defective_keys
+                if key not in placeholders.defective_keys
+            ]
+            result.review_decision = "REDO"
+            result.review_reasoning = (
+                f"{placeholders.review_reasoning}. {result.review_reasoning}"
+            )
+            result.review_translation_rating = min(
+                result.review_translation_rating,
+                placeholders.review_translation_rating,
+            )
+            # the REDO is the placeholder check's decision
+            mode = "local"
+        elif placeholders:
+            result = placeholders
 
         # if maximum iterations reached, approve the translation
-        if (
-            state.translation_state
-            and state.translation_state.iteration == 2
-            and state.review_state
-        ):
-            state.review_state.review_decision = "APPROVE"
-            state.review_state.review_reasoning = "Maximum iterations reached"
+        if at_limit and (result is None or result.review_decision == "REDO"):
+            review = result or state.review_state
+            review.review_reasoning = (
+                f"{ITERATION_LIMIT_REASONING}. {result.review_reasoning}"
+                if result
+                else ITERATION_LIMIT_REASONING
+            )
+            review.review_decision = "APPROVE"
+            review_decisions.inc(decision="APPROVE", mode="limit")
+            state.review_state = review
 
             return state
 
-        # if not, review the translation
-        result: ReviewState = self.shared_node_logic(
-            state,
-            review_system_prompt(),
-            ReviewState,
-            {
-                "current_translation": state.translation_state.current_translation,
-                "original_input_query": state.original_input_query,
-            },
-        )
+        review_decisions.inc(decision=result.review_decision, mode=mode)
+
+        if result.review_decision == "REDO":
+            record_redo(self.REVIEW_NODE)
 
         state.review_state = result
 
         return state
 
-    def format_translation_node(self, state: AgentState) -> AgentState:
-        """Format the translation of a text from English into a target language."""
-        print("--------------------------------")
-        print("Calling format_translation_node")
-        print("--------------------------------")
+    def _review_placeholders(self, state: AgentState) -> Optional[ReviewState]:
+        """REDO translations that lost or changed placeholders, without an LLM call.
 
-        llm_input_query = f"Format the following translation: {state.translation_state.current_translation}"
-        state.llm_input_query = llm_input_query
+        Returns None if the placeholders are intact and the LLM should review.
+        """
+        current_translation = state.translation_state.current_translation
+        source = self._json_source(state) if state.is_json else None
 
-        result: FormatState = self.shared_node_logic(
-            state,
-            format_translation_system_prompt(),
-            FormatState,
-            {
-                "input_query": state.original_input_query,
-                "final_translation": state.translation_state.current_translation,
-            },
+        if source is not None and isinstance(current_translation, dict):
+            keys = state.retranslated_keys or list(source)
+            defective_keys = [
+                key
+                for key in keys
+                if key in source
+                and key in current_translation
+                and not placeholders_match(source[key], current_translation[key])
+            ]
+
+            if not defective_keys:
+                return None
+
+        elif isinstance(current_translation, str) and not state.is_json:
+            if placeholders_match(state.original_input_query, current_translation):
+                return None
+
+            defective_keys = []
+
+        else:
+            return None
+
+        return ReviewState(
+            review_decision="REDO",
+            review_reasoning="Placeholders, markup or links do not match the source",
+            defective_keys=defective_keys,
+            review_translation_rating=1,
         )
 
+    async def format_translation_node(self, state: AgentState) -> AgentState:
+        """Format the translation of a text from English into a target language."""
+        result = self._format_locally(state)
+
+        if result is None:
+            llm_input_query = f"Format the following translation: {state.translation_state.current_translation}"
+            state.llm_input_query = llm_input_query
+
+            result: FormatState = await self.shared_node_logic(
+                state,
+                self.FORMAT_NODE,
+                FormatState,
+                {
+                    "input_query": state.original_input_query,
+                    "final_translation": state.translation_state.current_translation,
+                },
+            )
+
         state.format_state = result
 
         return state
 
+    def _json_source(self, state: AgentState) -> Optional[dict]:
+        """The input query as a dict, if it is a JSON object."""
+        if isinstance(state.original_input_query, dict):
+            return state.original_input_query
+
+        try:
+            source = json.loads(state.original_input_query)
+        except (TypeError, json.JSONDecodeError):
+            return None
+
+        return source if isinstance(source, dict) else None
+
+    def _redo_keys(self, state: AgentState) -> List[str]:
+        """Defective keys that can be re-translated on their own."""
+        if not (
+            settings.DELTA_RETRANSLATION
+            and state.review_state
+            and state.review_state.defective_keys
+            and isinstance(state.translation_state.current_translation, dict)
+        ):
+            return []
+
+        source = self._json_source(state)
+
+        if source is None:
+            return []
+
+        return [key for key in state.review_state.defective_keys if key in source]
+
+    def _format_locally(self, state: AgentState) -> Optional[FormatState]:
+        """Format without an LLM call. Returns None if the LLM formatter should run.
+
+        JSON objects are always formatted locally. Free text is copied as is
+        unless FORMAT_MODE is "llm".
+        """
+        current_translation = state.translation_state.current_translation
+        rating = (
+            state.review_state.review_translation_rating if state.review_state else 0
+        )
+        source = self._json_source(state) if state.is_json else None
+
+        if source is not None:
+            final_translation, issues, fallback_keys = format_json_translation(
+                source, current_translation
+            )
+
+            return FormatState(
+                final_translation=final_translation,
+                final_translation_rating=rating,
+                format_issues=issues,
+                fallback_keys=fallback_keys,
+            )
+
+        if settings.FORMAT_MODE == "llm" or not isinstance(current_translation, str):
+            return None
+
+        return FormatState(
+            final_translation=current_translation, final_translation_rating=rating
+        )
+
+    def _repair_malformed_json_locally(
+        self, malformed_json: str
+    ) -> Optional[FixedMalformedJsonState]:
+        """Repair mechanical JSON mistakes without an LLM call."""
+        fixed_json, applied_fixes = repair_json(str(malformed_json))
+
+        if not isinstance(fixed_json, (dict, list)):
+            return None
+
+        try:
+            return FixedMalformedJsonState(
+                malformed_json_content=str(malformed_json),
+                fixed_json_content=fixed_json,
+                applied_fixes=applied_fixes,
+            )
+        except ValidationError:
+            return None
+
     def review_router(self, state: AgentState):
         """LLM decides whether to redo translation or end."""
         decision = state.review_state.review_decision
@@ -271,6 +967,14 @@ class TranslatorGraph:
         else:
             return self.FORMAT_NODE
 
+    def local_query_assessment_router(self, state: AgentState):
+        """Fall back to the LLM assessor when the local assessment was inconclusive."""
+
+        if state.query_info is None:
+            return self.QUERY_ASSESSMENT_NODE
+
+        return self.fix_malformed_json_router(state)
+
     def fix_malformed_json_router(self, state: AgentState):
         """LLM decides whether to filter out malformed JSON or end."""
 
@@ -282,24 +986,54 @@ class TranslatorGraph:
 
     def _parse_result(self, result: BaseMessage) -> AgentState:
         """Parse the result of the LLM call."""
+        # text() also covers content blocks, e.g. text next to a tool call
         cleaned_content = re.sub(
-            r"<think>.*?</think>", "", result.content, flags=re.DOTALL
+            r"<think>.*?</think>", "", result.text(), flags=re.DOTALL
         ).strip()
 
         return cleaned_content
 
+    def _timed(self, name: str, node):
+        """Wrap a node to record its wall time."""
+
+        async def run(state: AgentState) -> AgentState:
+            started = time.perf_counter()
+
+            try:
+                return await node(state)
+            finally:
+                record_node(name, time.perf_counter() - started)
+
+        return run
+
     def _build_graph(self) -> StateGraph:
         """Build the translation workflow graph."""
         builder = StateGraph(AgentState)
 
-        # Add nodes
-        builder.add_node(self.QUERY_ASSESSMENT_NODE, self.query_assessment_node)
-        builder.add_node(self.TRANSLATE_NODE, self.translate_node)
-        builder.add_node(self.FIX_MALFORMED_JSON_NODE, self.fix_malformed_json)
-        builder.add_node(self.REVIEW_NODE, self.review_node)
-        builder.add_node(self.FORMAT_NODE, self.format_translation_node)
+        # Add nodes, timed
+        nodes = {
+            self.LOCAL_QUERY_ASSESSMENT_NODE: self.local_query_assessment_node,
+            self.QUERY_ASSESSMENT_NODE: self.query_assessment_node,
+            self.TRANSLATE_NODE: self.translate_node,
+            self.FIX_MALFORMED_JSON_NODE: self.fix_malformed_json,
+            self.REVIEW_NODE: self.review_node,
+            self.FORMAT_NODE: self.format_translation_node,
+        }
+
+        for name, node in nodes.items():
+            builder.add_node(name, self._timed(name, node))
 
         # Add edges
+        builder.add_conditional_edges(
+            self.LOCAL_QUERY_ASSESSMENT_NODE,
+            self.local_query_assessment_router,
+            {
+                self.QUERY_ASSESSMENT_NODE: self.QUERY_ASSESSMENT_NODE,
+                self.FIX_MALFORMED_JSON_NODE: self.FIX_MALFORMED_JSON_NODE,
+                self.TRANSLATE_NODE: self.TRANSLATE_NODE,
+            },
+        )
+
         builder.add_conditional_edges(
             self.QUERY_ASSESSMENT_NODE,
             self.fix_malformed_json_router,
@@ -325,7 +1059,11 @@ class TranslatorGraph:
         )
 
         # Set entry point
-        builder.set_entry_point(self.QUERY_ASSESSMENT_NODE)
+        builder.set_entry_point(
+            self.LOCAL_QUERY_ASSESSMENT_NODE
+            if settings.QUERY_ASSESSMENT_MODE == "local"
+            else self.QUERY_ASSESSMENT_NODE
+        )
 
         return builder.compile()
 
@@ -0,0 +1,28 @@
+"""Offline benchmarks for the translation backend.
+
+Run from the ``backend`` directory, e.g. ``python -m benchmarks.ws_load``.
+"""
+
+import os
+
+# Settings fields without defaults must be present before ``config.settings``
+# is imported; benchmarks never talk to a real provider.
+for _name in (
+    "PROJECT_NAME",
+    "VERSION",
+    "HF_TOKEN",
+    "CORS_ORIGINS",
+    "OLLAMA_HOST",
+    "ANTHROPIC_API_KEY",
+    "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_name, "benchmark")
+
+# the graph builds its model on first use; benchmarks replace it with a tuned fake
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+# cached translations would hide the pipeline cost being measured
+os.environ.setdefault("TRANSLATION_MEMORY_ENABLED", "false")
+
+# jobs only need to outlive the benchmark process
+os.environ.setdefault("JOB_STORE_PATH", ":memory:")
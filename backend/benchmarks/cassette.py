@@ -0,0 +1,95 @@
+"""Pure Python overhead of the pipeline, replaying recorded LLM answers.
+
+Records the answers of the fake chat model (with ``--latency`` per call)
+for the inputs of the benchmark suite, then replays the cassette with no
+latency, which leaves only the graph, parsers and service layer, and with
+the recorded latency injected back. Replay must not call the wrapped model
+and must give the same translations as the recording.
+
+    python -m benchmarks.cassette --latency 0.05
+"""
+
+import time
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+from ai_agent.cassette import wrap_with_cassette
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from services.translator import TranslatorService
+from benchmarks.suite import inputs
+
+LANGUAGES = ["french", "spanish"]
+
+
+async def run(data: Dict[str, Any]) -> Dict[str, Any]:
+    service = TranslatorService()
+    translations = {}
+
+    for name, value in data.items():
+        results = await service.process_translation_multi(value, LANGUAGES)
+        translations[name] = {
+            language: result["final_translation"]
+            for language, result in results.items()
+        }
+
+    return translations
+
+
+async def main(args: argparse.Namespace):
+    data = {
+        name: value
+        for name, value in inputs().items()
+        if not isinstance(value, dict) or len(value) <= args.max_keys
+    }
+    fake = FakeTranslatorChatModel(
+        latency=args.latency, latency_per_output_char=args.latency_per_char
+    )
+    modes = {
+        "record": (0.0, 0.0),
+        "replay": (0.0, 0.0),
+        "replay+latency": (args.latency, args.latency_per_char),
+    }
+
+    print(f"{len(data)} inputs x {len(LANGUAGES)} languages")
+    print(f"{'mode':>15} {'wall s':>7} {'ms/input':>9} {'model calls':>12} {'same':>5}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "llm.jsonl.gz")
+        recorded = None
+
+        for mode, (latency, latency_per_char) in modes.items():
+            translator_graph.llm = wrap_with_cassette(
+                fake,
+                mode.split("+")[0],
+                path,
+                latency=latency,
+                latency_per_output_char=latency_per_char,
+            )
+            calls = fake.calls
+            started = time.perf_counter()
+            translations = await run(data)
+            elapsed = time.perf_counter() - started
+            recorded = recorded or translations
+
+            print(
+                f"{mode:>15} {elapsed:>7.2f} {elapsed / len(data) * 1000:>9.1f} "
+                f"{fake.calls - calls:>12} {'yes' if translations == recorded else 'no':>5}"
+            )
+
+        cassette = translator_graph.llm.cassette
+        print(
+            f"cassette: {len(cassette.answers)} answers, "
+            f"{Path(path).stat().st_size / 1024:.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--latency-per-char", type=float, default=0.00002)
+    parser.add_argument("--max-keys", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
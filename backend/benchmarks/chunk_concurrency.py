@@ -0,0 +1,59 @@
+"""Wall time of ``translate_dict_batched`` as chunk concurrency grows.
+
+A dictionary is split into chunks of ``--chunk-size`` keys and translated against the fake
+chat model with injected latency; wall time should fall roughly in
+proportion to the concurrency level until it reaches the chunk count.
+
+    python -m benchmarks.chunk_concurrency --keys 400 --levels 1 2 4 8 16
+"""
+
+import time
+import asyncio
+import argparse
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from config.settings import settings
+from services.chunker import TokenBudgetChunker
+from services.translator import TranslatorService
+
+
+async def main(args: argparse.Namespace):
+    translator_graph.llm = FakeTranslatorChatModel(latency=args.latency)
+    # the provider limit must not be the bottleneck being measured
+    settings.LLM_PROVIDER_CONCURRENCY[translator_graph.llm._llm_type] = 1000
+
+    data = {
+        f"section_{i // 20}.label_{i}": f"Label number {i}" for i in range(args.keys)
+    }
+    chunks = -(-args.keys // args.chunk_size)
+
+    print(f"{args.keys} keys, {chunks} chunks, {args.latency}s per LLM call")
+    print(f"{'level':>6} {'wall s':>8} {'speedup':>8} {'keys ok':>8}")
+
+    baseline = None
+
+    for level in args.levels:
+        service = TranslatorService(
+            max_concurrency=level,
+            chunker=TokenBudgetChunker(10**9, 10**9, max_keys=args.chunk_size),
+        )
+
+        started = time.perf_counter()
+        result = await service.translate_dict_batched(data, "japanese")
+        elapsed = time.perf_counter() - started
+
+        baseline = baseline or elapsed
+        assert list(result["final_translation"]) == list(data)
+
+        translated = len(data) - len(result["failed_keys"])
+        print(f"{level:>6} {elapsed:>8.2f} {baseline / elapsed:>7.1f}x {translated:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=400)
+    parser.add_argument("--chunk-size", type=int, default=35)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    asyncio.run(main(parser.parse_args()))
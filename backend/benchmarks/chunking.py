@@ -0,0 +1,93 @@
+"""Fixed-size chunking vs token-budget chunking over i18n files.
+
+For each file, reports LLM calls (chunks), how full the calls are relative
+to the output budget, how many chunks risk truncation by exceeding it, and
+how many key-prefix groups get split across chunks. Token counts use the
+chunker's estimator.
+
+    python -m benchmarks.chunking [path/to/locale.json ...]
+"""
+
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List
+
+from config.settings import settings
+from services.chunker import TokenBudgetChunker, get_token_counter, key_prefix
+
+CORPUS = Path(__file__).parent / "corpus" / "en.json"
+
+
+def fixed_chunks(data: Dict[str, Any], size: int) -> List[Dict[str, Any]]:
+    items = list(data.items())
+    return [dict(items[i : i + size]) for i in range(0, len(items), size)]
+
+
+def datasets(paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    if paths:
+        return {Path(path).name: json.loads(Path(path).read_text()) for path in paths}
+
+    data = json.loads(CORPUS.read_text())
+
+    return {
+        "en.json": data,
+        "labels only": {k: v for k, v in data.items() if len(v) < 40},
+        "paragraphs only": {
+            f"{k}_{i}": v for i in range(4) for k, v in data.items() if len(v) >= 100
+        },
+    }
+
+
+def report(name: str, chunks: List[Dict[str, Any]], chunker: TokenBudgetChunker):
+    outputs = [
+        sum(chunker.estimate(key, value)["output"] for key, value in chunk.items())
+        for chunk in chunks
+    ]
+    overflowing = sum(1 for output in outputs if output > chunker.output_token_budget)
+    fill = sum(outputs) / (len(chunks) * chunker.output_token_budget)
+
+    groups = {}
+    for index, chunk in enumerate(chunks):
+        for key in chunk:
+            groups.setdefault(key_prefix(key), set()).add(index)
+    split = sum(1 for indexes in groups.values() if len(indexes) > 1)
+
+    print(
+        f"  {name:<14} {len(chunks):>6} {max(outputs):>11} {fill:>6.0%} "
+        f"{overflowing:>9} {split:>12}"
+    )
+
+
+def main(args: argparse.Namespace):
+    chunker = TokenBudgetChunker(
+        input_token_budget=args.input_budget,
+        output_token_budget=args.output_budget,
+        max_keys=args.max_keys,
+        output_ratio=settings.CHUNK_OUTPUT_TOKEN_RATIO,
+        count_tokens=get_token_counter(args.tokenizer),
+    )
+
+    for name, data in datasets(args.files).items():
+        print(f"{name}: {len(data)} keys, output budget {args.output_budget} tokens")
+        print(
+            f"  {'strategy':<14} {'calls':>6} {'max out tok':>11} {'fill':>6} "
+            f"{'overflow':>9} {'split groups':>12}"
+        )
+        report("fixed 35", fixed_chunks(data, 35), chunker)
+        report("fixed 40", fixed_chunks(data, 40), chunker)
+        report("token budget", chunker.chunk(data), chunker)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("files", nargs="*")
+    parser.add_argument(
+        "--input-budget", type=int, default=settings.CHUNK_INPUT_TOKEN_BUDGET
+    )
+    parser.add_argument(
+        "--output-budget", type=int, default=settings.CHUNK_OUTPUT_TOKEN_BUDGET
+    )
+    parser.add_argument("--max-keys", type=int, default=settings.CHUNK_MAX_KEYS)
+    parser.add_argument("--tokenizer", default=settings.CHUNK_TOKENIZER)
+    main(parser.parse_args())
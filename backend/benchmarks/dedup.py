@@ -0,0 +1,65 @@
+"""LLM traffic with and without deduplication of repeated values.
+
+Translates the locale corpus, which repeats values like "Save" and
+"Cancel" across many keys, with every occurrence sent to the model and
+with each distinct value sent once.
+
+    python -m benchmarks.dedup --max-keys 20
+"""
+
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from config.settings import settings
+from services.chunker import TokenBudgetChunker
+from services.translator import TranslatorService
+
+LANGUAGES = ["french", "spanish"]
+CORPUS = Path(__file__).parent / "corpus" / "en.json"
+
+
+async def main(args: argparse.Namespace):
+    data = json.loads(args.corpus.read_text())
+
+    print(f"{len(data)} keys x {len(LANGUAGES)} languages, {args.latency}s per call")
+    print(
+        f"{'dedup':>6} {'wall s':>7} {'calls':>6} {'in tokens':>10} "
+        f"{'out tokens':>11} {'ratio':>6}"
+    )
+
+    for dedup in (False, True):
+        llm = FakeTranslatorChatModel(
+            latency=args.latency, latency_per_output_char=args.latency_per_char
+        )
+        translator_graph.llm = llm
+        service = TranslatorService(
+            chunker=TokenBudgetChunker(
+                settings.CHUNK_INPUT_TOKEN_BUDGET,
+                settings.CHUNK_OUTPUT_TOKEN_BUDGET,
+                args.max_keys,
+            ),
+            dedup=dedup,
+        )
+        started = time.perf_counter()
+
+        results = await service.process_translation_multi(data, LANGUAGES)
+
+        print(
+            f"{'on' if dedup else 'off':>6} {time.perf_counter() - started:>7.2f} "
+            f"{llm.calls:>6} {llm.input_chars // 4:>10} {llm.output_chars // 4:>11} "
+            f"{results[LANGUAGES[0]]['dedup_ratio']:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", type=Path, default=CORPUS)
+    parser.add_argument("--max-keys", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--latency-per-char", type=float, default=0.0001)
+    asyncio.run(main(parser.parse_args()))
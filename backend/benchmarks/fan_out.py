@@ -0,0 +1,62 @@
+"""Per-language pipelines vs shared multi-target fan-out.
+
+"independent" runs the full pipeline once per language, as the handlers
+used to; "fan-out" prepares the input once (assessment, JSON repair,
+chunking) and only runs translate/review/format per language.
+
+    python -m benchmarks.fan_out --latency 0.1
+"""
+
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from services.translator import TranslatorService
+
+LANGUAGES = ["arabic", "french", "japanese", "portuguese", "spanish"]
+CORPUS = Path(__file__).parent / "corpus" / "en.json"
+
+INPUTS = {
+    # starts with a bracket but is prose, so assessment falls back to the LLM
+    "ambiguous text": "[Beta] Scheduled scans now run every night at 02:00.",
+    "malformed json": "{save: 'Save', cancel: 'Cancel', delete: 'Delete',}",
+    "349-key dict": CORPUS.read_text(),
+}
+
+
+async def independent(service: TranslatorService, text: str):
+    await asyncio.gather(
+        *(service.process_translation(text, language) for language in LANGUAGES)
+    )
+
+
+async def fan_out(service: TranslatorService, text: str):
+    await service.process_translation_multi(text, LANGUAGES)
+
+
+async def main(args: argparse.Namespace):
+    print(f"{len(LANGUAGES)} target languages, {args.latency}s per LLM call")
+    print(f"{'input':>16} {'mode':>12} {'wall s':>7} {'calls':>6} {'assess':>7}")
+
+    for name, text in INPUTS.items():
+        for mode, run in (("independent", independent), ("fan-out", fan_out)):
+            llm = FakeTranslatorChatModel(latency=args.latency)
+            translator_graph.llm = llm
+
+            started = time.perf_counter()
+            await run(TranslatorService(), text)
+            elapsed = time.perf_counter() - started
+
+            print(
+                f"{name:>16} {mode:>12} {elapsed:>7.2f} {llm.calls:>6} "
+                f"{llm.calls_by_schema.get('QueryInfoState', 0):>7}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,148 @@
+"""Per-call latency of the anthropic backend by HTTP connection reuse.
+
+Starts a local stand-in for the Anthropic Messages API that answers after
+``--latency`` seconds and delays the first request of every connection by
+``--handshake-latency``, the round trips a TCP and TLS set-up costs against
+a remote provider. ``--calls`` calls, ``--concurrency`` at a time, are made
+through the anthropic backend with:
+
+- a pool that keeps no connection alive, as when every call gets a new client
+- httpx's default limits: 20 kept-alive connections for 5 seconds
+- the shared pool sized by settings (``LLM_HTTP_*``)
+
+and report per-call latency, connections opened and pool wait time. The
+default concurrency is the scheduler's default limit of calls in flight
+per provider (``LLM_PROVIDER_MAX_CONCURRENCY``).
+
+    python -m benchmarks.http_pool --calls 400 --concurrency 8
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+from typing import List
+
+from ai_agent.llm_backends import anthropic_backend
+from core.http_pool import HttpPool, http_connections_opened, http_pool_wait
+from benchmarks.suite import percentile
+
+ANSWER = {
+    "id": "msg_benchmark",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-sonnet-4-20250514",
+    "content": [{"type": "text", "text": "Enregistrez vos modifications."}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 24, "output_tokens": 8},
+}
+
+
+async def serve_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    latency: float,
+    handshake_latency: float,
+):
+    """Answer every request of one kept-alive connection."""
+    body = json.dumps(ANSWER).encode()
+    await asyncio.sleep(handshake_latency)
+
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            headers = dict(
+                line.split(": ", 1)
+                for line in head.decode("latin-1").lower().split("\r\n")[1:]
+                if ": " in line
+            )
+            await reader.readexactly(int(headers.get("content-length", 0)))
+            await asyncio.sleep(latency)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+                b"content-length: %d\r\n\r\n%s" % (len(body), body)
+            )
+            await writer.drain()
+
+            if headers.get("connection") == "close":
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_calls(pool: HttpPool, calls: int, concurrency: int) -> List[float]:
+    llm = anthropic_backend(None, pool)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call() -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            await llm.ainvoke("Save your changes.")
+
+            return time.perf_counter() - started
+
+    latencies = await asyncio.gather(*(call() for _ in range(calls)))
+    await pool.aclose()
+
+    return latencies
+
+
+async def main(args: argparse.Namespace):
+    server = await asyncio.start_server(
+        lambda reader, writer: serve_connection(
+            reader, writer, args.latency, args.handshake_latency
+        ),
+        "127.0.0.1",
+        0,
+    )
+    port = server.sockets[0].getsockname()[1]
+    # read by ChatAnthropic when it is created
+    os.environ["ANTHROPIC_API_URL"] = f"http://127.0.0.1:{port}"
+
+    pools = {
+        "no_keepalive": HttpPool(max_keepalive_connections=0, name="no_keepalive"),
+        "httpx_defaults": HttpPool(
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=5.0,
+            name="httpx_defaults",
+        ),
+        "shared_pool": HttpPool.from_settings(),
+    }
+
+    print(
+        f"{args.calls} calls, {args.concurrency} at a time, "
+        f"{args.latency * 1000:.0f} ms answers, "
+        f"{args.handshake_latency * 1000:.0f} ms connection set-up"
+    )
+    print(
+        f"{'pool':>15} {'mean ms':>8} {'p50 ms':>7} {'p95 ms':>7} "
+        f"{'connections':>12} {'wait ms':>8}"
+    )
+
+    async with server:
+        for name, pool in pools.items():
+            latencies = await run_calls(pool, args.calls, args.concurrency)
+            label = f"{pool.name}_async"
+            waits = http_pool_wait.count(pool=label)
+            mean_wait = http_pool_wait.sum(pool=label) / waits if waits else 0.0
+            print(
+                f"{name:>15} {sum(latencies) / len(latencies) * 1000:>8.1f} "
+                f"{percentile(latencies, 50) * 1000:>7.1f} "
+                f"{percentile(latencies, 95) * 1000:>7.1f} "
+                f"{http_connections_opened.value(pool=label):>12.0f} "
+                f"{mean_wait * 1000:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--handshake-latency", type=float, default=0.06)
+    asyncio.run(main(parser.parse_args()))
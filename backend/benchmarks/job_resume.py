@@ -0,0 +1,104 @@
+"""Work lost when a job's worker crashes halfway.
+
+Runs the locale corpus as a job, kills the worker pool once about half of
+the chunks are checkpointed (cancelling in-flight calls without handing the
+job back, as a crashed process would), then starts a new pool on the same
+store. The new pool resumes the job after its lease expires and only
+translates the chunks that were not checkpointed.
+
+    python -m benchmarks.job_resume --max-keys 20 --crash-at 0.5
+"""
+
+import time
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from config.settings import settings
+from core.pubsub import PubSub
+from services.chunker import TokenBudgetChunker
+from services.jobs import JobQueue, JobStore
+from services.translator import TranslatorService
+
+LANGUAGE = "french"
+CORPUS = Path(__file__).parent / "corpus" / "en.json"
+
+
+async def main(args: argparse.Namespace):
+    llm = FakeTranslatorChatModel(latency=args.latency)
+    translator_graph.llm = llm
+    service = TranslatorService(
+        chunker=TokenBudgetChunker(
+            settings.CHUNK_INPUT_TOKEN_BUDGET,
+            settings.CHUNK_OUTPUT_TOKEN_BUDGET,
+            args.max_keys,
+        )
+    )
+    text = CORPUS.read_text()
+    chunks = len((await service.prepare(text)).chunks)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = JobStore(str(Path(directory) / "jobs.sqlite3"))
+
+        def new_queue() -> JobQueue:
+            return JobQueue(
+                store,
+                service,
+                PubSub(),
+                workers=1,
+                lease_seconds=args.lease,
+                poll_interval=args.lease / 4,
+            )
+
+        queue = new_queue()
+        await queue.start()
+        job_id = await queue.submit(text, [LANGUAGE])
+
+        while len(store.chunks(job_id, LANGUAGE)) < chunks * args.crash_at:
+            await asyncio.sleep(0.01)
+
+        # a crash: no release, the lease has to expire
+        for task in queue._tasks:
+            task.cancel()
+
+        await asyncio.gather(*queue._tasks, return_exceptions=True)
+        checkpointed = len(store.chunks(job_id, LANGUAGE))
+        calls_before = llm.calls
+
+        crashed = time.perf_counter()
+        queue = new_queue()
+        await queue.start()
+        job = await queue.wait(job_id)
+        resumed = time.perf_counter() - crashed
+        await queue.stop()
+
+        calls_after = llm.calls - calls_before
+
+        # the same job from scratch, for the calls a restart would repeat
+        queue = new_queue()
+        await queue.start()
+        calls_before = llm.calls
+        await queue.wait(await queue.submit(text, [LANGUAGE]))
+        calls_fresh = llm.calls - calls_before
+        await queue.stop()
+
+    print(
+        f"{chunks} chunks, {checkpointed} checkpointed at the crash, "
+        f"job {job['status']} after {job['attempts']} attempts"
+    )
+    print(f"{'run':>18} {'calls':>6}")
+    print(f"{'from scratch':>18} {calls_fresh:>6}")
+    print(f"{'resumed':>18} {calls_after:>6}")
+    print(f"resumed in {resumed:.2f}s, including a {args.lease}s lease")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-keys", type=int, default=20)
+    parser.add_argument("--crash-at", type=float, default=0.5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--lease", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
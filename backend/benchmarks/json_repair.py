@@ -0,0 +1,60 @@
+"""Repair rate and latency of the local malformed-JSON pass.
+
+Replays ``corpus/malformed_json.json``; cases with ``expected: null`` are
+not safely repairable and must be left to the LLM node. Latency saved is
+estimated against one ``fix_malformed_json`` LLM round trip per repaired
+payload.
+
+    python -m benchmarks.json_repair --llm-latency 4.0
+"""
+
+import json
+import time
+import argparse
+from pathlib import Path
+
+from ai_agent.json_repair import repair_json
+
+CORPUS = Path(__file__).parent / "corpus" / "malformed_json.json"
+
+
+def main(args: argparse.Namespace):
+    cases = json.loads(CORPUS.read_text())
+    repaired = wrong = deferred = 0
+    local_seconds = 0.0
+
+    for case in cases:
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            value, fixes = repair_json(case["input"])
+        local_seconds += (time.perf_counter() - started) / args.repeat
+
+        if value is None:
+            status = "llm" if case["expected"] is None else "MISSED"
+            deferred += 1
+        elif value == case["expected"]:
+            status = "ok"
+            repaired += 1
+        else:
+            status = "WRONG"
+            wrong += 1
+
+        if args.verbose or status in ("MISSED", "WRONG"):
+            print(f"{status:>6}  {case['name']}: {', '.join(fixes)}")
+
+    repairable = sum(1 for case in cases if case["expected"] is not None)
+
+    print(f"cases:          {len(cases)}")
+    print(f"repair rate:    {repaired}/{repairable} ({repaired / repairable:.0%})")
+    print(f"wrong repairs:  {wrong}")
+    print(f"sent to LLM:    {deferred}")
+    print(f"local time:     {local_seconds / len(cases) * 1e6:.1f} us per payload")
+    print(f"latency saved:  {repaired * args.llm_latency:.1f} s over the corpus")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--llm-latency", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--verbose", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,106 @@
+"""Prompt tokens and REDO cycles with placeholder masking and validation.
+
+Translates a fixture of UI strings full of ``{{ variables }}``, ICU plural
+and select arguments, HTML tags, URLs and emails. The fake model drops a
+placeholder from the first translation of ``--placeholder-error-rate`` of
+the values and its reviewer flags them, so their chunk goes through REDO. Masked
+``⟦n⟧`` tokens are not dropped by the fake, as models rarely touch tokens
+with nothing to translate in them; the REDO rate with masking is only as
+good as that assumption.
+
+    python -m benchmarks.masking --placeholder-error-rate 0.3
+"""
+
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.masking import placeholders_match
+from ai_agent.workflow import review_decisions, translator_graph
+from config.settings import settings
+from services.chunker import TokenBudgetChunker
+from services.translator import TranslatorService, untranslatable_values
+
+LANGUAGES = ["french", "spanish"]
+CORPUS = Path(__file__).parent / "corpus" / "placeholders.json"
+
+# name: (PLACEHOLDER_MASKING, PLACEHOLDER_VALIDATION)
+MODES = {"plain": (False, False), "validated": (False, True), "masked": (True, True)}
+
+
+def decisions(decision: str = None, mode: str = None) -> float:
+    return sum(
+        value
+        for (sample_decision, sample_mode), value in review_decisions.samples().items()
+        if decision in (None, sample_decision) and mode in (None, sample_mode)
+    )
+
+
+async def main(args: argparse.Namespace):
+    data = json.loads(args.corpus.read_text())
+    keys = len(data) * len(LANGUAGES)
+
+    print(
+        f"{len(data)} keys x {len(LANGUAGES)} languages in chunks of {args.max_keys}, "
+        f"{args.placeholder_error_rate:.0%} of first translations drop a placeholder"
+    )
+    print(
+        f"{'mode':>10} {'wall s':>7} {'calls':>6} {'reviews':>8} {'tokens/key':>11} "
+        f"{'REDO %':>7} {'local':>6} {'skipped':>8} {'broken':>7}"
+    )
+
+    for mode, (masking, validation) in MODES.items():
+        settings.PLACEHOLDER_MASKING = masking
+        settings.PLACEHOLDER_VALIDATION = validation
+        llm = FakeTranslatorChatModel(
+            latency=args.latency, placeholder_error_rate=args.placeholder_error_rate
+        )
+        # node prompts are compiled when the model is set
+        translator_graph.llm = llm
+
+        reviewed, redone, local = (
+            decisions(),
+            decisions("REDO"),
+            decisions(mode="local"),
+        )
+        skipped = sum(untranslatable_values.samples().values())
+        started = time.perf_counter()
+
+        service = TranslatorService(
+            chunker=TokenBudgetChunker(
+                settings.CHUNK_INPUT_TOKEN_BUDGET,
+                settings.CHUNK_OUTPUT_TOKEN_BUDGET,
+                args.max_keys,
+            ),
+            masking=masking,
+        )
+        results = await service.process_translation_multi(data, LANGUAGES)
+
+        reviews = decisions() - reviewed
+        broken = sum(
+            not placeholders_match(data[key], value)
+            for result in results.values()
+            for key, value in result["final_translation"].items()
+        )
+
+        print(
+            f"{mode:>10} {time.perf_counter() - started:>7.2f} {llm.calls:>6} "
+            f"{llm.calls_by_schema.get('ReviewState', 0):>8} "
+            f"{llm.input_chars / 4 / keys:>11.1f} "
+            f"{(decisions('REDO') - redone) / max(reviews, 1):>7.1%} "
+            f"{decisions(mode='local') - local:>6.0f} "
+            f"{sum(untranslatable_values.samples().values()) - skipped:>8.0f} "
+            f"{broken:>7}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", type=Path, default=CORPUS)
+    parser.add_argument("--placeholder-error-rate", type=float, default=0.3)
+    parser.add_argument("--max-keys", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.01)
+    asyncio.run(main(parser.parse_args()))
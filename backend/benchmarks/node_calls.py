@@ -0,0 +1,78 @@
+"""LLM calls per graph node, with and without the local nodes.
+
+"llm" reproduces the original pipeline (LLM assessment and LLM format for
+every job); "local" is the default configuration, where assessment, JSON
+repair and formatting run locally and only ambiguous inputs reach the model.
+
+    python -m benchmarks.node_calls
+"""
+
+import json
+import asyncio
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from config.settings import settings
+from services.translator import TranslatorService
+
+SCHEMA_NODES = {
+    "QueryInfoState": translator_graph.QUERY_ASSESSMENT_NODE,
+    "FixedMalformedJsonState": translator_graph.FIX_MALFORMED_JSON_NODE,
+    "TranslationState": translator_graph.TRANSLATE_NODE,
+    "ReviewState": translator_graph.REVIEW_NODE,
+    "FormatState": translator_graph.FORMAT_NODE,
+}
+
+INPUTS = [
+    "Save your changes before leaving the page.",
+    "Welcome back, <strong>{{ name }}</strong>! You have new messages.",
+    "Run the scanner:\n```bash\nak scan --all\n```",
+    json.dumps({"save": "Save", "cancel": "Cancel", "delete": "Delete"}),
+    json.dumps({f"settings.item_{i}": f"Setting {i}" for i in range(30)}),
+    "{save: 'Save', cancel: 'Cancel',}",
+]
+
+
+async def run(mode: str) -> dict:
+    settings.QUERY_ASSESSMENT_MODE = mode
+    settings.FORMAT_MODE = mode
+    translator_graph.graph = translator_graph._build_graph()
+
+    llm = FakeTranslatorChatModel()
+    translator_graph.llm = llm
+    local_format = translator_graph._format_locally
+
+    if mode == "llm":
+        # the original graph sent every job, JSON included, to the LLM formatter
+        translator_graph._format_locally = lambda state: None
+
+    try:
+        for text in INPUTS:
+            await TranslatorService().process_translation(text, "japanese")
+    finally:
+        translator_graph._format_locally = local_format
+
+    return {
+        SCHEMA_NODES.get(schema, schema): calls
+        for schema, calls in llm.calls_by_schema.items()
+    }
+
+
+async def main():
+    results = {mode: await run(mode) for mode in ("llm", "local")}
+
+    print(f"{len(INPUTS)} jobs")
+    print(f"{'node':>20} {'before':>7} {'after':>6}")
+
+    for node in SCHEMA_NODES.values():
+        print(
+            f"{node:>20} {results['llm'].get(node, 0):>7} {results['local'].get(node, 0):>6}"
+        )
+
+    print(
+        f"{'total':>20} {sum(results['llm'].values()):>7} {sum(results['local'].values()):>6}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,156 @@
+"""Python overhead of one LLM node call, apart from network time.
+
+Calls ``shared_node_logic`` for each node against a zero-latency fake model,
+with the prompts compiled at graph construction, parsing free text
+("compiled") or binding the schema as a tool ("native"), and with the
+templates, schema instructions and retry parser rebuilt on every call as
+the node used to ("per call").
+
+    python -m benchmarks.node_overhead --calls 500
+"""
+
+import json
+import time
+import asyncio
+import argparse
+
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain.output_parsers import RetryWithErrorOutputParser
+from langchain.prompts import HumanMessagePromptTemplate, SystemMessagePromptTemplate
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.prompts import output_format_instructions
+from ai_agent.state import AgentState
+from ai_agent.workflow import translator_graph
+from config.settings import settings
+
+SOURCE = {f"screen.label_{i}": f"Scan finished with {i} issues" for i in range(20)}
+TRANSLATION = {key: f"[french] {value}" for key, value in SOURCE.items()}
+
+PARTIALS = {
+    translator_graph.QUERY_ASSESSMENT_NODE: {"is_string": False, "is_json": True},
+    translator_graph.TRANSLATE_NODE: {
+        "defective_keys": [],
+        "current_translation": {},
+    },
+    translator_graph.REVIEW_NODE: {
+        "current_translation": TRANSLATION,
+        "original_input_query": SOURCE,
+    },
+    translator_graph.FORMAT_NODE: {
+        "input_query": SOURCE,
+        "final_translation": TRANSLATION,
+    },
+}
+
+QUERIES = {
+    translator_graph.QUERY_ASSESSMENT_NODE: "Assess the following text: "
+    + json.dumps(SOURCE),
+    translator_graph.TRANSLATE_NODE: "Translate the following text into french: \n\n"
+    + json.dumps(SOURCE),
+    translator_graph.REVIEW_NODE: "\n        Review the following translation: \n"
+    f"{TRANSLATION} \n        The original text is: \n{SOURCE}"
+    "\n        The target language is: \nfrench",
+    translator_graph.FORMAT_NODE: "Format the following translation: "
+    + json.dumps(TRANSLATION),
+}
+
+
+async def per_call(state: AgentState, node: str, pydantic_object, partials: dict):
+    """The node call as it was before prompts were compiled."""
+    system_prompt = translator_graph.node_prompt_specs[(node, pydantic_object)]
+    parser = PydanticOutputParser(pydantic_object=pydantic_object)
+
+    system = SystemMessagePromptTemplate.from_template(system_prompt())
+    human = HumanMessagePromptTemplate.from_template("{llm_input_query}")
+
+    format_instructions = output_format_instructions(
+        pydantic_object.model_json_schema()
+    )
+    prompt = (system + human).partial(
+        format_instructions=format_instructions, **partials
+    )
+    retry_parser = RetryWithErrorOutputParser.from_llm(
+        parser=parser, llm=translator_graph.llm
+    )
+
+    result = await (prompt | translator_graph.llm).ainvoke(
+        {"llm_input_query": state.llm_input_query}
+    )
+
+    return await retry_parser.aparse_with_prompt(
+        translator_graph._parse_result(result), prompt.invoke(state.llm_input_query)
+    )
+
+
+def use_output_mode(mode: str):
+    # node prompts are compiled when the model is set
+    settings.STRUCTURED_OUTPUT_MODE = mode
+    translator_graph.llm = FakeTranslatorChatModel()
+
+
+async def main(args: argparse.Namespace):
+    use_output_mode("parser")
+
+    print(f"{args.calls} calls per node, zero-latency model")
+    print(
+        f"{'node':>18} {'per call us':>12} {'compiled us':>12} {'saved':>6} "
+        f"{'native us':>10}"
+    )
+
+    for key, system_prompt in translator_graph.node_prompt_specs.items():
+        node, pydantic_object = key
+
+        if node not in PARTIALS:
+            continue
+
+        state = AgentState(
+            original_input_query=json.dumps(SOURCE),
+            llm_input_query=QUERIES[node],
+            target_language="french",
+            is_json=True,
+            is_string=False,
+        )
+        partials = PARTIALS[node]
+
+        # both paths must send the model the same messages
+        rendered = translator_graph.node_prompts[key].render(
+            state.llm_input_query, partials
+        )
+        template = (
+            SystemMessagePromptTemplate.from_template(system_prompt())
+            + HumanMessagePromptTemplate.from_template("{llm_input_query}")
+        ).partial(
+            format_instructions=output_format_instructions(
+                pydantic_object.model_json_schema()
+            ),
+            **partials,
+        )
+        assert rendered == template.invoke({"llm_input_query": state.llm_input_query})
+
+        timings = {}
+
+        for mode, call, output_mode in (
+            ("per call", per_call, "parser"),
+            ("compiled", translator_graph.shared_node_logic, "parser"),
+            ("native", translator_graph.shared_node_logic, "native"),
+        ):
+            use_output_mode(output_mode)
+            started = time.perf_counter()
+
+            for _ in range(args.calls):
+                await call(state, node, pydantic_object, partials)
+
+            timings[mode] = (time.perf_counter() - started) / args.calls * 1e6
+
+        print(
+            f"{node:>18} {timings['per call']:>12.0f} {timings['compiled']:>12.0f} "
+            f"{1 - timings['compiled'] / timings['per call']:>6.0%} "
+            f"{timings['native']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
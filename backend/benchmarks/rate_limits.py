@@ -0,0 +1,149 @@
+"""Throughput and failures against a rate-limited provider.
+
+A simulated provider enforces requests and tokens per minute with token
+buckets, answers 429 beyond them and 529 (overloaded) on a share of calls.
+A burst of interactive strings and bulk dictionary chunks is sent
+"unscheduled" (concurrency limit only, as before) and through the
+``ProviderScheduler`` with the same limits. Scheduled calls reserve
+``--estimate-ratio`` times the tokens they use, as the workflow's estimates
+may, and settle the reservation with their actual usage once they return.
+
+    python -m benchmarks.rate_limits --tpm 1800000 --rpm 3000 --calls 300
+"""
+
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from typing import Dict, List
+
+from core.concurrency import ConcurrencyLimiter
+from core.scheduler import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    ProviderScheduler,
+    TokenBucket,
+)
+
+INTERACTIVE_TOKENS = 100
+BULK_TOKENS = 1500
+
+
+class SimulatedProviderError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class SimulatedProvider:
+    def __init__(self, args: argparse.Namespace):
+        self.requests = TokenBucket(args.rpm / 60, args.rpm / 60 * args.burst)
+        self.tokens = TokenBucket(args.tpm / 60, args.tpm / 60 * args.burst)
+        self.latency = args.latency
+        self.overload_rate = args.overload_rate
+        self.random = random.Random(0)
+        self.responses: Dict[int, int] = {}
+        self.accepted_tokens = 0
+
+    async def call(self, tokens: int):
+        status = 200
+
+        if self.requests.time_until(1) > 0 or self.tokens.time_until(tokens) > 0:
+            status = 429
+        elif self.random.random() < self.overload_rate:
+            status = 529
+
+        self.responses[status] = self.responses.get(status, 0) + 1
+
+        if status != 200:
+            raise SimulatedProviderError(status)
+
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self.accepted_tokens += tokens
+        await asyncio.sleep(self.latency)
+
+
+async def run(mode: str, args: argparse.Namespace):
+    provider = SimulatedProvider(args)
+    limiter = ConcurrencyLimiter(args.concurrency)
+    scheduler = ProviderScheduler(
+        "simulated",
+        max_concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        burst_seconds=args.burst,
+        max_retries=8,
+        backoff_base=0.05,
+        backoff_max=2.0,
+    )
+    latencies: Dict[str, List[float]] = {"interactive": [], "bulk": []}
+    failures = 0
+    started = time.perf_counter()
+
+    async def job(kind: str, tokens: int, priority: int):
+        nonlocal failures
+        job_started = time.perf_counter()
+
+        try:
+            if mode == "scheduled":
+                estimated = int(tokens * args.estimate_ratio)
+                await scheduler.run(lambda: provider.call(tokens), estimated, priority)
+                scheduler.record_usage(estimated, tokens)
+            else:
+                async with limiter:
+                    await provider.call(tokens)
+        except SimulatedProviderError:
+            failures += 1
+            return
+
+        latencies[kind].append(time.perf_counter() - job_started)
+
+    jobs = []
+
+    for index in range(args.calls):
+        if index % 5 == 0:
+            jobs.append(job("interactive", INTERACTIVE_TOKENS, PRIORITY_INTERACTIVE))
+        else:
+            jobs.append(job("bulk", BULK_TOKENS, PRIORITY_BULK))
+
+    await asyncio.gather(*jobs)
+    elapsed = time.perf_counter() - started
+
+    def p50(values: List[float]) -> str:
+        return f"{statistics.median(values):.2f}" if values else "-"
+
+    print(
+        f"{mode:>12} {elapsed:>7.2f} {args.calls - failures:>5} {failures:>6} "
+        f"{provider.responses.get(429, 0):>5} {provider.responses.get(529, 0):>5} "
+        f"{provider.accepted_tokens / elapsed * 60 / args.tpm:>7.0%} "
+        f"{p50(latencies['interactive']):>9} {p50(latencies['bulk']):>7}"
+    )
+
+
+async def main(args: argparse.Namespace):
+    print(
+        f"{args.calls} calls (1 in 5 interactive), limits {args.rpm} rpm / "
+        f"{args.tpm} tpm, {args.overload_rate:.0%} overloaded"
+    )
+    print(
+        f"{'mode':>12} {'wall s':>7} {'done':>5} {'failed':>6} {'429s':>5} "
+        f"{'529s':>5} {'of tpm':>7} {'inter p50':>9} {'bulk p50':>7}"
+    )
+
+    for mode in ("unscheduled", "scheduled"):
+        await run(mode, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--rpm", type=int, default=3000)
+    parser.add_argument("--tpm", type=int, default=1_800_000)
+    parser.add_argument("--burst", type=float, default=2.0)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--overload-rate", type=float, default=0.02)
+    parser.add_argument("--estimate-ratio", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,76 @@
+"""Cost of REDO iterations with full vs delta-only re-translation.
+
+The fake reviewer flags ``--defect-rate`` of the keys on the first review.
+Full re-translation resends the whole chunk; delta re-translation sends
+only the defective keys, so retry characters (a proxy for tokens) and
+output-bound latency should shrink roughly in proportion to the defect rate.
+
+    python -m benchmarks.redo_delta --keys 35 --defect-rate 0.2
+"""
+
+import time
+import asyncio
+import argparse
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from config.settings import settings
+from services.chunker import TokenBudgetChunker
+from services.translator import TranslatorService
+
+
+async def run(data: dict, delta: bool, args: argparse.Namespace) -> dict:
+    settings.DELTA_RETRANSLATION = delta
+    llm = FakeTranslatorChatModel(
+        latency=args.latency,
+        latency_per_output_char=args.latency_per_char,
+        defect_rate=args.defect_rate,
+    )
+    translator_graph.llm = llm
+
+    started = time.perf_counter()
+    # one chunk, so every retry is measured against the whole dictionary
+    service = TranslatorService(
+        chunker=TokenBudgetChunker(10**9, 10**9, max_keys=len(data))
+    )
+    result = await service.translate_dict_batched(data, "japanese")
+    elapsed = time.perf_counter() - started
+
+    assert list(result["final_translation"]) == list(data)
+
+    return {
+        "wall": elapsed,
+        "calls": llm.calls,
+        "input_chars": llm.input_chars,
+        "output_chars": llm.output_chars,
+        "iterations": result["iterations"],
+        "decision": result["review_decision"],
+    }
+
+
+async def main(args: argparse.Namespace):
+    data = {
+        f"settings.option_{i}": f"Enable the advanced option number {i} for this workspace"
+        for i in range(args.keys)
+    }
+
+    print(f"{args.keys} keys, defect rate {args.defect_rate:.0%}")
+    print(
+        f"{'mode':>6} {'wall s':>7} {'calls':>6} {'in chars':>9} {'out chars':>10} {'iters':>6}"
+    )
+
+    for delta in (False, True):
+        stats = await run(data, delta, args)
+        print(
+            f"{'delta' if delta else 'full':>6} {stats['wall']:>7.2f} {stats['calls']:>6} "
+            f"{stats['input_chars']:>9} {stats['output_chars']:>10} {stats['iterations']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=35)
+    parser.add_argument("--defect-rate", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--latency-per-char", type=float, default=0.0005)
+    asyncio.run(main(parser.parse_args()))
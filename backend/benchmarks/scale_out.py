@@ -0,0 +1,172 @@
+"""Jobs run by several worker processes, delivered to sockets of another.
+
+Starts a ``core.broker`` on a Unix socket and ``--processes`` worker
+processes that run jobs from a shared job store. This process plays the
+WebSocket server: simulated sockets send ``translate_multi`` through the
+real handler, and job events have to cross the broker to reach them.
+Counts the jobs each process ran and checks every socket got its events.
+
+    python -m benchmarks.scale_out --processes 1 2 4 --clients 40
+"""
+
+import os
+import tempfile
+
+# shared by this process and the worker processes it starts, which inherit it
+_directory = os.environ.get("SCALE_OUT_DIRECTORY") or tempfile.mkdtemp(
+    prefix="ak-scale-out-"
+)
+os.environ["SCALE_OUT_DIRECTORY"] = _directory
+os.environ["PUBSUB_BACKEND"] = "broker"
+os.environ["PUBSUB_URL"] = f"unix://{_directory}/broker.sock"
+os.environ["JOB_STORE_PATH"] = f"{_directory}/jobs.sqlite3"
+
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+from collections import Counter
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from config.settings import settings
+from core.broker import Broker
+from core.pubsub import pubsub
+from services.jobs import job_queue
+from websocket.manager import ws_manager
+from websocket.handlers import handle_websocket_message
+from benchmarks.ws_load import FakeWebSocket
+
+READY_CHANNEL = "benchmark.ready"
+
+
+async def serve(args: argparse.Namespace):
+    """Worker process: run jobs until terminated."""
+    translator_graph.llm = FakeTranslatorChatModel(latency=args.latency)
+    job_queue.workers = args.workers
+
+    await pubsub.start()
+    await job_queue.start()
+    await pubsub.publish(READY_CHANNEL, {"pid": os.getpid()})
+    await asyncio.Event().wait()
+
+
+async def run(processes: int, args: argparse.Namespace, text: str) -> dict:
+    ready = asyncio.Queue()
+
+    async def on_ready(message: dict):
+        await ready.put(message["pid"])
+
+    await pubsub.subscribe(READY_CHANNEL, on_ready)
+    workers = [
+        await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "benchmarks.scale_out",
+            "--serve",
+            "--latency",
+            str(args.latency),
+            "--workers",
+            str(args.workers),
+            stdout=asyncio.subprocess.DEVNULL,
+        )
+        for _ in range(processes)
+    ]
+
+    for _ in workers:
+        await asyncio.wait_for(ready.get(), 60)
+
+    sockets = {f"bench_{processes}_{i}": FakeWebSocket() for i in range(args.clients)}
+
+    for client_id, websocket in sockets.items():
+        await ws_manager.connect(client_id, websocket)
+
+    started = time.perf_counter()
+
+    for client_id in sockets:
+        await handle_websocket_message(
+            client_id, {"type": "translate_multi", "text": text}
+        )
+
+    def finished(websocket: FakeWebSocket) -> bool:
+        return any(
+            m["type"] == "multi_translation_completed" for _, m in websocket.sent
+        )
+
+    while not all(finished(websocket) for websocket in sockets.values()):
+        await asyncio.sleep(0.01)
+
+    elapsed = time.perf_counter() - started
+
+    for worker in workers:
+        worker.terminate()
+        await worker.wait()
+
+    for client_id in sockets:
+        await ws_manager.disconnect(client_id)
+
+    await pubsub.unsubscribe(READY_CHANNEL, on_ready)
+
+    # jobs per process, from the worker that finished each job
+    job_ids = [
+        message["job_id"]
+        for websocket in sockets.values()
+        for _, message in websocket.sent
+        if message["type"] == "multi_translation_started"
+    ]
+    rows = job_queue.store.connection.execute(
+        f"SELECT worker FROM jobs WHERE id IN ({','.join('?' * len(job_ids))})",
+        job_ids,
+    ).fetchall()
+    per_process = Counter(worker.split("-")[0] for (worker,) in rows)
+
+    return {
+        "wall": elapsed,
+        "messages": sum(len(websocket.sent) for websocket in sockets.values()),
+        "completed": sum(finished(websocket) for websocket in sockets.values()),
+        "per_process": sorted(per_process.values(), reverse=True),
+    }
+
+
+async def main(args: argparse.Namespace):
+    server = await Broker().serve(settings.PUBSUB_URL)
+    await pubsub.start()
+    await ws_manager.start()
+    # this process only submits and follows jobs
+    job_queue.workers = 0
+    await job_queue.start()
+
+    text = json.dumps({"greeting": "Hello", "farewell": "Goodbye"})
+    print(
+        f"{args.clients} sockets, {args.workers} job workers per process, "
+        f"{args.latency}s per call"
+    )
+    print(
+        f"{'processes':>9} {'wall s':>7} {'done':>5} {'messages':>9}  jobs per process"
+    )
+
+    for processes in args.processes:
+        stats = await run(processes, args, text)
+        print(
+            f"{processes:>9} {stats['wall']:>7.2f} {stats['completed']:>5} "
+            f"{stats['messages']:>9}  {stats['per_process']}"
+        )
+
+    await job_queue.stop()
+    await ws_manager.stop()
+    await pubsub.stop()
+    server.close()
+    shutil.rmtree(_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    asyncio.run(serve(args) if args.serve else main(args))
@@ -0,0 +1,113 @@
+"""Cold start of the app: import, lifespan start-up and first translation.
+
+Each run is a fresh interpreter that imports ``main``, enters the app's
+lifespan (until it would accept requests) and translates one string. Runs
+with the graph warmed up at start-up and built on the first translation
+instead, and lists the heavy packages already imported by ``import main``,
+which should be none of them.
+
+``--backend`` other than ``fake`` includes the provider client in the
+start-up figures, and skips the translation:
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --backend anthropic
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import subprocess
+
+# packages the app only needs once it translates
+HEAVY_MODULES = (
+    "langchain_core",
+    "langchain",
+    "langgraph",
+    "langchain_anthropic",
+    "anthropic",
+    "transformers",
+    "torch",
+)
+
+TEXT = "Save your changes before leaving the page."
+
+
+def child(translate: bool):
+    """Measure one cold start in this process and print it as JSON."""
+    started = time.perf_counter()
+    import main
+    from services.translator import translator_service
+
+    imported = time.perf_counter()
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    figures = {"import_s": imported - started, "loaded": loaded}
+
+    async def serve():
+        async with main.lifespan(main.app):
+            ready = time.perf_counter()
+            figures["ready_s"] = ready - started
+
+            if translate:
+                await translator_service.process_translation(TEXT, "french")
+                figures["first_translation_s"] = time.perf_counter() - ready
+
+    asyncio.run(serve())
+    print(json.dumps(figures))
+
+
+def cold_start(backend: str, warmup: bool) -> dict:
+    environment = {
+        **os.environ,
+        "LLM_BACKEND": backend,
+        "STARTUP_WARMUP": str(warmup).lower(),
+    }
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", "--backend", backend],
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    return json.loads(output.splitlines()[-1])
+
+
+def main(args: argparse.Namespace):
+    translate = args.backend == "fake"
+
+    print(f"backend {args.backend}, median of {args.runs} cold starts")
+    print(
+        f"{'start-up':>10} {'import s':>9} {'ready s':>8} {'first s':>8} "
+        f"{'total s':>8}  imported by main"
+    )
+
+    for warmup in (True, False):
+        runs = [cold_start(args.backend, warmup) for _ in range(args.runs)]
+        figures = {
+            name: statistics.median(run.get(name, 0.0) for run in runs)
+            for name in ("import_s", "ready_s", "first_translation_s")
+        }
+        first = f"{figures['first_translation_s']:>8.3f}" if translate else "-".rjust(8)
+        print(
+            f"{'warmup' if warmup else 'lazy':>10} {figures['import_s']:>9.3f} "
+            f"{figures['ready_s']:>8.3f} {first} "
+            f"{figures['ready_s'] + figures['first_translation_s']:>8.3f}  "
+            f"{', '.join(runs[0]['loaded']) or 'none'}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", default="fake")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        child(translate=args.backend == "fake")
+    else:
+        main(args)
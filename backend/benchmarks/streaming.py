@@ -0,0 +1,81 @@
+"""Time to first result with and without streaming partial results.
+
+Translates the locale corpus into several languages through the same
+callbacks the WebSocket handler uses, and records when the first draft, the
+first approved key and each completed language arrive. Without streaming
+nothing reaches the client before a whole language is completed.
+
+    python -m benchmarks.streaming --latency 0.5 --latency-per-char 0.0005
+"""
+
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Any, Dict
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from services.translator import TranslatorService
+
+LANGUAGES = ["arabic", "french", "japanese", "portuguese", "spanish"]
+CORPUS = Path(__file__).parent / "corpus" / "en.json"
+
+
+async def run(streaming: bool, args: argparse.Namespace) -> Dict[str, Any]:
+    translator_graph.llm = FakeTranslatorChatModel(
+        latency=args.latency,
+        latency_per_output_char=args.latency_per_char,
+        defect_rate=args.defect_rate,
+    )
+    service = TranslatorService()
+    timings: Dict[str, Any] = {"messages": 0}
+    started = time.perf_counter()
+
+    def record(name: str):
+        timings.setdefault(name, time.perf_counter() - started)
+
+    async def on_language_progress(language: str, event: Dict[str, Any]):
+        timings["messages"] += 1
+        record("first draft" if event["status"] == "draft" else "first approved")
+
+    async def on_language_completed(language: str, result: Dict[str, Any]):
+        timings["messages"] += 1
+        record("first language")
+
+    await service.process_translation_multi(
+        CORPUS.read_text(),
+        LANGUAGES,
+        on_language_completed=on_language_completed,
+        on_language_progress=on_language_progress if streaming else None,
+    )
+
+    timings["total"] = time.perf_counter() - started
+
+    return timings
+
+
+async def main(args: argparse.Namespace):
+    print(
+        f"{len(LANGUAGES)} languages, {args.latency}s per call + "
+        f"{args.latency_per_char}s per output char"
+    )
+    columns = ["first draft", "first approved", "first language", "total"]
+    print(f"{'mode':>10} " + " ".join(f"{c:>14}" for c in columns) + "   messages")
+
+    for streaming in (False, True):
+        timings = await run(streaming, args)
+        cells = " ".join(
+            f"{timings[c]:>14.2f}" if c in timings else f"{'-':>14}" for c in columns
+        )
+        print(
+            f"{'stream' if streaming else 'batch':>10} {cells}   {timings['messages']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--latency-per-char", type=float, default=0.0005)
+    parser.add_argument("--defect-rate", type=float, default=0.1)
+    asyncio.run(main(parser.parse_args()))
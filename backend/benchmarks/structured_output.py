@@ -0,0 +1,63 @@
+"""Parse failures and retry round trips: free-text parsing vs native structured output.
+
+Translates the locale corpus with the fake model answering a share of
+free-text prompts with prose around the JSON. "parser" mode has to send
+those through the retry parser; "native" binds the output schema as a tool
+and gets a validated answer back.
+
+    python -m benchmarks.structured_output --malformed-rate 0.2 --latency 0.1
+"""
+
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import llm_parse_failures, llm_retries, translator_graph
+from config.settings import settings
+from core.metrics import Counter
+from services.translator import TranslatorService
+
+LANGUAGES = ["arabic", "french", "japanese"]
+CORPUS = Path(__file__).parent / "corpus" / "en.json"
+
+
+def total(counter: Counter) -> float:
+    return sum(counter.samples().values())
+
+
+async def main(args: argparse.Namespace):
+    print(
+        f"{len(LANGUAGES)} languages, {args.latency}s per call, "
+        f"{args.malformed_rate:.0%} of free-text answers malformed"
+    )
+    print(f"{'mode':>8} {'wall s':>7} {'calls':>6} {'failures':>9} {'retries':>8}")
+
+    for mode in ("parser", "native"):
+        settings.STRUCTURED_OUTPUT_MODE = mode
+        llm = FakeTranslatorChatModel(
+            latency=args.latency, malformed_rate=args.malformed_rate
+        )
+        # node prompts are compiled when the model is set
+        translator_graph.llm = llm
+
+        failures, retries = total(llm_parse_failures), total(llm_retries)
+        started = time.perf_counter()
+
+        await TranslatorService().process_translation_multi(
+            CORPUS.read_text(), LANGUAGES
+        )
+
+        print(
+            f"{mode:>8} {time.perf_counter() - started:>7.2f} {llm.calls:>6} "
+            f"{total(llm_parse_failures) - failures:>9.0f} "
+            f"{total(llm_retries) - retries:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--malformed-rate", type=float, default=0.2)
+    asyncio.run(main(parser.parse_args()))
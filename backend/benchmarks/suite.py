@@ -0,0 +1,301 @@
+"""End-to-end regression suite for the translation pipeline.
+
+Runs every input of the corpus as ``--repeat`` jobs, one after the other,
+through a job queue and a WebSocket manager on the same bus, against the
+fake chat model. Inputs: a single string, HTML, a code block, malformed
+JSON, and dictionaries of 10, 100 and 2,000 keys built from the locale
+corpus. For each input it reports the latency percentiles of a job, from
+submission until a subscribed socket receives the final message, the LLM
+calls per job, the tokens per key and language (from the jobs' ``usage``),
+and the peak RSS of the process so far. Finally the messages of the
+largest job are replayed to ``--ws-sockets`` sockets to measure WebSocket
+throughput.
+
+``--output`` writes the results as JSON. ``--baseline`` compares a run with
+such a file and exits with status 1 if it made more LLM calls or used more
+tokens, or if a timing, RSS or throughput figure is worse by more than
+``--tolerance``:
+
+    python -m benchmarks.suite --output benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from core.pubsub import PubSub
+from core.usage import merge_summaries
+from services.jobs import FINAL_EVENTS, JobQueue, JobStore
+from services.translator import TranslatorService
+from websocket.manager import WebSocketManager
+from benchmarks.ws_load import FakeWebSocket
+
+CORPUS = Path(__file__).parent / "corpus"
+DICT_SIZES = (10, 100, 2000)
+# sections the locale corpus is repeated under to build large dictionaries
+SECTIONS = ["scans", "reports", "billing", "settings", "team", "integrations"]
+
+# figures compared with a baseline: whether a higher value is better, and
+# whether they vary from run to run; calls and tokens of the fake model do not
+METRICS = {
+    "p50_s": (False, True),
+    "p95_s": (False, True),
+    "p99_s": (False, True),
+    "llm_calls_per_job": (False, False),
+    "tokens_per_key": (False, False),
+    "peak_rss_mb": (False, True),
+    "messages_per_s": (True, True),
+    "mb_per_s": (True, True),
+}
+
+
+def locale_dict(size: int) -> Dict[str, str]:
+    """The first ``size`` keys of the locale corpus, repeated per section if needed.
+
+    Repeated values are prefixed with their section, so they stay distinct
+    and deduplication does not hide the cost of a large dictionary.
+    """
+    locale = json.loads((CORPUS / "en.json").read_text())
+    data = {}
+
+    for section in [None, *SECTIONS]:
+        for key, value in locale.items():
+            if len(data) == size:
+                return data
+
+            if section is None:
+                data[key] = value
+            else:
+                data[f"{section}.{key}"] = f"{section.title()}: {value}"
+
+    return data
+
+
+def inputs() -> Dict[str, Any]:
+    cases = json.loads((CORPUS / "suite.json").read_text())
+
+    for size in DICT_SIZES:
+        cases[f"dict_{size}"] = locale_dict(size)
+
+    return cases
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linearly interpolated percentile, ``q`` in [0, 100]."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def peak_rss_mb() -> float:
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_job(
+    queue: JobQueue, manager: WebSocketManager, text: str, languages: List[str]
+) -> Dict[str, Any]:
+    """Run one job followed by a socket. Returns its latency, results and messages."""
+    websocket = FakeWebSocket()
+    await manager.connect("bench", websocket)
+
+    def finished() -> bool:
+        return any(message["type"] in FINAL_EVENTS for _, message in websocket.sent)
+
+    started = time.perf_counter()
+    job_id = await queue.submit(text, languages)
+    await queue.subscribe(job_id, lambda event: manager.send_local("bench", event))
+
+    while not finished():
+        await asyncio.sleep(0.001)
+
+    latency = time.perf_counter() - started
+    await manager.disconnect("bench")
+
+    return {
+        "latency": latency,
+        "results": await queue.result(job_id),
+        "messages": [message for _, message in websocket.sent],
+    }
+
+
+async def ws_throughput(
+    messages: List[Dict[str, Any]], sockets: int
+) -> Dict[str, float]:
+    """Deliver a job's messages to many sockets at once."""
+    manager = WebSocketManager(PubSub())
+    clients = {f"bench_{index}": FakeWebSocket() for index in range(sockets)}
+
+    for client_id, websocket in clients.items():
+        await manager.connect(client_id, websocket)
+
+    started = time.perf_counter()
+
+    for message in messages:
+        for client_id in clients:
+            await manager.send_local(client_id, message)
+
+    # a client that falls behind may be closed instead
+    while not all(
+        websocket.close_code is not None
+        or any(message["type"] in FINAL_EVENTS for _, message in websocket.sent)
+        for websocket in clients.values()
+    ):
+        await asyncio.sleep(0.001)
+
+    elapsed = time.perf_counter() - started
+
+    for client_id in clients:
+        await manager.disconnect(client_id)
+
+    return {
+        "messages_per_s": sum(len(ws.sent) for ws in clients.values()) / elapsed,
+        "mb_per_s": sum(ws.bytes for ws in clients.values()) / elapsed / 1e6,
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    llm = FakeTranslatorChatModel(
+        latency=args.latency, latency_per_output_char=args.latency_per_char
+    )
+    translator_graph.llm = llm
+    bus = PubSub()
+    queue = JobQueue(JobStore(":memory:"), TranslatorService(), bus, workers=1)
+    manager = WebSocketManager(bus)
+    await queue.start()
+
+    cases, messages = {}, []
+
+    print(
+        f"{'input':>15} {'keys':>5} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+        f"{'calls/job':>10} {'tokens/key':>11} {'RSS MB':>7}"
+    )
+
+    for name, value in inputs().items():
+        text = value if isinstance(value, str) else json.dumps(value)
+        keys = len(value) if isinstance(value, dict) else 1
+        calls, latencies, usages = llm.calls, [], []
+
+        for _ in range(args.repeat):
+            job = await run_job(queue, manager, text, args.languages)
+            latencies.append(job["latency"])
+            usages.extend(result.get("usage") for result in job["results"].values())
+            messages = job["messages"]
+
+        total = merge_summaries(usages)["total"]
+        cases[name] = {
+            "keys": keys,
+            "p50_s": percentile(latencies, 50),
+            "p95_s": percentile(latencies, 95),
+            "p99_s": percentile(latencies, 99),
+            "llm_calls_per_job": (llm.calls - calls) / args.repeat,
+            "tokens_per_key": (total["input_tokens"] + total["output_tokens"])
+            / (keys * len(args.languages) * args.repeat),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        case = cases[name]
+        print(
+            f"{name:>15} {keys:>5} {case['p50_s']:>7.3f} {case['p95_s']:>7.3f} "
+            f"{case['p99_s']:>7.3f} {case['llm_calls_per_job']:>10.1f} "
+            f"{case['tokens_per_key']:>11.1f} {case['peak_rss_mb']:>7.1f}"
+        )
+
+    await queue.stop()
+
+    # the messages of the last, largest, job
+    websocket = await ws_throughput(messages, args.ws_sockets)
+    print(
+        f"WebSocket: {len(messages)} messages to {args.ws_sockets} sockets, "
+        f"{websocket['messages_per_s']:.0f} messages/s, {websocket['mb_per_s']:.1f} MB/s"
+    )
+
+    return {
+        "settings": {
+            "latency": args.latency,
+            "latency_per_char": args.latency_per_char,
+            "languages": args.languages,
+            "repeat": args.repeat,
+            "ws_sockets": args.ws_sockets,
+        },
+        "cases": cases,
+        "websocket": websocket,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Print the change of every figure. Returns the regressions."""
+    if results["settings"] != baseline["settings"]:
+        print(f"Warning: baseline ran with {baseline['settings']}")
+
+    groups = {
+        **{name: figures for name, figures in results["cases"].items()},
+        "websocket": results["websocket"],
+    }
+    baseline_groups = {**baseline["cases"], "websocket": baseline["websocket"]}
+    regressions = []
+
+    print(f"\n{'figure':>34} {'baseline':>10} {'current':>10} {'change':>8}")
+
+    for group, figures in groups.items():
+        for metric, value in figures.items():
+            previous = baseline_groups.get(group, {}).get(metric)
+
+            if metric not in METRICS or not previous:
+                continue
+
+            higher_is_better, noisy = METRICS[metric]
+            change = value / previous - 1
+            worse = -change if higher_is_better else change
+            flag = " !" if worse > (tolerance if noisy else 1e-9) else ""
+            print(
+                f"{group + ' ' + metric:>34} {previous:>10.3f} {value:>10.3f} "
+                f"{change:>+8.1%}{flag}"
+            )
+
+            if flag:
+                regressions.append(f"{group} {metric}")
+
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    results = await run(args)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline, args.tolerance)
+
+        if regressions:
+            print(f"\n{len(regressions)} regressions: {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--languages", nargs="+", default=["french", "spanish"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--latency-per-char", type=float, default=0.00001)
+    parser.add_argument("--ws-sockets", type=int, default=200)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    sys.exit(asyncio.run(main(parser.parse_args())))
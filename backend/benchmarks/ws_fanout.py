@@ -0,0 +1,179 @@
+"""Sending job progress to thousands of sockets, some of them slow.
+
+Every simulated socket follows one job that streams ``--progress`` draft
+messages and then a completed result; a share of the sockets take
+``--slow-delay`` seconds per frame. "direct" awaits every send in the
+producer with ``json.dumps``, as ``send_to_client`` used to. "queued" goes
+through the per-client queues of ``WebSocketManager``, which batch
+progress, encode with orjson and drop progress for clients that fall behind.
+
+    python -m benchmarks.ws_fanout --sockets 2000 --slow-share 0.05
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from typing import Any, Dict, List
+
+from config.settings import settings
+from core.metrics import Counter
+from core.pubsub import PubSub
+from websocket.connection import ws_dropped, ws_encode, ws_slow_clients
+from websocket.manager import WebSocketManager
+from benchmarks.ws_load import FakeWebSocket
+
+
+def total(counter: Counter) -> float:
+    return sum(counter.samples().values())
+
+
+def job_messages(job_id: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Progress of one job: drafts of a few keys, then the whole result."""
+    keys = [f"screen.section.label_{index}" for index in range(args.keys)]
+    translations = {key: f"Traduction de l'entrée {key}" for key in keys}
+    per_draft = max(1, args.keys // args.progress)
+    messages = [
+        {
+            "type": "language_translation_draft",
+            "job_id": job_id,
+            "language": "french",
+            "translations": {
+                key: translations[key]
+                for key in keys[index * per_draft : (index + 1) * per_draft]
+            },
+            "completed_count": 0,
+            "total_count": args.keys,
+        }
+        for index in range(args.progress)
+    ]
+    messages.append(
+        {
+            "type": "language_translation_completed",
+            "job_id": job_id,
+            "language": "french",
+            "translated_text": {"final_translation": translations},
+            "completed_count": 1,
+            "total_count": 1,
+        }
+    )
+
+    return messages
+
+
+async def run(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(0)
+    sockets = {
+        f"bench_{index}": FakeWebSocket(
+            args.slow_delay if rng.random() < args.slow_share else 0.0
+        )
+        for index in range(args.sockets)
+    }
+    manager = WebSocketManager(PubSub())
+    encode_seconds = 0.0
+
+    if mode == "queued":
+        for client_id, websocket in sockets.items():
+            await manager.connect(client_id, websocket)
+
+    dropped, closed, encoded = (
+        total(ws_dropped),
+        total(ws_slow_clients),
+        total(ws_encode),
+    )
+
+    async def produce(client_id: str, websocket: FakeWebSocket):
+        nonlocal encode_seconds
+
+        for message in job_messages(f"job_{client_id}", args):
+            if mode == "queued":
+                await manager.send_local(client_id, message)
+            else:
+                started = time.perf_counter()
+                data = json.dumps(message)
+                encode_seconds += time.perf_counter() - started
+                await websocket.send_text(data)
+
+            await asyncio.sleep(args.interval)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(produce(c, w) for c, w in sockets.items()))
+    produced = time.perf_counter() - started
+
+    def received(websocket: FakeWebSocket) -> bool:
+        return any(
+            message["type"] == "language_translation_completed"
+            for _, message in websocket.sent
+        )
+
+    # slow clients may have been closed instead
+    fast = {c: w for c, w in sockets.items() if not w.send_delay}
+
+    while not all(
+        received(websocket) or websocket.close_code is not None
+        for websocket in sockets.values()
+    ):
+        await asyncio.sleep(0.01)
+
+    # time from the start until each client had its result
+    done = {
+        client_id: sent_at - started
+        for client_id, websocket in sockets.items()
+        for sent_at, message in websocket.sent
+        if message["type"] == "language_translation_completed"
+    }
+    fast_done = [done[client_id] for client_id in fast]
+    slow_done = [done[c] for c in sockets if c not in fast and c in done]
+
+    for client_id in list(manager.connections):
+        await manager.disconnect(client_id)
+
+    if mode == "queued":
+        encode_seconds = total(ws_encode) - encoded
+
+    return {
+        "produced": produced,
+        "fast p50": statistics.median(fast_done),
+        "fast p99": statistics.quantiles(fast_done, n=100)[98],
+        "slow max": max(slow_done, default=0.0),
+        "frames": sum(websocket.frames for websocket in sockets.values()),
+        "encode": encode_seconds,
+        "dropped": total(ws_dropped) - dropped,
+        "closed": total(ws_slow_clients) - closed,
+    }
+
+
+async def main(args: argparse.Namespace):
+    settings.WS_SEND_QUEUE_SIZE = args.queue_size
+    print(
+        f"{args.sockets} sockets ({args.slow_share:.0%} at {args.slow_delay}s per "
+        f"frame), {args.progress} drafts + 1 result of {args.keys} keys each"
+    )
+    print(
+        f"{'mode':>8} {'produce s':>10} {'fast p50 s':>11} {'fast p99 s':>11} "
+        f"{'slow max s':>11} {'frames':>8} {'encode ms':>10} {'dropped':>8} "
+        f"{'closed':>7}"
+    )
+
+    for mode in ("direct", "queued"):
+        stats = await run(mode, args)
+        print(
+            f"{mode:>8} {stats['produced']:>10.2f} {stats['fast p50']:>11.2f} "
+            f"{stats['fast p99']:>11.2f} {stats['slow max']:>11.2f} {stats['frames']:>8} "
+            f"{stats['encode'] * 1000:>10.1f} {stats['dropped']:>8.0f} "
+            f"{stats['closed']:>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sockets", type=int, default=2000)
+    parser.add_argument("--slow-share", type=float, default=0.05)
+    parser.add_argument("--slow-delay", type=float, default=1.0)
+    parser.add_argument("--progress", type=int, default=20)
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.005)
+    parser.add_argument("--queue-size", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,149 @@
+"""Concurrent WebSocket load against the fake chat model.
+
+Every simulated socket sends one ``translate_multi`` job at the same time
+and follows it until ``multi_translation_completed``, with one job worker
+per socket. With a blocking graph the wall time grows linearly with the
+number of sockets; with the async path it stays close to a single job's
+latency, and pings keep being answered while jobs are in flight.
+
+    python -m benchmarks.ws_load --clients 1 10 50 --latency 0.2
+"""
+
+import json
+import time
+import asyncio
+import argparse
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from services.jobs import job_queue
+from websocket.manager import ws_manager
+from websocket.handlers import handle_websocket_message
+
+
+class FakeWebSocket:
+    """Records outgoing messages instead of writing them to a socket.
+
+    Batched frames are unpacked into ``sent``; ``frames`` counts frames and
+    ``send_delay`` simulates a slow client.
+    """
+
+    def __init__(self, send_delay: float = 0.0):
+        self.sent = []
+        self.frames = 0
+        self.bytes = 0
+        self.send_delay = send_delay
+        self.close_code = None
+
+    async def send_text(self, data: str):
+        await self._receive(json.loads(data), data.encode())
+
+    async def send_bytes(self, data: bytes):
+        # only negotiated when ormsgpack is installed
+        import ormsgpack
+
+        await self._receive(ormsgpack.unpackb(data), data)
+
+    async def _receive(self, frame: dict, data: bytes):
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+
+        now = time.perf_counter()
+        self.frames += 1
+        self.bytes += len(data)
+
+        for message in frame["messages"] if frame["type"] == "batch" else [frame]:
+            self.sent.append((now, message))
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+async def ping_latency(client_id: str, websocket: FakeWebSocket) -> float:
+    started = time.perf_counter()
+    await handle_websocket_message(client_id, {"type": "ping"})
+
+    # sent by the client's writer task
+    while not any(message["type"] == "pong" for _, message in websocket.sent):
+        await asyncio.sleep(0)
+
+    sent_at, _ = websocket.sent[-1]
+
+    return sent_at - started
+
+
+async def run(clients: int, text: str) -> dict:
+    sockets = {f"bench_{i}": FakeWebSocket() for i in range(clients)}
+
+    for client_id, websocket in sockets.items():
+        await ws_manager.connect(client_id, websocket)
+
+    pinger = FakeWebSocket()
+    await ws_manager.connect("bench_pinger", pinger)
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            handle_websocket_message(
+                client_id, {"type": "translate_multi", "text": text}
+            )
+            for client_id in sockets
+        )
+    )
+
+    await asyncio.sleep(0)
+    ping = await ping_latency("bench_pinger", pinger)
+
+    # the handler returns once the job is queued; wait for the workers
+    while not all(
+        any(message["type"] == "multi_translation_completed" for _, message in ws.sent)
+        for ws in sockets.values()
+    ):
+        await asyncio.sleep(0.01)
+
+    elapsed = time.perf_counter() - started
+
+    completed = sum(
+        1
+        for websocket in sockets.values()
+        for _, message in websocket.sent
+        if message["type"] == "language_translation_completed"
+    )
+
+    for client_id in [*sockets, "bench_pinger"]:
+        await ws_manager.disconnect(client_id)
+
+    return {"clients": clients, "wall": elapsed, "ping": ping, "completed": completed}
+
+
+async def main(args: argparse.Namespace):
+    llm = FakeTranslatorChatModel(latency=args.latency)
+    translator_graph.llm = llm
+
+    text = json.dumps({"greeting": "Hello", "farewell": "Goodbye"})
+
+    job_queue.workers = max(args.clients)
+    await job_queue.start()
+
+    # calls per job on a single socket, used for the serial estimate
+    await run(1, text)
+    calls_per_job = llm.calls
+
+    print(f"{'clients':>8} {'wall s':>8} {'serial s':>9} {'ping ms':>8} {'done':>5}")
+
+    for clients in args.clients:
+        stats = await run(clients, text)
+        serial = clients * calls_per_job * args.latency
+        print(
+            f"{stats['clients']:>8} {stats['wall']:>8.2f} {serial:>9.2f} "
+            f"{stats['ping'] * 1000:>8.2f} {stats['completed']:>5}"
+        )
+
+    await job_queue.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--latency", type=float, default=0.2)
+    asyncio.run(main(parser.parse_args()))
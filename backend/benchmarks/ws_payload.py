@@ -0,0 +1,111 @@
+"""Bytes a client receives for one job, per WebSocket subprotocol.
+
+Runs the locale corpus as a job and follows it from one socket per
+subprotocol: full messages (no subprotocol), compact JSON and compact
+MessagePack. Counts frames and bytes as encoded, and as permessage-deflate
+would send them (raw deflate with context takeover, as ``websockets`` does
+by default), and times the encoding of every frame.
+
+    python -m benchmarks.ws_payload --languages french spanish
+"""
+
+import time
+import zlib
+import asyncio
+import argparse
+from pathlib import Path
+
+from ai_agent.fake_llm import FakeTranslatorChatModel
+from ai_agent.workflow import translator_graph
+from core.pubsub import PubSub
+from services.jobs import FINAL_EVENTS, JobQueue, JobStore
+from services.translator import TranslatorService
+from websocket.codec import COMPACT_JSON, COMPACT_MSGPACK
+from websocket.manager import WebSocketManager
+from benchmarks.ws_load import FakeWebSocket
+
+CORPUS = Path(__file__).parent / "corpus" / "en.json"
+PROTOCOLS = {
+    "full": None,
+    "compact json": COMPACT_JSON,
+    "compact msgpack": COMPACT_MSGPACK,
+}
+
+
+class DeflatingWebSocket(FakeWebSocket):
+    """Also counts the bytes of each frame after permessage-deflate."""
+
+    def __init__(self):
+        super().__init__()
+        self.deflated = 0
+        self._compressor = zlib.compressobj(wbits=-15, memLevel=5)
+
+    async def _receive(self, frame: dict, data: bytes):
+        compressed = self._compressor.compress(data)
+        compressed += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        # the empty block trailer is not sent (RFC 7692)
+        self.deflated += len(compressed) - 4
+
+        await super()._receive(frame, data)
+
+
+async def main(args: argparse.Namespace):
+    translator_graph.llm = FakeTranslatorChatModel(latency=args.latency)
+    bus = PubSub()
+    queue = JobQueue(JobStore(":memory:"), TranslatorService(), bus, workers=1)
+    manager = WebSocketManager(bus)
+    sockets = {name: DeflatingWebSocket() for name in PROTOCOLS}
+    encode_seconds = dict.fromkeys(PROTOCOLS, 0.0)
+
+    for name, subprotocol in PROTOCOLS.items():
+        await manager.connect(name, sockets[name], subprotocol)
+        connection = manager.connections[name]
+
+        def timed(frame, name=name, encode=connection.encode):
+            started = time.perf_counter()
+            data = encode(frame)
+            encode_seconds[name] += time.perf_counter() - started
+
+            return data
+
+        connection.encode = timed
+
+    await queue.start()
+    job_id = await queue.submit(CORPUS.read_text(), args.languages)
+
+    for name in PROTOCOLS:
+        await queue.subscribe(
+            job_id, lambda event, name=name: manager.send_local(name, event)
+        )
+
+    await queue.wait(job_id)
+
+    def finished(websocket: FakeWebSocket) -> bool:
+        return any(message["type"] in FINAL_EVENTS for _, message in websocket.sent)
+
+    while not all(finished(websocket) for websocket in sockets.values()):
+        await asyncio.sleep(0.01)
+
+    await queue.stop()
+
+    for name in PROTOCOLS:
+        await manager.disconnect(name)
+
+    print(f"{len(CORPUS.read_text())} bytes of input, {len(args.languages)} languages")
+    print(
+        f"{'protocol':>16} {'frames':>7} {'bytes':>9} {'deflated':>9} "
+        f"{'encode ms':>10}"
+    )
+
+    for name, websocket in sockets.items():
+        print(
+            f"{name:>16} {websocket.frames:>7} {websocket.bytes:>9} "
+            f"{websocket.deflated:>9} {encode_seconds[name] * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--languages", nargs="+", default=["french", "spanish"])
+    parser.add_argument("--latency", type=float, default=0.01)
+    asyncio.run(main(parser.parse_args()))
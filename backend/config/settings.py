@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Dict
 import os
 
 
@@ -17,10 +18,143 @@ class Settings(BaseSettings):
     LANGSMITH_ENDPOINT: str = os.getenv("LANGSMITH_ENDPOINT", "")
     LANGSMITH_TRACING: bool = os.getenv("LANGSMITH_TRACING", False)
 
+    # LLM backends, "<backend>" or "<backend>:<model>", see ai_agent/llm_backends.py
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "anthropic")
+    # per-node overrides as JSON, e.g. {"query_assessment": "ollama:qwen2.5:7b"}
+    LLM_NODE_BACKENDS: Dict[str, str] = {}
+    # simulated latency of the offline "fake" backend
+    FAKE_LLM_LATENCY: float = os.getenv("FAKE_LLM_LATENCY", 0.0)
+    FAKE_LLM_LATENCY_PER_OUTPUT_CHAR: float = os.getenv(
+        "FAKE_LLM_LATENCY_PER_OUTPUT_CHAR", 0.0
+    )
+    # record or replay LLM answers by prompt hash, see ai_agent/cassette.py:
+    # "record", "replay" or "passthrough"; empty to call the backend directly
+    LLM_CASSETTE_MODE: str = os.getenv("LLM_CASSETTE_MODE", "")
+    LLM_CASSETTE_PATH: str = os.getenv("LLM_CASSETTE_PATH", "cassettes/llm.jsonl.gz")
+    # synthetic latency of replayed answers
+    LLM_CASSETTE_LATENCY: float = os.getenv("LLM_CASSETTE_LATENCY", 0.0)
+    LLM_CASSETTE_LATENCY_PER_OUTPUT_CHAR: float = os.getenv(
+        "LLM_CASSETTE_LATENCY_PER_OUTPUT_CHAR", 0.0
+    )
+
     # Anthropic settings
     ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY")
     GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY")
 
+    # Concurrency settings
+    TRANSLATION_MAX_CONCURRENCY: int = os.getenv("TRANSLATION_MAX_CONCURRENCY", 8)
+    LLM_PROVIDER_MAX_CONCURRENCY: int = os.getenv("LLM_PROVIDER_MAX_CONCURRENCY", 8)
+    # per-provider overrides as JSON, e.g. {"anthropic-chat": 4}
+    LLM_PROVIDER_CONCURRENCY: Dict[str, int] = {}
+
+    # provider rate limits per minute, 0 for none; estimated tokens count input and output
+    LLM_PROVIDER_REQUESTS_PER_MINUTE: int = os.getenv(
+        "LLM_PROVIDER_REQUESTS_PER_MINUTE", 0
+    )
+    LLM_PROVIDER_TOKENS_PER_MINUTE: int = os.getenv("LLM_PROVIDER_TOKENS_PER_MINUTE", 0)
+    # per-provider overrides as JSON,
+    # e.g. {"anthropic-chat": {"requests_per_minute": 50, "tokens_per_minute": 40000}}
+    LLM_PROVIDER_RATE_LIMITS: Dict[str, Dict[str, int]] = {}
+    # seconds worth of the rate limits that may be sent at once
+    LLM_RATE_LIMIT_BURST_SECONDS: float = os.getenv("LLM_RATE_LIMIT_BURST_SECONDS", 10)
+
+    # retries of rate-limited or overloaded LLM calls, with jittered exponential backoff
+    LLM_RETRY_MAX_ATTEMPTS: int = os.getenv("LLM_RETRY_MAX_ATTEMPTS", 5)
+    LLM_RETRY_BACKOFF_BASE: float = os.getenv("LLM_RETRY_BACKOFF_BASE", 1.0)
+    LLM_RETRY_BACKOFF_MAX: float = os.getenv("LLM_RETRY_BACKOFF_MAX", 60.0)
+
+    # HTTP connection pool shared by the LLM provider clients of a process,
+    # one sync and one async; HTTP/2 is used when the h2 package is installed
+    LLM_HTTP_MAX_CONNECTIONS: int = os.getenv("LLM_HTTP_MAX_CONNECTIONS", 64)
+    # idle connections kept open for reuse, and for how many seconds; fewer
+    # than the calls in flight and the excess connections are closed after use
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = os.getenv(
+        "LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", 32
+    )
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", 30.0)
+    LLM_HTTP2: bool = os.getenv("LLM_HTTP2", True)
+    # seconds before a call to the provider is abandoned
+    LLM_HTTP_TIMEOUT: float = os.getenv("LLM_HTTP_TIMEOUT", 600.0)
+
+    # USD per million tokens by model as JSON, for the cost of LLM calls,
+    # e.g. {"gpt-4o": {"input": 2.5, "output": 10}}
+    LLM_TOKEN_PRICES: Dict[str, Dict[str, float]] = {}
+
+    # "local" assesses queries without an LLM call unless the input is ambiguous
+    QUERY_ASSESSMENT_MODE: str = os.getenv("QUERY_ASSESSMENT_MODE", "local")
+
+    # re-translate and re-review only the defective keys of a JSON object on REDO
+    DELTA_RETRANSLATION: bool = os.getenv("DELTA_RETRANSLATION", True)
+
+    # send placeholders, ICU syntax, HTML tags, URLs and emails as opaque tokens;
+    # values with nothing else in them are not sent to the LLM at all
+    PLACEHOLDER_MASKING: bool = os.getenv("PLACEHOLDER_MASKING", True)
+    # send translations that lost or changed placeholders back without an LLM review
+    PLACEHOLDER_VALIDATION: bool = os.getenv("PLACEHOLDER_VALIDATION", True)
+
+    # send repeated values of a dictionary once and copy their translation to every key
+    VALUE_DEDUPLICATION: bool = os.getenv("VALUE_DEDUPLICATION", True)
+
+    # JSON is always formatted locally; "llm" also sends free text to the LLM formatter
+    FORMAT_MODE: str = os.getenv("FORMAT_MODE", "local")
+
+    # "native" binds each node's output schema through the provider's tool calling,
+    # "parser" parses free text and retries through the LLM on parse failures
+    STRUCTURED_OUTPUT_MODE: str = os.getenv("STRUCTURED_OUTPUT_MODE", "native")
+
+    # Chunking settings; budgets are estimated tokens of payload per LLM call
+    CHUNK_INPUT_TOKEN_BUDGET: int = os.getenv("CHUNK_INPUT_TOKEN_BUDGET", 4000)
+    CHUNK_OUTPUT_TOKEN_BUDGET: int = os.getenv("CHUNK_OUTPUT_TOKEN_BUDGET", 6000)
+    CHUNK_MAX_KEYS: int = os.getenv("CHUNK_MAX_KEYS", 120)
+    # expected growth of translated values over the English source
+    CHUNK_OUTPUT_TOKEN_RATIO: float = os.getenv("CHUNK_OUTPUT_TOKEN_RATIO", 1.5)
+    # "heuristic" or "tiktoken"
+    CHUNK_TOKENIZER: str = os.getenv("CHUNK_TOKENIZER", "heuristic")
+
+    # Translation memory settings
+    TRANSLATION_MEMORY_ENABLED: bool = os.getenv("TRANSLATION_MEMORY_ENABLED", True)
+    TRANSLATION_MEMORY_PATH: str = os.getenv(
+        "TRANSLATION_MEMORY_PATH", "translation_memory.sqlite3"
+    )
+    TRANSLATION_MEMORY_MAX_ENTRIES: int = os.getenv(
+        "TRANSLATION_MEMORY_MAX_ENTRIES", 200000
+    )
+    # review rating (1-5) below which translations are neither stored nor served
+    TRANSLATION_MEMORY_MIN_RATING: int = os.getenv("TRANSLATION_MEMORY_MIN_RATING", 3)
+
+    # WebSocket sending: messages queued per client beyond which slow clients
+    # lose progress messages ("drop_progress") or are closed ("close")
+    WS_SEND_QUEUE_SIZE: int = os.getenv("WS_SEND_QUEUE_SIZE", 1000)
+    WS_SLOW_CLIENT_POLICY: str = os.getenv("WS_SLOW_CLIENT_POLICY", "drop_progress")
+    # progress messages wait this long to be sent together in one frame
+    WS_BATCH_LINGER: float = os.getenv("WS_BATCH_LINGER", 0.02)
+    WS_BATCH_MAX_MESSAGES: int = os.getenv("WS_BATCH_MAX_MESSAGES", 100)
+    # permessage-deflate for clients that offer it, when run with ``python main.py``
+    WS_PER_MESSAGE_DEFLATE: bool = os.getenv("WS_PER_MESSAGE_DEFLATE", True)
+
+    # Fan-out of job events and WebSocket messages between processes:
+    # "memory" (single process), "broker" (python -m core.broker) or "redis"
+    PUBSUB_BACKEND: str = os.getenv("PUBSUB_BACKEND", "memory")
+    # e.g. unix:///tmp/ak-translator.sock, tcp://127.0.0.1:7379 or redis://localhost:6379/0
+    PUBSUB_URL: str = os.getenv("PUBSUB_URL", "")
+    # seconds the app waits for the broker when it starts before failing
+    PUBSUB_CONNECT_TIMEOUT: float = os.getenv("PUBSUB_CONNECT_TIMEOUT", 10.0)
+
+    # build the translation graph and its LLM clients when the app starts
+    # instead of on the first translation
+    STARTUP_WARMUP: bool = os.getenv("STARTUP_WARMUP", True)
+
+    # Job queue settings
+    JOB_STORE_PATH: str = os.getenv("JOB_STORE_PATH", "translation_jobs.sqlite3")
+    # jobs run at once per process; LLM calls are still bounded per provider
+    JOB_WORKERS: int = os.getenv("JOB_WORKERS", 8)
+    # a job whose lease is not renewed in time is resumed by another worker
+    JOB_LEASE_SECONDS: float = os.getenv("JOB_LEASE_SECONDS", 60.0)
+    JOB_MAX_ATTEMPTS: int = os.getenv("JOB_MAX_ATTEMPTS", 3)
+    JOB_POLL_INTERVAL: float = os.getenv("JOB_POLL_INTERVAL", 1.0)
+    # finished jobs are deleted after this long
+    JOB_RETENTION_SECONDS: float = os.getenv("JOB_RETENTION_SECONDS", 604800.0)
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
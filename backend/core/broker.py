@@ -0,0 +1,86 @@
+"""Minimal pub/sub broker for ``PUBSUB_BACKEND=broker``.
+
+Relays JSON-line frames between the processes of one deployment, over a
+Unix socket or TCP, when no Redis is available:
+
+    python -m core.broker unix:///tmp/ak-translator.sock
+"""
+
+import sys
+import json
+import asyncio
+import logging
+from typing import Dict, Set
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class Broker:
+    def __init__(self):
+        self.channels: Dict[str, Set[asyncio.StreamWriter]] = {}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscribed: Set[str] = set()
+
+        try:
+            while line := await reader.readline():
+                frame = json.loads(line)
+                channel = frame["channel"]
+
+                if frame["op"] == "subscribe":
+                    subscribed.add(channel)
+                    self.channels.setdefault(channel, set()).add(writer)
+
+                elif frame["op"] == "unsubscribe":
+                    subscribed.discard(channel)
+                    self.channels.get(channel, set()).discard(writer)
+
+                elif frame["op"] == "publish":
+                    await self.publish(channel, line)
+        except (OSError, ValueError) as e:
+            logger.error(f"Broker client failed: {e}")
+        except asyncio.CancelledError:
+            # the broker is shutting down
+            pass
+        finally:
+            for channel in subscribed:
+                self.channels.get(channel, set()).discard(writer)
+
+            writer.close()
+
+    async def publish(self, channel: str, line: bytes):
+        # the publish frame is relayed as is; subscribers read channel and message
+        for writer in list(self.channels.get(channel, ())):
+            writer.write(line)
+
+        for writer in list(self.channels.get(channel, ())):
+            try:
+                await writer.drain()
+            except OSError:
+                self.channels[channel].discard(writer)
+
+    async def serve(self, url: str) -> asyncio.AbstractServer:
+        address = urlparse(url)
+
+        if address.scheme == "unix":
+            return await asyncio.start_unix_server(
+                self.handle, address.path, limit=2**24
+            )
+
+        return await asyncio.start_server(
+            self.handle, address.hostname, address.port, limit=2**24
+        )
+
+
+async def main(url: str):
+    server = await Broker().serve(url)
+    logger.info(f"Broker listening on {url}")
+
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else "tcp://127.0.0.1:7379"))
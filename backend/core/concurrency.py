@@ -0,0 +1,35 @@
+import asyncio
+import weakref
+
+
+class ConcurrencyLimiter:
+    """An ``asyncio.Semaphore`` that can be shared across event loops.
+
+    A plain semaphore binds to the first loop that waits on it, which breaks
+    module-level singletons used from ``asyncio.run`` in scripts and
+    benchmarks. One semaphore is created lazily per running loop instead.
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+
+        self.limit = limit
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit)
+            self._semaphores[loop] = semaphore
+
+        return semaphore
+
+    async def __aenter__(self):
+        await self._semaphore().acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore().release()
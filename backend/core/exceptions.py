@@ -28,3 +28,10 @@ class ModelNotFoundError(TranslationError):
         super().__init__(
             f"Model '{model_name}' not found or not loaded", status_code=404
         )
+
+
+class CassetteMissError(TranslationError):
+    """Exception raised when a replayed LLM prompt was never recorded."""
+
+    def __init__(self, key: str):
+        super().__init__(f"No recorded LLM answer for prompt {key}")
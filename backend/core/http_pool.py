@@ -0,0 +1,264 @@
+"""HTTP connection pool shared by the LLM provider clients.
+
+Provider clients send their requests through one sync and one async
+``httpx`` client per process, so every node, job and model reuses the same
+kept-alive connections (and TLS sessions) instead of opening its own. The
+pool is sized by settings and uses HTTP/2 when the ``h2`` package is
+installed. Requests in flight, pool utilization, the time requests wait
+for a connection and the set-up time of new connections are exported as
+metrics.
+"""
+
+import time
+import threading
+import importlib.util
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+import httpx
+
+from config.settings import settings
+from core.metrics import metrics
+
+# seconds, from an idle kept-alive connection to a saturated pool
+WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+http_in_flight = metrics.gauge(
+    "llm_http_requests_in_flight",
+    "LLM HTTP requests waiting for or holding a pooled connection",
+    ["pool"],
+)
+http_utilization = metrics.gauge(
+    "llm_http_pool_utilization",
+    "LLM HTTP requests in flight over the pool's maximum connections",
+    ["pool"],
+)
+http_pool_wait = metrics.histogram(
+    "llm_http_pool_wait_seconds",
+    "Time LLM HTTP requests waited for a pooled connection",
+    ["pool"],
+    WAIT_BUCKETS,
+)
+http_connect = metrics.histogram(
+    "llm_http_connect_seconds",
+    "TCP and TLS set-up time of new LLM HTTP connections",
+    ["pool"],
+    WAIT_BUCKETS,
+)
+http_connections_opened = metrics.counter(
+    "llm_http_connections_opened_total",
+    "LLM HTTP connections opened; steadily rising means connections are not reused",
+    ["pool"],
+)
+
+
+class _RequestMonitor:
+    """Times one request through the pool from httpcore trace events.
+
+    The request waits until its connection either starts connecting or, if
+    it was kept alive, starts sending; a new connection is set up until the
+    request headers are sent on it.
+    """
+
+    def __init__(self, pool: str, max_connections: int, trace: Optional[Callable]):
+        self.pool = pool
+        self.max_connections = max_connections
+        # a trace callback already set on the request still receives every event
+        self.trace = trace
+        self.started = time.perf_counter()
+        self.waited = False
+        self.connecting: Optional[float] = None
+        self.released = False
+        self._count(1)
+
+    def _count(self, amount: int):
+        http_in_flight.inc(amount, pool=self.pool)
+        in_flight = http_in_flight.value(pool=self.pool)
+        http_utilization.set(in_flight / self.max_connections, pool=self.pool)
+
+    def event(self, name: str):
+        now = time.perf_counter()
+        connecting = name.startswith("connection.connect_")
+        sending = name.endswith(".send_request_headers.started")
+
+        if not self.waited and (connecting or sending):
+            self.waited = True
+            http_pool_wait.observe(now - self.started, pool=self.pool)
+
+            if connecting:
+                self.connecting = now
+
+        if sending and self.connecting is not None:
+            http_connect.observe(now - self.connecting, pool=self.pool)
+            http_connections_opened.inc(pool=self.pool)
+            self.connecting = None
+
+    def release(self):
+        """The request gave its connection back, or failed."""
+        if not self.released:
+            self.released = True
+            self._count(-1)
+
+    def sync_trace(self, name: str, info: dict):
+        self.event(name)
+
+        if self.trace is not None:
+            self.trace(name, info)
+
+    async def async_trace(self, name: str, info: dict):
+        self.event(name)
+
+        if self.trace is not None:
+            await self.trace(name, info)
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, monitor: _RequestMonitor):
+        self.stream = stream
+        self.monitor = monitor
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self.stream
+
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            self.monitor.release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, monitor: _RequestMonitor):
+        self.stream = stream
+        self.monitor = monitor
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self.stream.aclose()
+        finally:
+            self.monitor.release()
+
+
+class MonitoredTransport(httpx.HTTPTransport):
+    """Pooled transport recording the metrics of every request."""
+
+    def __init__(self, pool: str, limits: httpx.Limits, **kwargs: Any):
+        super().__init__(limits=limits, **kwargs)
+        self.pool = pool
+        self.max_connections = limits.max_connections
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        monitor = _RequestMonitor(
+            self.pool, self.max_connections, request.extensions.get("trace")
+        )
+        request.extensions = {**request.extensions, "trace": monitor.sync_trace}
+
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            monitor.release()
+            raise
+
+        # the connection goes back to the pool once the body is read and closed
+        response.stream = _ReleasingStream(response.stream, monitor)
+
+        return response
+
+
+class AsyncMonitoredTransport(httpx.AsyncHTTPTransport):
+    """Pooled async transport recording the metrics of every request."""
+
+    def __init__(self, pool: str, limits: httpx.Limits, **kwargs: Any):
+        super().__init__(limits=limits, **kwargs)
+        self.pool = pool
+        self.max_connections = limits.max_connections
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        monitor = _RequestMonitor(
+            self.pool, self.max_connections, request.extensions.get("trace")
+        )
+        request.extensions = {**request.extensions, "trace": monitor.async_trace}
+
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            monitor.release()
+            raise
+
+        response.stream = _AsyncReleasingStream(response.stream, monitor)
+
+        return response
+
+
+class HttpPool:
+    """Sync and async HTTP clients over explicitly sized pools, created on first use."""
+
+    def __init__(
+        self,
+        max_connections: int = 64,
+        max_keepalive_connections: int = 32,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        name: str = "llm",
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        # HTTP/2 multiplexes calls over fewer connections, but needs h2
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.name = name
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "HttpPool":
+        return cls(
+            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+            http2=settings.LLM_HTTP2,
+        )
+
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                transport = MonitoredTransport(
+                    f"{self.name}_sync", limits=self.limits, http2=self.http2
+                )
+                self._client = httpx.Client(transport=transport, follow_redirects=True)
+
+            return self._client
+
+    def async_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._async_client is None:
+                transport = AsyncMonitoredTransport(
+                    f"{self.name}_async", limits=self.limits, http2=self.http2
+                )
+                self._async_client = httpx.AsyncClient(
+                    transport=transport, follow_redirects=True
+                )
+
+            return self._async_client
+
+    async def aclose(self):
+        """Close both clients; the next request opens new ones."""
+        with self._lock:
+            client, async_client = self._client, self._async_client
+            self._client = self._async_client = None
+
+        if client is not None:
+            client.close()
+
+        if async_client is not None:
+            await async_client.aclose()
+
+
+# Create the process-wide pool
+http_pool = HttpPool.from_settings()
@@ -0,0 +1,207 @@
+import bisect
+import threading
+from typing import Dict, List, Tuple, Iterable, Union
+
+# seconds, from a cached lookup to a long LLM call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, description: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{type(self).__name__} '{self.name}' expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...], **extra: str) -> str:
+        pairs = [*zip(self.labelnames, key), *extra.items()]
+
+        if not pairs:
+            return ""
+
+        escaped = (f'{name}="{_escape(value)}"' for name, value in pairs)
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {_escape(self.description)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    """A monotonically increasing counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        return super().render() + [
+            f"{self.name}{self._labels(key)} {_format(value)}"
+            for key, value in sorted(self.samples().items())
+        ]
+
+
+class Gauge(Counter):
+    """A value that goes up and down, such as requests in flight."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Observations counted in cumulative buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: observations per bucket (the last one is +Inf), and their sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        counts, _ = self._values.get(self._key(labels), ([], 0.0))
+        return sum(counts)
+
+    def sum(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), ([], 0.0))[1]
+
+    def samples(self) -> Dict[Tuple[str, ...], Tuple[List[int], float]]:
+        with self._lock:
+            return {
+                key: (list(counts), total)
+                for key, (counts, total) in self._values.items()
+            }
+
+    def render(self) -> List[str]:
+        lines = super().render()
+
+        for key, (counts, total) in sorted(self.samples().items()):
+            cumulative = 0
+
+            for bound, count in zip([*self.buckets, "+Inf"], counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _format(bound)
+                lines.append(
+                    f"{self.name}_bucket{self._labels(key, le=le)} {cumulative}"
+                )
+
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """Process-wide collection of named metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Union[Counter, Gauge, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, description: str, labelnames: Iterable[str] = ()
+    ) -> Counter:
+        """Get or create a counter."""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, description, labelnames)
+
+            return self._metrics[name]
+
+    def gauge(
+        self, name: str, description: str, labelnames: Iterable[str] = ()
+    ) -> Gauge:
+        """Get or create a gauge."""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Gauge(name, description, labelnames)
+
+            return self._metrics[name]
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, description, labelnames, buckets)
+
+            return self._metrics[name]
+
+    def all(self) -> Dict[str, Union[Counter, Gauge, Histogram]]:
+        return dict(self._metrics)
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines = []
+
+        for _, metric in sorted(self.all().items()):
+            lines.extend(metric.render())
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
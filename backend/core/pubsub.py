@@ -0,0 +1,264 @@
+"""Message fan-out between the processes serving the app.
+
+Job events and messages for WebSocket clients are published on channels.
+Every process subscribes to the channels of the jobs and clients it
+serves, so a job can run in any worker process and its events still reach
+the socket, wherever that is held. ``memory`` only reaches the current
+process; ``broker`` and ``redis`` reach every process connected to the
+same broker.
+"""
+
+import json
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from config.settings import settings
+from core.exceptions import ConfigurationError
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# returning False unsubscribes the callback
+Subscriber = Callable[[Dict[str, Any]], Awaitable[Optional[bool]]]
+
+pubsub_messages = metrics.counter(
+    "pubsub_messages_total",
+    "Messages published and delivered through the fan-out backend",
+    ["backend", "direction"],
+)
+
+
+class PubSub:
+    """Channels with local subscribers; subclasses carry messages between processes."""
+
+    name = "memory"
+
+    def __init__(self):
+        self.subscribers: Dict[str, List[Subscriber]] = {}
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, channel: str, message: Dict[str, Any]):
+        pubsub_messages.inc(backend=self.name, direction="published")
+        await self.deliver(channel, message)
+
+    async def subscribe(self, channel: str, subscriber: Subscriber):
+        first = channel not in self.subscribers
+        self.subscribers.setdefault(channel, []).append(subscriber)
+
+        if first:
+            await self._subscribe_remote(channel)
+
+    async def unsubscribe(self, channel: str, subscriber: Subscriber):
+        subscribers = self.subscribers.get(channel, [])
+
+        if subscriber in subscribers:
+            subscribers.remove(subscriber)
+
+        if not subscribers and self.subscribers.pop(channel, None) is not None:
+            await self._unsubscribe_remote(channel)
+
+    async def deliver(self, channel: str, message: Dict[str, Any]):
+        """Hand a message to the subscribers of this process, in order."""
+        for subscriber in list(self.subscribers.get(channel, [])):
+            pubsub_messages.inc(backend=self.name, direction="delivered")
+
+            try:
+                delivered = await subscriber(message)
+            except Exception as e:
+                logger.error(f"Subscriber of {channel} failed: {e}")
+                delivered = False
+
+            if delivered is False:
+                await self.unsubscribe(channel, subscriber)
+
+    async def _subscribe_remote(self, channel: str):
+        pass
+
+    async def _unsubscribe_remote(self, channel: str):
+        pass
+
+
+class BrokerPubSub(PubSub):
+    """Client of ``core.broker`` over a Unix socket or TCP.
+
+    Frames are JSON lines. The connection is reopened, and channels
+    subscribed again, if the broker goes away; messages published while
+    it is gone are lost. ``start`` fails if the broker cannot be reached
+    within ``connect_timeout`` seconds.
+    """
+
+    name = "broker"
+
+    def __init__(
+        self,
+        url: str,
+        reconnect_delay: float = 1.0,
+        connect_timeout: float = settings.PUBSUB_CONNECT_TIMEOUT,
+    ):
+        super().__init__()
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.connect_timeout = connect_timeout
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+
+    async def start(self):
+        if self._reader_task is None:
+            self._reader_task = asyncio.create_task(self._run())
+
+            try:
+                await asyncio.wait_for(self._connected.wait(), self.connect_timeout)
+            except asyncio.TimeoutError:
+                await self.stop()
+                raise ConfigurationError(
+                    f"Pub/sub broker at {self.url} unreachable after "
+                    f"{self.connect_timeout}s; is it running, and PUBSUB_URL right?"
+                ) from None
+
+    async def stop(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        self._connected.clear()
+
+    async def publish(self, channel: str, message: Dict[str, Any]):
+        if self._writer is None:
+            logger.warning(f"Broker unavailable, dropped message on {channel}")
+            return
+
+        pubsub_messages.inc(backend=self.name, direction="published")
+        await self._send({"op": "publish", "channel": channel, "message": message})
+
+    async def _subscribe_remote(self, channel: str):
+        await self._send({"op": "subscribe", "channel": channel})
+
+    async def _unsubscribe_remote(self, channel: str):
+        await self._send({"op": "unsubscribe", "channel": channel})
+
+    async def _send(self, frame: Dict[str, Any]):
+        # subscriptions are sent again once connected
+        if self._writer is None:
+            return
+
+        self._writer.write(json.dumps(frame, ensure_ascii=False).encode() + b"\n")
+        await self._writer.drain()
+
+    async def _open(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        address = urlparse(self.url)
+
+        if address.scheme == "unix":
+            return await asyncio.open_unix_connection(address.path, limit=2**24)
+
+        return await asyncio.open_connection(
+            address.hostname, address.port, limit=2**24
+        )
+
+    async def _run(self):
+        while True:
+            try:
+                reader, self._writer = await self._open()
+
+                for channel in self.subscribers:
+                    await self._subscribe_remote(channel)
+
+                self._connected.set()
+
+                while line := await reader.readline():
+                    frame = json.loads(line)
+                    await self.deliver(frame["channel"], frame["message"])
+
+                logger.warning(f"Broker at {self.url} closed the connection")
+            except (OSError, asyncio.IncompleteReadError) as e:
+                logger.error(f"Broker at {self.url} unavailable: {e}")
+
+            self._writer = None
+            await asyncio.sleep(self.reconnect_delay)
+
+
+class RedisPubSub(PubSub):
+    """Redis channels, through ``redis.asyncio``."""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        super().__init__()
+
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ConfigurationError(
+                "The 'redis' pub/sub backend requires the 'redis' package"
+            ) from e
+
+        self.client = redis.from_url(url)
+        self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._reader_task is None:
+            self._reader_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+    async def publish(self, channel: str, message: Dict[str, Any]):
+        pubsub_messages.inc(backend=self.name, direction="published")
+        await self.client.publish(channel, json.dumps(message, ensure_ascii=False))
+
+    async def _subscribe_remote(self, channel: str):
+        await self.pubsub.subscribe(channel)
+
+    async def _unsubscribe_remote(self, channel: str):
+        await self.pubsub.unsubscribe(channel)
+
+    async def _run(self):
+        while True:
+            if not self.pubsub.subscribed:
+                await asyncio.sleep(0.1)
+                continue
+
+            frame = await self.pubsub.get_message(timeout=1.0)
+
+            if frame is not None:
+                await self.deliver(frame["channel"].decode(), json.loads(frame["data"]))
+
+
+PUBSUB_BACKENDS: Dict[str, Callable[[str], PubSub]] = {
+    "memory": lambda url: PubSub(),
+    "broker": BrokerPubSub,
+    "redis": RedisPubSub,
+}
+
+
+def create_pubsub(backend: str, url: str = "") -> PubSub:
+    if backend not in PUBSUB_BACKENDS:
+        raise ConfigurationError(
+            f"Unknown pub/sub backend '{backend}', "
+            f"expected one of {', '.join(PUBSUB_BACKENDS)}"
+        )
+
+    return PUBSUB_BACKENDS[backend](url)
+
+
+# Shared by the WebSocket manager and the job queue; started with the app
+pubsub = create_pubsub(settings.PUBSUB_BACKEND, settings.PUBSUB_URL)
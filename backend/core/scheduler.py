@@ -0,0 +1,306 @@
+"""Admission control for LLM provider calls.
+
+Every call to a provider goes through its ``ProviderScheduler``, which
+bounds concurrent calls, keeps requests and estimated tokens under the
+provider's per-minute limits with token buckets, admits waiting calls by
+priority, and retries rate-limited or overloaded calls with jittered
+exponential backoff.
+"""
+
+import time
+import heapq
+import random
+import asyncio
+import weakref
+import itertools
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from config.settings import settings
+from core.metrics import metrics
+
+T = TypeVar("T")
+
+# lower values are admitted first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+# 529 is Anthropic's "overloaded"
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504, 529}
+
+scheduler_retries = metrics.counter(
+    "llm_scheduler_retries_total",
+    "LLM calls retried after a rate limit or overload response",
+    ["provider"],
+)
+scheduler_failures = metrics.counter(
+    "llm_scheduler_failures_total",
+    "LLM calls that still failed after all retries",
+    ["provider"],
+)
+scheduler_wait = metrics.counter(
+    "llm_scheduler_wait_seconds_total",
+    "Time calls spent waiting for admission",
+    ["provider", "priority"],
+)
+
+
+class TokenBucket:
+    """Capacity refilled continuously at ``rate`` per second.
+
+    A rate of 0 disables the bucket. The level may go negative when actual
+    usage exceeds what was reserved, delaying later calls accordingly. It
+    starts full unless another ``level`` is given.
+    """
+
+    def __init__(self, rate: float, capacity: float, level: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity if level is None else level
+        self.updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until ``amount`` can be taken; 0 if it can be now."""
+        if not self.enabled:
+            return 0.0
+
+        self._refill()
+        # a request larger than the bucket waits for a full bucket
+        missing = min(amount, self.capacity) - self.level
+
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float):
+        if self.enabled:
+            self._refill()
+            # settling an overestimate gives back at most a full bucket
+            self.level = min(self.capacity, self.level - amount)
+
+    def drain(self):
+        """Empty the bucket, e.g. after the provider reported a rate limit."""
+        if self.enabled:
+            self._refill()
+            self.level = min(self.level, 0.0)
+
+
+@dataclass
+class _LoopState:
+    # (priority, sequence, estimated tokens, future set on admission)
+    waiting: List[Tuple[int, int, int, asyncio.Future]] = field(default_factory=list)
+    active: int = 0
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error is a rate limit or overload worth retrying."""
+    status_code = getattr(error, "status_code", None)
+
+    if status_code is None:
+        response = getattr(error, "response", None)
+        status_code = getattr(response, "status_code", None)
+
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+
+    name = type(error).__name__
+
+    # connection errors and timeouts carry no status, e.g. APIConnectionError
+    return any(
+        kind in name for kind in ("RateLimit", "Overloaded", "Connection", "Timeout")
+    )
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Delay requested by the provider through a Retry-After header."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class ProviderScheduler:
+    """Concurrency, rate limits, priority and retries for one provider."""
+
+    def __init__(
+        self,
+        provider: str,
+        max_concurrency: int,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        burst_seconds: float = 10.0,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        # at most ``burst_seconds`` worth of the limit is sent at once; the
+        # buckets start empty, so no burst on top of the limit opens a window
+        self.requests = TokenBucket(
+            requests_per_minute / 60,
+            max(1.0, requests_per_minute / 60 * burst_seconds),
+            level=0.0,
+        )
+        self.tokens = TokenBucket(
+            tokens_per_minute / 60, tokens_per_minute / 60 * burst_seconds, level=0.0
+        )
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._sequence = itertools.count()
+        self._states = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_settings(cls, provider: str) -> "ProviderScheduler":
+        limits = settings.LLM_PROVIDER_RATE_LIMITS.get(provider, {})
+
+        return cls(
+            provider,
+            max_concurrency=settings.LLM_PROVIDER_CONCURRENCY.get(
+                provider, settings.LLM_PROVIDER_MAX_CONCURRENCY
+            ),
+            requests_per_minute=limits.get(
+                "requests_per_minute", settings.LLM_PROVIDER_REQUESTS_PER_MINUTE
+            ),
+            tokens_per_minute=limits.get(
+                "tokens_per_minute", settings.LLM_PROVIDER_TOKENS_PER_MINUTE
+            ),
+            burst_seconds=settings.LLM_RATE_LIMIT_BURST_SECONDS,
+            max_retries=settings.LLM_RETRY_MAX_ATTEMPTS,
+            backoff_base=settings.LLM_RETRY_BACKOFF_BASE,
+            backoff_max=settings.LLM_RETRY_BACKOFF_MAX,
+        )
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+
+        if state is None:
+            state = _LoopState()
+            self._states[loop] = state
+
+        return state
+
+    def _dispatch(self, state: _LoopState):
+        """Admit waiting calls in priority order while limits allow."""
+        if state.timer is not None:
+            state.timer.cancel()
+            state.timer = None
+
+        while state.waiting and state.active < self.max_concurrency:
+            _, _, tokens, future = state.waiting[0]
+
+            if future.done():
+                # cancelled while waiting
+                heapq.heappop(state.waiting)
+                continue
+
+            delay = max(self.requests.time_until(1), self.tokens.time_until(tokens))
+
+            if delay > 0:
+                # the head waits for the buckets to refill; nothing overtakes it
+                state.timer = asyncio.get_running_loop().call_later(
+                    delay, self._dispatch, state
+                )
+                return
+
+            heapq.heappop(state.waiting)
+            state.active += 1
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            future.set_result(None)
+
+    async def _acquire(self, tokens: int, priority: int):
+        state = self._state()
+        future = asyncio.get_running_loop().create_future()
+        started = time.monotonic()
+
+        heapq.heappush(state.waiting, (priority, next(self._sequence), tokens, future))
+        self._dispatch(state)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # admitted just before the cancellation arrived
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+        scheduler_wait.inc(
+            time.monotonic() - started, provider=self.provider, priority=priority
+        )
+
+    def _release(self):
+        state = self._state()
+        state.active -= 1
+        self._dispatch(state)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token bucket once a call reports its real usage."""
+        self.tokens.take(actual_tokens - estimated_tokens)
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Full-jitter exponential backoff, at least the provider's Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+        return max(delay, retry_after(error) or 0.0)
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        estimated_tokens: int = 0,
+        priority: int = PRIORITY_BULK,
+    ) -> T:
+        """Run a provider call once admitted, retrying rate limits and overloads."""
+        for attempt in itertools.count():
+            await self._acquire(estimated_tokens, priority)
+
+            try:
+                return await call()
+            except Exception as e:
+                # a failed call gives its reservation back
+                self.record_usage(estimated_tokens, 0)
+
+                if not is_retryable(e):
+                    raise
+
+                if attempt >= self.max_retries:
+                    scheduler_failures.inc(provider=self.provider)
+                    raise
+
+                # everyone backs off, not just the call that hit the limit
+                self.requests.drain()
+                self.tokens.drain()
+                scheduler_retries.inc(provider=self.provider)
+                delay = self.backoff(attempt, e)
+            finally:
+                self._release()
+
+            await asyncio.sleep(delay)
+
+
+_provider_schedulers: Dict[str, ProviderScheduler] = {}
+
+
+def provider_scheduler(provider: str) -> ProviderScheduler:
+    """Get the process-wide scheduler for calls to an LLM provider."""
+    if provider not in _provider_schedulers:
+        _provider_schedulers[provider] = ProviderScheduler.from_settings(provider)
+
+    return _provider_schedulers[provider]
@@ -0,0 +1,202 @@
+"""Latency, token and cost accounting of graph nodes and LLM calls.
+
+Every run of a node and every LLM call is counted in the process-wide
+metrics served at ``/metrics``. Work done inside ``track_usage()`` is also
+summed per node in a ``Usage``, which callers attach to their results: the
+tasks a tracked call starts inherit it, so chunks translated concurrently
+add up to their language.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from config.settings import settings
+from core.metrics import metrics
+
+node_seconds = metrics.histogram(
+    "graph_node_seconds", "Wall time of graph node runs", ["node"]
+)
+llm_call_seconds = metrics.histogram(
+    "llm_call_seconds",
+    "Wall time of LLM calls, from submission to answer, including the queue",
+    ["node"],
+)
+llm_queue_seconds = metrics.counter(
+    "llm_queue_seconds_total",
+    "Time LLM calls spent waiting for the scheduler or backing off",
+    ["node"],
+)
+llm_tokens = metrics.counter(
+    "llm_tokens_total",
+    "Tokens of LLM calls as reported by the provider, else estimated",
+    ["node", "direction"],
+)
+llm_bytes = metrics.counter(
+    "llm_bytes_total", "Prompt and answer bytes of LLM calls", ["node", "direction"]
+)
+llm_cost = metrics.counter(
+    "llm_cost_usd_total", "Cost of LLM calls, priced by LLM_TOKEN_PRICES", ["node"]
+)
+
+
+@dataclass
+class NodeUsage:
+    runs: int = 0
+    seconds: float = 0.0
+    llm_calls: int = 0
+    llm_seconds: float = 0.0
+    queue_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    redos: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, other: "NodeUsage"):
+        for field in fields(self):
+            setattr(
+                self, field.name, getattr(self, field.name) + getattr(other, field.name)
+            )
+
+
+class Usage:
+    """Per-node totals of the work done in a ``track_usage()`` block."""
+
+    def __init__(self):
+        self.nodes: Dict[str, NodeUsage] = {}
+        self.started = time.perf_counter()
+
+    def node(self, node: str) -> NodeUsage:
+        return self.nodes.setdefault(node, NodeUsage())
+
+    def summary(self) -> Dict[str, Any]:
+        total = NodeUsage()
+
+        for node_usage in self.nodes.values():
+            total.add(node_usage)
+
+        return {
+            "seconds": round(time.perf_counter() - self.started, 4),
+            "total": _rounded(total),
+            "nodes": {node: _rounded(usage) for node, usage in self.nodes.items()},
+        }
+
+
+_usage: ContextVar[Optional[Usage]] = ContextVar("usage", default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[Usage]:
+    """Sum the nodes and LLM calls run in this block, and in tasks it starts."""
+    usage = Usage()
+    token = _usage.set(usage)
+
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+def _tracked(node: str) -> Optional[NodeUsage]:
+    usage = _usage.get()
+
+    return usage.node(node) if usage is not None else None
+
+
+def _rounded(usage: NodeUsage) -> Dict[str, Any]:
+    return {
+        key: round(value, 6) if isinstance(value, float) else value
+        for key, value in asdict(usage).items()
+    }
+
+
+def merge_summaries(summaries: Iterable[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Add up usage summaries, e.g. of every language of a job.
+
+    Languages run concurrently, so the merged seconds are those of the slowest.
+    """
+    merged = Usage()
+    seconds = 0.0
+
+    for summary in summaries:
+        if not summary:
+            continue
+
+        seconds = max(seconds, summary["seconds"])
+
+        for node, values in summary["nodes"].items():
+            merged.node(node).add(NodeUsage(**values))
+
+    return {**merged.summary(), "seconds": round(seconds, 4)}
+
+
+def token_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Price of a call in USD, 0 for models without a price."""
+    prices = settings.LLM_TOKEN_PRICES.get(model)
+
+    if not prices:
+        return 0.0
+
+    return (
+        input_tokens * prices.get("input", 0) + output_tokens * prices.get("output", 0)
+    ) / 1_000_000
+
+
+def record_node(node: str, seconds: float):
+    node_seconds.observe(seconds, node=node)
+    tracked = _tracked(node)
+
+    if tracked is not None:
+        tracked.runs += 1
+        tracked.seconds += seconds
+
+
+def record_llm_call(
+    node: str,
+    seconds: float,
+    queue_seconds: float,
+    input_tokens: int,
+    output_tokens: int,
+    request_bytes: int,
+    response_bytes: int,
+    cost: float,
+):
+    llm_call_seconds.observe(seconds, node=node)
+    llm_queue_seconds.inc(queue_seconds, node=node)
+    llm_tokens.inc(input_tokens, node=node, direction="input")
+    llm_tokens.inc(output_tokens, node=node, direction="output")
+    llm_bytes.inc(request_bytes, node=node, direction="request")
+    llm_bytes.inc(response_bytes, node=node, direction="response")
+    llm_cost.inc(cost, node=node)
+    tracked = _tracked(node)
+
+    if tracked is not None:
+        tracked.llm_calls += 1
+        tracked.llm_seconds += seconds
+        tracked.queue_seconds += queue_seconds
+        tracked.input_tokens += input_tokens
+        tracked.output_tokens += output_tokens
+        tracked.request_bytes += request_bytes
+        tracked.response_bytes += response_bytes
+        tracked.cost_usd += cost
+
+
+def record_retry(node: str):
+    """An extra LLM round trip to recover from a parse failure."""
+    tracked = _tracked(node)
+
+    if tracked is not None:
+        tracked.retries += 1
+
+
+def record_redo(node: str):
+    """A review sending translations back to the translate node."""
+    tracked = _tracked(node)
+
+    if tracked is not None:
+        tracked.redos += 1
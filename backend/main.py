@@ -1,15 +1,49 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import WebSocket, WebSocketDisconnect
 
 from config.settings import settings
+from core.pubsub import pubsub
 from routes.translation import router
+from routes.jobs import router as jobs_router
+from routes.metrics import router as metrics_router
+from services.jobs import job_queue
+from services.translator import translator_service
 from websocket.manager import ws_manager
 from websocket.handlers import handle_websocket_message
+from websocket.codec import negotiate
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the job workers for as long as the app serves requests."""
+    if settings.STARTUP_WARMUP:
+        # the first translation would otherwise pay for the LangChain imports
+        translator_service.warmup()
+
+    await pubsub.start()
+    await ws_manager.start()
+    await job_queue.start()
+
+    try:
+        yield
+    finally:
+        await job_queue.stop()
+        await ws_manager.stop()
+        await pubsub.stop()
+
+        # imported here: the pool, like the LLM clients, is only loaded on use
+        from core.http_pool import http_pool
+
+        await http_pool.aclose()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -23,14 +57,17 @@ app.add_middleware(
 
 # Include routers
 app.include_router(router, tags=["translation"])
+app.include_router(jobs_router, tags=["jobs"])
+app.include_router(metrics_router, tags=["metrics"])
 
 
 # WebSocket endpoint
 @app.websocket("/ws/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: str):
     """WebSocket endpoint for real-time translations."""
-    await websocket.accept()
-    ws_manager.connect(client_id, websocket)
+    subprotocol = negotiate(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
+    await ws_manager.connect(client_id, websocket, subprotocol)
 
     try:
         while True:
@@ -38,14 +75,19 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
             await handle_websocket_message(client_id, message)
 
     except WebSocketDisconnect:
-        ws_manager.disconnect(client_id)
+        await ws_manager.disconnect(client_id)
 
     except Exception as e:
         print(f"WebSocket error for {client_id}: {e}")
-        ws_manager.disconnect(client_id)
+        await ws_manager.disconnect(client_id)
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        ws_per_message_deflate=settings.WS_PER_MESSAGE_DEFLATE,
+    )
@@ -1,4 +1,4 @@
-from typing import Dict, Union
+from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel
 
 
@@ -13,3 +13,23 @@ class TranslationResult(BaseModel):
 
 class TranslationResponse(BaseModel):
     translations: Dict[str, TranslationResult]
+
+
+class TranslationJobRequest(BaseModel):
+    text: Union[str, Dict[str, str]]
+    # defaults to every supported language
+    languages: Optional[List[str]] = None
+    # resubmitting a known job_id returns the existing job
+    job_id: Optional[str] = None
+
+
+class TranslationJobStatus(BaseModel):
+    job_id: str
+    status: str
+    error: Optional[str] = None
+    attempts: int
+    created_at: float
+    updated_at: float
+    languages: Dict[str, Dict[str, Any]]
+    completed_count: int
+    total_count: int
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+
+from models.schemas import TranslationJobRequest, TranslationJobStatus
+from config.constants import SUPPORTED_LANGUAGES
+from core.usage import merge_summaries
+from services.jobs import JOB_COMPLETED, JOB_FAILED, job_queue
+
+router = APIRouter()
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(request: TranslationJobRequest):
+    languages = request.languages or SUPPORTED_LANGUAGES
+    unsupported = [
+        language for language in languages if language not in SUPPORTED_LANGUAGES
+    ]
+
+    if unsupported:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unsupported languages: {', '.join(unsupported)}",
+        )
+
+    job_id = await job_queue.submit(request.text, languages, job_id=request.job_id)
+
+    return {"job_id": job_id, "status_url": f"/jobs/{job_id}"}
+
+
+@router.get("/jobs/{job_id}")
+async def job_status(job_id: str) -> TranslationJobStatus:
+    job = await job_queue.status(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+
+    return job
+
+
+@router.get("/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    """Translations of a finished job; 202 with its status while it runs."""
+    job = await job_queue.status(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+
+    if job["status"] not in (JOB_COMPLETED, JOB_FAILED):
+        return JSONResponse(status_code=202, content=job)
+
+    translations = await job_queue.result(job_id)
+
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "error": job["error"],
+        "translations": translations,
+        # totals of the languages translated, by graph node
+        "usage": merge_summaries(
+            result.get("usage") for result in (translations or {}).values() if result
+        ),
+    }
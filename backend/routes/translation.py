@@ -3,19 +3,26 @@ from fastapi.responses import JSONResponse
 
 from models.schemas import TranslationRequest, TranslationResponse
 from config.constants import SUPPORTED_LANGUAGES
-from services.translator import translator_service
+from services.jobs import JOB_FAILED, job_queue
 
 router = APIRouter()
 
 
 @router.post("/translate")
 async def translate(request: TranslationRequest) -> TranslationResponse:
+    """Translate synchronously; the work runs as a job, see ``/jobs``."""
     try:
-        translations = {}
+        job_id = await job_queue.submit(request.text, SUPPORTED_LANGUAGES)
+        job = await job_queue.wait(job_id)
 
-        for language in SUPPORTED_LANGUAGES:
-            result = translator_service.process_translation(request.text, language)
-            translations[language] = result
+        if job["status"] == JOB_FAILED:
+            raise RuntimeError(job["error"])
+
+        for language, entry in job["languages"].items():
+            if entry["error"]:
+                raise RuntimeError(f"{language}: {entry['error']}")
+
+        translations = await job_queue.result(job_id)
 
         return JSONResponse(content={"translations": translations})
     except Exception as e:
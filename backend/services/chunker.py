@@ -0,0 +1,168 @@
+"""Token-budget-aware chunking of translation dictionaries.
+
+Keys are packed into chunks until the estimated input or output tokens of a
+call would exceed the configured budget, instead of a fixed number of keys
+per chunk. Keys sharing a prefix (``settings.*``) are kept in the same
+chunk where they fit, so the model sees related strings together.
+"""
+
+import re
+import json
+from typing import Any, Callable, Dict, List
+
+from config.settings import settings
+from core.exceptions import ConfigurationError
+
+# scripts that tokenizers typically split into about one token per character
+WIDE_CHAR_PATTERN = re.compile(
+    r"[\u0600-\u06ff\u0e00-\u0e7f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]"
+)
+WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# JSON punctuation around every key/value pair: quotes, colon, comma, indent
+PAIR_OVERHEAD_TOKENS = 4
+
+
+def heuristic_token_count(text: str) -> int:
+    """Estimate tokens without a tokenizer: ~4 characters per token for words,
+    one per punctuation mark, one per CJK/Arabic/Thai character."""
+    wide = len(WIDE_CHAR_PATTERN.findall(text))
+    narrow = WIDE_CHAR_PATTERN.sub(" ", text)
+    tokens = sum(max(1, round(len(word) / 4)) for word in WORD_PATTERN.findall(narrow))
+
+    return tokens + wide
+
+
+def tiktoken_token_count() -> Callable[[str], int]:
+    try:
+        import tiktoken
+    except ImportError as e:
+        raise ConfigurationError(
+            "The tiktoken tokenizer requires the 'tiktoken' package"
+        ) from e
+
+    encoding = tiktoken.get_encoding("cl100k_base")
+
+    return lambda text: len(encoding.encode(text))
+
+
+TOKENIZERS: Dict[str, Callable[[], Callable[[str], int]]] = {
+    "heuristic": lambda: heuristic_token_count,
+    "tiktoken": tiktoken_token_count,
+}
+
+
+def get_token_counter(name: str) -> Callable[[str], int]:
+    """Get a token counting function by name."""
+    if name not in TOKENIZERS:
+        raise ConfigurationError(
+            f"Unknown tokenizer '{name}'. Available: {', '.join(TOKENIZERS)}"
+        )
+
+    return TOKENIZERS[name]()
+
+
+def key_prefix(key: str) -> str:
+    """Group name of a key: everything before the last dot."""
+    return key.rsplit(".", 1)[0] if "." in key else ""
+
+
+class TokenBudgetChunker:
+    """Pack dictionary keys into chunks bounded by estimated token use."""
+
+    def __init__(
+        self,
+        input_token_budget: int,
+        output_token_budget: int,
+        max_keys: int,
+        output_ratio: float = 1.5,
+        count_tokens: Callable[[str], int] = heuristic_token_count,
+    ):
+        self.input_token_budget = input_token_budget
+        self.output_token_budget = output_token_budget
+        self.max_keys = max_keys
+        self.output_ratio = output_ratio
+        self.count_tokens = count_tokens
+
+    @classmethod
+    def from_settings(cls) -> "TokenBudgetChunker":
+        return cls(
+            input_token_budget=settings.CHUNK_INPUT_TOKEN_BUDGET,
+            output_token_budget=settings.CHUNK_OUTPUT_TOKEN_BUDGET,
+            max_keys=settings.CHUNK_MAX_KEYS,
+            output_ratio=settings.CHUNK_OUTPUT_TOKEN_RATIO,
+            count_tokens=get_token_counter(settings.CHUNK_TOKENIZER),
+        )
+
+    def estimate(self, key: str, value: Any) -> Dict[str, int]:
+        """Estimated input and output tokens of one key/value pair."""
+        text = (
+            value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        )
+        key_tokens = self.count_tokens(key) + PAIR_OVERHEAD_TOKENS
+        value_tokens = self.count_tokens(text)
+
+        return {
+            "input": key_tokens + value_tokens,
+            # keys are echoed back untranslated, values grow in most targets
+            "output": key_tokens + int(value_tokens * self.output_ratio + 0.5),
+        }
+
+    def chunk(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Split a dictionary into chunks.
+
+        Keys of a prefix group are moved next to the group's first key, so the
+        caller restores source order when merging results.
+        """
+        groups: Dict[str, List[str]] = {}
+
+        for key in data:
+            groups.setdefault(key_prefix(key), []).append(key)
+
+        chunks: List[Dict[str, Any]] = []
+        current: Dict[str, Any] = {}
+        used = {"input": 0, "output": 0}
+
+        def fits(cost: Dict[str, int], keys: int) -> bool:
+            return (
+                len(current) + keys <= self.max_keys
+                and used["input"] + cost["input"] <= self.input_token_budget
+                and used["output"] + cost["output"] <= self.output_token_budget
+            )
+
+        def flush():
+            nonlocal current
+            if current:
+                chunks.append(current)
+                current = {}
+                used.update(input=0, output=0)
+
+        for keys in groups.values():
+            costs = [self.estimate(key, data[key]) for key in keys]
+            group_cost = {
+                "input": sum(cost["input"] for cost in costs),
+                "output": sum(cost["output"] for cost in costs),
+            }
+
+            # start a fresh chunk rather than split a group that fits in one
+            fits_alone = (
+                len(keys) <= self.max_keys
+                and group_cost["input"] <= self.input_token_budget
+                and group_cost["output"] <= self.output_token_budget
+            )
+
+            if fits_alone and not fits(group_cost, len(keys)):
+                flush()
+
+            for key, cost in zip(keys, costs):
+                if not fits(cost, 1):
+                    flush()
+
+                # an oversized value still goes out, alone in its chunk
+                current[key] = data[key]
+                used["input"] += cost["input"]
+                used["output"] += cost["output"]
+
+        flush()
+
+        return chunks
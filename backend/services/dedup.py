@@ -0,0 +1,73 @@
+"""Deduplication of repeated values in a dictionary to translate.
+
+Locale files repeat values ("Save", "Cancel", "Loading...") across many
+keys. Each distinct value is sent to the model once per language, under
+the first key it appears with, and its translation is copied to the other
+keys, which also keeps identical strings translated the same way.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from services.translation_memory import normalize_source, split_whitespace
+
+
+@dataclass
+class Deduplication:
+    # first key of every distinct value, with its value
+    unique: Dict[str, Any]
+    # keys repeating the value of a first key, by first key
+    duplicates: Dict[str, List[str]]
+
+    @property
+    def total(self) -> int:
+        return len(self.unique) + sum(len(keys) for keys in self.duplicates.values())
+
+    @property
+    def ratio(self) -> float:
+        """Share of values not sent because an identical one is."""
+        return 1 - len(self.unique) / self.total if self.total else 0.0
+
+    def keys_of(self, key: str) -> List[str]:
+        """A first key and the keys repeating its value."""
+        return [key, *self.duplicates.get(key, [])]
+
+    def fan_out(
+        self, translation: Dict[str, Any], source: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Copy the translation of every first key to the keys repeating it.
+
+        Each copy keeps the leading and trailing whitespace of its own source.
+        """
+        fanned = dict(translation)
+
+        for key, value in translation.items():
+            for duplicate in self.duplicates.get(key, []):
+                if isinstance(value, str):
+                    leading, trailing = split_whitespace(source[duplicate])
+                    fanned[duplicate] = f"{leading}{value.strip()}{trailing}"
+                else:
+                    fanned[duplicate] = value
+
+        return fanned
+
+
+def deduplicate(data: Dict[str, Any]) -> Deduplication:
+    """Group the keys of string values equal once normalized."""
+    first_keys: Dict[str, str] = {}
+    unique: Dict[str, Any] = {}
+    duplicates: Dict[str, List[str]] = {}
+
+    for key, value in data.items():
+        if not isinstance(value, str):
+            unique[key] = value
+            continue
+
+        first_key = first_keys.setdefault(normalize_source(value), key)
+
+        if first_key == key:
+            unique[key] = value
+        else:
+            duplicates.setdefault(first_key, []).append(key)
+
+    return Deduplication(unique, duplicates)
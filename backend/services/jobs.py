@@ -0,0 +1,784 @@
+"""Durable translation jobs.
+
+Jobs are stored in SQLite and run by a pool of workers, so HTTP requests
+and WebSockets only submit work and follow its progress. A worker holds a
+lease on its job and renews it while running; a job whose lease expired,
+because its process crashed or was redeployed, is picked up again. Every
+translated chunk and language is checkpointed, so a resumed job only
+redoes the chunks that were in flight.
+"""
+
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from config.settings import settings
+from core.pubsub import PubSub, Subscriber, pubsub
+from core.usage import merge_summaries
+from services.translator import TranslatorService, translator_service
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+LANGUAGE_PENDING = "pending"
+LANGUAGE_COMPLETED = "completed"
+LANGUAGE_FAILED = "failed"
+
+# events after which a job publishes nothing more
+FINAL_EVENTS = ("multi_translation_completed", "translation_error")
+
+# wakes idle workers of every process when a job is queued
+QUEUED_CHANNEL = "jobs"
+
+
+def job_channel(job_id: str) -> str:
+    """Channel of a job's events, the WebSocket message types."""
+    return f"jobs.{job_id}"
+
+
+@dataclass
+class Job:
+    id: str
+    text: Union[str, Dict[str, Any]]
+    languages: List[str]
+    status: str
+    attempts: int
+
+
+class JobStore:
+    """SQLite persistence of jobs, per-language results and chunk checkpoints."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # opened on first use so importing the service never touches disk
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    input TEXT NOT NULL,
+                    languages TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT,
+                    lease_expires REAL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+                CREATE TABLE IF NOT EXISTS job_languages (
+                    job_id TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    PRIMARY KEY (job_id, language)
+                );
+                CREATE TABLE IF NOT EXISTS job_chunks (
+                    job_id TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    result TEXT NOT NULL,
+                    PRIMARY KEY (job_id, language, chunk_index)
+                );
+                """)
+
+        return self._connection
+
+    def create(
+        self, job_id: str, text: Union[str, Dict[str, Any]], languages: List[str]
+    ) -> bool:
+        """Store a queued job. Returns False if the id already exists."""
+        now = time.time()
+
+        with self._lock:
+            try:
+                self.connection.execute(
+                    "INSERT INTO jobs (id, input, languages, status, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        job_id,
+                        json.dumps(text, ensure_ascii=False),
+                        json.dumps(languages),
+                        JOB_QUEUED,
+                        now,
+                        now,
+                    ),
+                )
+            except sqlite3.IntegrityError:
+                return False
+
+            self.connection.executemany(
+                "INSERT INTO job_languages (job_id, language, status) VALUES (?, ?, ?)",
+                [(job_id, language, LANGUAGE_PENDING) for language in languages],
+            )
+            self.connection.commit()
+
+        return True
+
+    def claim(
+        self, worker: str, lease_seconds: float, max_attempts: int
+    ) -> Tuple[Optional[Job], List[Tuple[str, str]]]:
+        """Lease the oldest queued job, or a running one whose lease expired.
+
+        Returns the job, if any, and the ``(job_id, error)`` of the jobs given
+        up on the way because they used all their attempts, whose subscribers
+        still have to be told.
+        """
+        now = time.time()
+        abandoned = []
+
+        with self._lock:
+            while True:
+                row = self.connection.execute(
+                    "SELECT id, input, languages, attempts FROM jobs "
+                    "WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (JOB_QUEUED, JOB_RUNNING, now),
+                ).fetchone()
+
+                if row is None:
+                    return None, abandoned
+
+                job_id, text, languages, attempts = row
+
+                if attempts >= max_attempts:
+                    # keeps a job that crashes its worker from looping forever
+                    error = f"Gave up after {attempts} attempts"
+                    failed = self.connection.execute(
+                        "UPDATE jobs SET status = ?, error = ?, updated_at = ? "
+                        "WHERE id = ? AND attempts = ? "
+                        "AND (status = ? OR (status = ? AND lease_expires < ?))",
+                        (
+                            JOB_FAILED,
+                            error,
+                            now,
+                            job_id,
+                            attempts,
+                            JOB_QUEUED,
+                            JOB_RUNNING,
+                            now,
+                        ),
+                    ).rowcount
+                    self.connection.commit()
+
+                    # only the process that gave up reports it
+                    if failed:
+                        abandoned.append((job_id, error))
+
+                    continue
+
+                # conditional, as workers of other processes claim from the same store
+                claimed = self.connection.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?, "
+                    "lease_expires = ?, updated_at = ? WHERE id = ? AND attempts = ? "
+                    "AND (status = ? OR (status = ? AND lease_expires < ?))",
+                    (
+                        JOB_RUNNING,
+                        worker,
+                        now + lease_seconds,
+                        now,
+                        job_id,
+                        attempts,
+                        JOB_QUEUED,
+                        JOB_RUNNING,
+                        now,
+                    ),
+                ).rowcount
+                self.connection.commit()
+
+                if not claimed:
+                    continue
+
+                job = Job(
+                    id=job_id,
+                    text=json.loads(text),
+                    languages=json.loads(languages),
+                    status=JOB_RUNNING,
+                    attempts=attempts + 1,
+                )
+
+                return job, abandoned
+
+    def renew(self, job_id: str, worker: str, lease_seconds: float) -> bool:
+        """Extend a lease. Returns False if the job is no longer held by ``worker``."""
+        with self._lock:
+            renewed = self.connection.execute(
+                "UPDATE jobs SET lease_expires = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (time.time() + lease_seconds, job_id, worker, JOB_RUNNING),
+            ).rowcount
+            self.connection.commit()
+
+        return bool(renewed)
+
+    def release(self, worker: str):
+        """Put a stopping worker's jobs back in the queue without using an attempt."""
+        with self._lock:
+            self.connection.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts - 1, worker = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE worker = ? AND status = ?",
+                (JOB_QUEUED, time.time(), worker, JOB_RUNNING),
+            )
+            self.connection.commit()
+
+    def finish(self, job_id: str, status: str, error: Optional[str] = None):
+        with self._lock:
+            self.connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_expires = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id),
+            )
+            self.connection.commit()
+
+    def save_chunk(
+        self, job_id: str, language: str, chunk_index: int, result: Dict[str, Any]
+    ):
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO job_chunks VALUES (?, ?, ?, ?)",
+                (job_id, language, chunk_index, json.dumps(result, ensure_ascii=False)),
+            )
+            self.connection.commit()
+
+    def chunks(self, job_id: str, language: str) -> Dict[int, Dict[str, Any]]:
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT chunk_index, result FROM job_chunks "
+                "WHERE job_id = ? AND language = ?",
+                (job_id, language),
+            ).fetchall()
+
+        return {index: json.loads(result) for index, result in rows}
+
+    def set_language(
+        self,
+        job_id: str,
+        language: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ):
+        with self._lock:
+            self.connection.execute(
+                "UPDATE job_languages SET status = ?, result = ?, error = ? "
+                "WHERE job_id = ? AND language = ?",
+                (
+                    status,
+                    json.dumps(result, ensure_ascii=False) if result else None,
+                    error,
+                    job_id,
+                    language,
+                ),
+            )
+            # checkpoints are only needed until the language is done
+            self.connection.execute(
+                "DELETE FROM job_chunks WHERE job_id = ? AND language = ?",
+                (job_id, language),
+            )
+            self.connection.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job status with the status, result and error of every language."""
+        with self._lock:
+            job = self.connection.execute(
+                "SELECT id, input, status, error, attempts, created_at, updated_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+
+            if job is None:
+                return None
+
+            languages = self.connection.execute(
+                "SELECT language, status, result, error FROM job_languages "
+                "WHERE job_id = ?",
+                (job_id,),
+            ).fetchall()
+
+        return {
+            "job_id": job[0],
+            "input": json.loads(job[1]),
+            "status": job[2],
+            "error": job[3],
+            "attempts": job[4],
+            "created_at": job[5],
+            "updated_at": job[6],
+            "languages": {
+                language: {
+                    "status": status,
+                    "result": json.loads(result) if result else None,
+                    "error": error,
+                }
+                for language, status, result, error in languages
+            },
+        }
+
+    def prune(self, older_than: float) -> int:
+        """Delete finished jobs last updated before ``older_than``."""
+        with self._lock:
+            expired = [
+                job_id
+                for (job_id,) in self.connection.execute(
+                    "SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                    (JOB_COMPLETED, JOB_FAILED, older_than),
+                ).fetchall()
+            ]
+
+            for table, column in (
+                ("job_chunks", "job_id"),
+                ("job_languages", "job_id"),
+                ("jobs", "id"),
+            ):
+                self.connection.executemany(
+                    f"DELETE FROM {table} WHERE {column} = ?",
+                    [(job_id,) for job_id in expired],
+                )
+
+            self.connection.commit()
+
+        return len(expired)
+
+    async def arun(self, method: Callable, *args):
+        """Run a store method without blocking the event loop."""
+        return await asyncio.to_thread(method, *args)
+
+
+class JobQueue:
+    """Submits jobs, runs them on a worker pool and publishes their progress."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        service: TranslatorService,
+        bus: PubSub,
+        workers: int = 4,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 3,
+        poll_interval: float = 1.0,
+        retention_seconds: float = 7 * 24 * 3600,
+    ):
+        self.store = store
+        self.service = service
+        self.bus = bus
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker_prefix = uuid.uuid4().hex[:8]
+
+    @classmethod
+    def from_settings(cls) -> "JobQueue":
+        return cls(
+            JobStore(settings.JOB_STORE_PATH),
+            translator_service,
+            pubsub,
+            workers=settings.JOB_WORKERS,
+            lease_seconds=settings.JOB_LEASE_SECONDS,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            poll_interval=settings.JOB_POLL_INTERVAL,
+            retention_seconds=settings.JOB_RETENTION_SECONDS,
+        )
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        """Start the worker pool on the running event loop."""
+        if self._tasks:
+            return
+
+        self._wakeup = asyncio.Event()
+        await self.bus.subscribe(QUEUED_CHANNEL, self._on_queued)
+        pruned = await self.store.arun(
+            self.store.prune, time.time() - self.retention_seconds
+        )
+
+        if pruned:
+            logger.info(f"Pruned {pruned} finished jobs")
+
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{self._worker_prefix}-{index}"))
+            for index in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Stop the workers and hand their jobs back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        for index in range(len(self._tasks)):
+            await self.store.arun(self.store.release, f"{self._worker_prefix}-{index}")
+
+        await self.bus.unsubscribe(QUEUED_CHANNEL, self._on_queued)
+        self._tasks = []
+
+    async def _on_queued(self, message: Dict[str, Any]):
+        self._wakeup.set()
+
+    async def submit(
+        self,
+        text: Union[str, Dict[str, Any]],
+        languages: List[str],
+        job_id: Optional[str] = None,
+    ) -> str:
+        """Queue a job. Submitting an existing ``job_id`` again is a no-op."""
+        job_id = job_id or f"job_{uuid.uuid4().hex}"
+
+        if await self.store.arun(self.store.create, job_id, text, languages):
+            logger.info(f"Queued job {job_id} for {len(languages)} languages")
+            await self.bus.publish(QUEUED_CHANNEL, {"job_id": job_id})
+
+        return job_id
+
+    async def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job status with per-language progress, without the results."""
+        job = await self.store.arun(self.store.get, job_id)
+
+        if job is None:
+            return None
+
+        languages = job.pop("languages")
+        job.pop("input")
+        job["languages"] = {
+            language: {"status": entry["status"], "error": entry["error"]}
+            for language, entry in languages.items()
+        }
+        job["completed_count"] = sum(
+            entry["status"] == LANGUAGE_COMPLETED for entry in languages.values()
+        )
+        job["total_count"] = len(languages)
+
+        return job
+
+    async def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Results of the completed languages, keyed by language."""
+        job = await self.store.arun(self.store.get, job_id)
+
+        if job is None:
+            return None
+
+        return {
+            language: entry["result"]
+            for language, entry in job["languages"].items()
+            if entry["status"] == LANGUAGE_COMPLETED
+        }
+
+    async def wait(self, job_id: str) -> Dict[str, Any]:
+        """Wait for a job to finish and return its status."""
+        while True:
+            job = await self.status(job_id)
+
+            if job is None or job["status"] in (JOB_COMPLETED, JOB_FAILED):
+                return job
+
+            finished = asyncio.Event()
+
+            async def on_event(event: Dict[str, Any]):
+                if event["type"] in FINAL_EVENTS:
+                    finished.set()
+
+            await self.bus.subscribe(job_channel(job_id), on_event)
+
+            try:
+                # events are lost if the job finished before we subscribed; poll too
+                await asyncio.wait_for(finished.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                await self.bus.unsubscribe(job_channel(job_id), on_event)
+
+    async def subscribe(self, job_id: str, subscriber: Subscriber) -> bool:
+        """Follow a job's progress, starting with what already happened.
+
+        Completed languages are replayed as ``language_translation_completed``
+        and a finished job as its final event. Returns False for unknown jobs.
+        """
+        # registered before reading the snapshot: events in between may be
+        # delivered twice, but none is lost
+        await self.bus.subscribe(job_channel(job_id), subscriber)
+        job = await self.store.arun(self.store.get, job_id)
+
+        if job is None:
+            await self.unsubscribe(job_id, subscriber)
+            return False
+
+        completed_count = 0
+
+        for language, entry in job["languages"].items():
+            if entry["status"] == LANGUAGE_COMPLETED:
+                completed_count += 1
+                await subscriber(
+                    self._completed_event(
+                        job, language, entry["result"], completed_count
+                    )
+                )
+            elif entry["status"] == LANGUAGE_FAILED:
+                await subscriber(self._failed_event(job_id, language, entry["error"]))
+
+        if job["status"] in (JOB_COMPLETED, JOB_FAILED):
+            await subscriber(self._finished_event(job_id, job["status"], job["error"]))
+            await self.unsubscribe(job_id, subscriber)
+
+        return True
+
+    async def unsubscribe(self, job_id: str, subscriber: Subscriber):
+        await self.bus.unsubscribe(job_channel(job_id), subscriber)
+
+    async def publish(self, job_id: str, event: Dict[str, Any]):
+        """Send a job event to its subscribers, in whichever process they are."""
+        await self.bus.publish(job_channel(job_id), event)
+
+    async def _worker(self, worker: str):
+        while True:
+            # cleared before claiming, so a job submitted meanwhile still wakes us
+            self._wakeup.clear()
+            job, abandoned = await self.store.arun(
+                self.store.claim, worker, self.lease_seconds, self.max_attempts
+            )
+
+            for job_id, error in abandoned:
+                logger.error(f"Job {job_id} failed: {error}")
+                await self.publish(
+                    job_id, self._finished_event(job_id, JOB_FAILED, error)
+                )
+
+            if job is None:
+                try:
+                    # woken by submit; polling picks up jobs from other processes
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+                continue
+
+            try:
+                await self._run(job, worker)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {e}")
+                # retried by another claim until max_attempts
+                status = JOB_QUEUED if job.attempts < self.max_attempts else JOB_FAILED
+                await self.store.arun(self.store.finish, job.id, status, str(e))
+
+                if status == JOB_FAILED:
+                    await self.publish(
+                        job.id, self._finished_event(job.id, JOB_FAILED, str(e))
+                    )
+
+    async def _renew_lease(self, job: Job, worker: str, translation: asyncio.Task):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            renewed = await self.store.arun(
+                self.store.renew, job.id, worker, self.lease_seconds
+            )
+
+            if not renewed:
+                # another worker resumed the job; stop before writing its results
+                logger.warning(f"Worker {worker} lost the lease on job {job.id}")
+                translation.cancel()
+                return
+
+    async def _run(self, job: Job, worker: str):
+        translation = asyncio.create_task(self._translate(job))
+        renewal = asyncio.create_task(self._renew_lease(job, worker, translation))
+
+        try:
+            await translation
+        except asyncio.CancelledError:
+            # cancelled by a lost lease: the job now belongs to another worker
+            if renewal.done() and not renewal.cancelled():
+                return
+
+            translation.cancel()
+            raise
+        finally:
+            renewal.cancel()
+
+    async def _translate(self, job: Job):
+        state = await self.store.arun(self.store.get, job.id)
+        languages = state["languages"]
+        completed_count = sum(
+            entry["status"] == LANGUAGE_COMPLETED for entry in languages.values()
+        )
+
+        await self.publish(
+            job.id,
+            {
+                "type": "multi_translation_started",
+                "job_id": job.id,
+                "total_languages": len(job.languages),
+                "languages": job.languages,
+            },
+        )
+
+        prepared = await self.service.prepare(job.text)
+
+        if prepared.dedup is not None:
+            logger.info(
+                f"Job {job.id}: {len(prepared.dedup.unique)} distinct values out of "
+                f"{prepared.dedup.total} ({prepared.dedup.ratio:.0%} deduplicated)"
+            )
+
+        usages = []
+
+        async def translate_language(language: str):
+            nonlocal completed_count
+
+            if languages[language]["status"] == LANGUAGE_COMPLETED:
+                return
+
+            await self.publish(
+                job.id,
+                {
+                    "type": "language_translation_started",
+                    "job_id": job.id,
+                    "language": language,
+                    "progress": f"Translating to {language}...",
+                },
+            )
+
+            completed_chunks = await self.store.arun(
+                self.store.chunks, job.id, language
+            )
+
+            async def on_progress(event: Dict[str, Any]):
+                await self.publish(
+                    job.id, self._progress_event(job.id, language, event)
+                )
+
+            async def on_chunk_completed(index: int, result: Dict[str, Any]):
+                await self.store.arun(
+                    self.store.save_chunk, job.id, language, index, result
+                )
+
+            try:
+                result = await self.service.translate_prepared(
+                    prepared,
+                    language,
+                    on_progress=on_progress,
+                    completed_chunks=completed_chunks,
+                    on_chunk_completed=on_chunk_completed,
+                )
+            except Exception as e:
+                await self.store.arun(
+                    self.store.set_language,
+                    job.id,
+                    language,
+                    LANGUAGE_FAILED,
+                    None,
+                    str(e),
+                )
+                await self.publish(job.id, self._failed_event(job.id, language, str(e)))
+                return
+
+            await self.store.arun(
+                self.store.set_language, job.id, language, LANGUAGE_COMPLETED, result
+            )
+            usages.append(result["usage"])
+            completed_count += 1
+            await self.publish(
+                job.id, self._completed_event(state, language, result, completed_count)
+            )
+
+        await asyncio.gather(
+            *(translate_language(language) for language in job.languages)
+        )
+
+        if usages:
+            total = merge_summaries(usages)["total"]
+            logger.info(
+                f"Job {job.id}: {total['llm_calls']} LLM calls, "
+                f"{total['input_tokens']} input and {total['output_tokens']} output tokens, "
+                f"{total['queue_seconds']:.1f}s queued, ${total['cost_usd']:.4f}"
+            )
+
+        await self.store.arun(self.store.finish, job.id, JOB_COMPLETED)
+        await self.publish(job.id, self._finished_event(job.id, JOB_COMPLETED))
+
+    def _progress_event(
+        self, job_id: str, language: str, event: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """``language_translation_partial`` carries reviewed results the client
+        can keep; ``language_translation_draft`` unreviewed model output that
+        later messages may replace. Counts are approved keys of the language."""
+        message = {
+            "type": (
+                "language_translation_partial"
+                if event["status"] == "approved"
+                else "language_translation_draft"
+            ),
+            "job_id": job_id,
+            "language": language,
+            "completed_count": event["completed_count"],
+            "total_count": event["total_count"],
+        }
+
+        if "translations" in event:
+            message["translations"] = event["translations"]
+        else:
+            message["text"] = event["text"]
+
+        return message
+
+    def _completed_event(
+        self,
+        job: Dict[str, Any],
+        language: str,
+        result: Dict[str, Any],
+        completed_count: int,
+    ) -> Dict[str, Any]:
+        return {
+            "type": "language_translation_completed",
+            "job_id": job["job_id"],
+            "language": language,
+            "original_text": job["input"],
+            "translated_text": result,
+            "completed_count": completed_count,
+            "total_count": len(job["languages"]),
+        }
+
+    def _failed_event(self, job_id: str, language: str, error: str) -> Dict[str, Any]:
+        return {
+            "type": "language_translation_failed",
+            "job_id": job_id,
+            "language": language,
+            "error": error,
+        }
+
+    def _finished_event(
+        self, job_id: str, status: str, error: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if status == JOB_FAILED:
+            return {"type": "translation_error", "job_id": job_id, "error": error}
+
+        return {"type": "multi_translation_completed", "job_id": job_id}
+
+
+# Create job queue instance; workers are started with the app
+job_queue = JobQueue.from_settings()
@@ -0,0 +1,329 @@
+"""Persistent translation memory.
+
+Translations are cached per (normalized source text, target language,
+prompt version), where the prompt version hashes ``ai_agent/prompts.py``
+together with the model name, so any prompt or model change misses the
+cache automatically. Stale entries can be dropped with:
+
+    python -m services.translation_memory invalidate --stale
+"""
+
+import time
+import asyncio
+import hashlib
+import inspect
+import sqlite3
+import argparse
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ai_agent import prompts
+from config.settings import settings
+from core.metrics import metrics
+
+cache_hits = metrics.counter(
+    "translation_memory_hits_total",
+    "Source strings served from the translation memory",
+    ["target_language"],
+)
+cache_misses = metrics.counter(
+    "translation_memory_misses_total",
+    "Source strings not found in the translation memory",
+    ["target_language"],
+)
+
+
+@lru_cache(maxsize=None)
+def compute_prompt_version(model_name: str) -> str:
+    """Hash the prompt definitions and the model they are sent to."""
+    digest = hashlib.sha256(inspect.getsource(prompts).encode("utf-8"))
+    digest.update(model_name.encode("utf-8"))
+
+    return digest.hexdigest()[:16]
+
+
+def normalize_source(text: str) -> str:
+    """Normalize source text for lookups."""
+    return unicodedata.normalize("NFC", text).strip()
+
+
+def split_whitespace(text: str) -> Tuple[str, str]:
+    """Leading and trailing whitespace stripped by ``normalize_source``."""
+    stripped = text.strip()
+
+    if not stripped:
+        return text, ""
+
+    start = text.index(stripped[0])
+    return text[:start], text[start + len(stripped) :]
+
+
+class TranslationMemory:
+    """SQLite-backed LRU cache of translated strings."""
+
+    def __init__(self, path: str, max_entries: int, min_rating: int = 0):
+        self.path = path
+        self.max_entries = max_entries
+        self.min_rating = min_rating
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> Optional["TranslationMemory"]:
+        if not settings.TRANSLATION_MEMORY_ENABLED:
+            return None
+
+        return cls(
+            settings.TRANSLATION_MEMORY_PATH,
+            settings.TRANSLATION_MEMORY_MAX_ENTRIES,
+            settings.TRANSLATION_MEMORY_MIN_RATING,
+        )
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # opened on first use so importing the service never touches disk
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    prompt_version TEXT NOT NULL,
+                    target_language TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    rating INTEGER NOT NULL DEFAULT 0,
+                    last_used REAL NOT NULL
+                )
+                """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_prompt_version ON entries (prompt_version)"
+            )
+
+        return self._connection
+
+    def _key(self, source: str, target_language: str, prompt_version: str) -> str:
+        raw = "\x00".join(
+            [prompt_version, target_language, normalize_source(source)]
+        ).encode("utf-8")
+
+        return hashlib.sha256(raw).hexdigest()
+
+    def get_many(
+        self, sources: Iterable[str], target_language: str, prompt_version: str
+    ) -> Dict[str, Tuple[str, int]]:
+        """Look up source strings. Returns ``{source: (translation, rating)}`` for hits.
+
+        Entries rated below ``min_rating`` are misses.
+        """
+        keys = {
+            self._key(source, target_language, prompt_version): source
+            for source in set(sources)
+        }
+
+        if not keys:
+            return {}
+
+        found = {}
+
+        with self._lock:
+            key_list = list(keys)
+
+            # stay below SQLite's bound parameter limit
+            for i in range(0, len(key_list), 500):
+                batch = key_list[i : i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.connection.execute(
+                    f"SELECT key, translation, rating FROM entries "
+                    f"WHERE key IN ({placeholders}) AND rating >= ?",
+                    [*batch, self.min_rating],
+                ).fetchall()
+                found.update(
+                    {key: (translation, rating) for key, translation, rating in rows}
+                )
+
+            if found:
+                self.connection.executemany(
+                    "UPDATE entries SET last_used = ? WHERE key = ?",
+                    [(time.time(), key) for key in found],
+                )
+                self.connection.commit()
+
+        hits = {}
+
+        for key, (translation, rating) in found.items():
+            source = keys[key]
+            leading, trailing = split_whitespace(source)
+            hits[source] = (f"{leading}{translation}{trailing}", rating)
+
+        cache_hits.inc(len(hits), target_language=target_language)
+        cache_misses.inc(len(keys) - len(hits), target_language=target_language)
+
+        return hits
+
+    def put_many(
+        self,
+        translations: Dict[str, str],
+        target_language: str,
+        prompt_version: str,
+        rating: int = 0,
+    ):
+        """Store ``{source: translation}`` pairs and evict least recently used entries.
+
+        Nothing is stored for a rating below ``min_rating``.
+        """
+        if rating < self.min_rating:
+            return
+
+        now = time.time()
+        rows = [
+            (
+                self._key(source, target_language, prompt_version),
+                prompt_version,
+                target_language,
+                normalize_source(source),
+                normalize_source(translation),
+                rating,
+                now,
+            )
+            for source, translation in translations.items()
+            if normalize_source(source)
+        ]
+
+        if not rows:
+            return
+
+        with self._lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._evict()
+            self.connection.commit()
+
+    def _evict(self):
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+        excess = count - self.max_entries
+
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    async def aget_many(
+        self, sources: Iterable[str], target_language: str, prompt_version: str
+    ) -> Dict[str, Tuple[str, int]]:
+        return await asyncio.to_thread(
+            self.get_many, list(sources), target_language, prompt_version
+        )
+
+    async def aput_many(
+        self,
+        translations: Dict[str, str],
+        target_language: str,
+        prompt_version: str,
+        rating: int = 0,
+    ):
+        await asyncio.to_thread(
+            self.put_many, translations, target_language, prompt_version, rating
+        )
+
+    def invalidate(
+        self,
+        prompt_version: Optional[str] = None,
+        keep_prompt_version: Optional[str] = None,
+        target_language: Optional[str] = None,
+    ) -> int:
+        """Delete matching entries. With no filters, the whole memory is cleared."""
+        clauses, params = [], []
+
+        if prompt_version:
+            clauses.append("prompt_version = ?")
+            params.append(prompt_version)
+
+        if keep_prompt_version:
+            clauses.append("prompt_version != ?")
+            params.append(keep_prompt_version)
+
+        if target_language:
+            clauses.append("target_language = ?")
+            params.append(target_language)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            deleted = self.connection.execute(
+                f"DELETE FROM entries{where}", params
+            ).rowcount
+            self.connection.commit()
+
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self.connection.execute(
+                "SELECT COUNT(*) FROM entries"
+            ).fetchone()
+
+        hits = sum(cache_hits.samples().values())
+        misses = sum(cache_misses.samples().values())
+
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the translation memory.")
+    parser.add_argument("--path", default=settings.TRANSLATION_MEMORY_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    invalidate = commands.add_parser(
+        "invalidate", help="Delete cached translations after a prompt or model change."
+    )
+    scope = invalidate.add_mutually_exclusive_group(required=True)
+    scope.add_argument(
+        "--stale",
+        action="store_true",
+        help="Delete entries not created with the current prompts and model.",
+    )
+    scope.add_argument("--prompt-version", help="Delete entries of one prompt version.")
+    scope.add_argument("--all", action="store_true", help="Delete every entry.")
+    invalidate.add_argument("--language", help="Only delete entries for this language.")
+
+    commands.add_parser("stats", help="Show the number of cached entries.")
+
+    args = parser.parse_args()
+    memory = TranslationMemory(args.path, settings.TRANSLATION_MEMORY_MAX_ENTRIES)
+
+    if args.command == "stats":
+        print(memory.stats())
+        return
+
+    keep_prompt_version = None
+
+    if args.stale:
+        from ai_agent.workflow import translator_graph
+
+        keep_prompt_version = compute_prompt_version(translator_graph.model_name)
+
+    deleted = memory.invalidate(
+        prompt_version=args.prompt_version,
+        keep_prompt_version=keep_prompt_version,
+        target_language=args.language,
+    )
+    print(f"Deleted {deleted} entries")
+
+
+if __name__ == "__main__":
+    main()
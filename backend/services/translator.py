@@ -1,23 +1,139 @@
 import json
-from typing import Dict, Any, Union, List, Callable
-from ai_agent.workflow import translator_graph
-from ai_agent.state import AgentState
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import (
+    Dict,
+    Any,
+    Union,
+    Callable,
+    Optional,
+    List,
+    Awaitable,
+    Set,
+    Tuple,
+)
+from ai_agent.formatter import format_json_translation
+from ai_agent.masking import is_translatable, mask, mask_value, unmask_value
+from ai_agent.state import ITERATION_LIMIT_REASONING, AgentState, QueryInfoState
+from config.settings import settings
+from core.concurrency import ConcurrencyLimiter
+from core.metrics import metrics
+from core.usage import track_usage
+from services.chunker import TokenBudgetChunker
+from services.dedup import Deduplication, deduplicate
+from services.translation_memory import TranslationMemory, compute_prompt_version
+
+untranslatable_values = metrics.counter(
+    "untranslatable_values_total",
+    "Values made only of placeholders, markup or links, not sent to the LLM",
+)
+deduplicated_values = metrics.counter(
+    "deduplicated_values_total",
+    "Values not sent to the LLM because an identical value of the payload was",
+)
+
+logger = logging.getLogger(__name__)
+
+# receives {"status": "draft" | "approved", ...} while a language is translated
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+# receives the index and result of each chunk translated, to checkpoint it
+ChunkCallback = Callable[[int, Dict[str, Any]], Awaitable[None]]
+# values as sent to the model, their masked spans, the keys with nothing to
+# translate and the deduplication of the others, see TranslatorService._plan
+Plan = Tuple[Dict[str, Any], Dict[str, List[str]], Set[str], Deduplication]
+
+
+@dataclass
+class PreparedInput:
+    """Language-independent work on an input, shared by every target language."""
+
+    # set for dictionaries, including repaired malformed JSON
+    data: Optional[Dict[str, Any]] = None
+    chunks: Optional[List[Dict[str, Any]]] = None
+    plan: Optional[Plan] = None
+
+    # set for plain text
+    text: Optional[str] = None
+    query_info: Optional[QueryInfoState] = None
+
+    @property
+    def dedup(self) -> Optional[Deduplication]:
+        return self.plan[3] if self.plan else None
 
 
 class TranslatorService:
     """Translator service."""
 
-    def translate_single(
+    def __init__(
+        self,
+        max_concurrency: int = settings.TRANSLATION_MAX_CONCURRENCY,
+        memory: Optional[TranslationMemory] = None,
+        chunker: Optional[TokenBudgetChunker] = None,
+        masking: bool = settings.PLACEHOLDER_MASKING,
+        dedup: bool = settings.VALUE_DEDUPLICATION,
+    ):
+        # shared by every job in the process, not per request
+        self.chunk_limiter = ConcurrencyLimiter(max_concurrency)
+        self.memory = memory
+        self.chunker = chunker or TokenBudgetChunker.from_settings()
+        self.masking = masking
+        self.dedup = dedup
+
+    @property
+    def graph(self):
+        """The translation graph, imported on first use.
+
+        The graph module pulls in LangChain, LangGraph and the provider
+        clients, which would otherwise dominate the start-up of the app.
+        """
+        from ai_agent.workflow import translator_graph
+
+        return translator_graph
+
+    def warmup(self):
+        """Import and build the graph and its models before the first request."""
+        self.graph.warmup()
+
+    @property
+    def prompt_version(self) -> str:
+        return compute_prompt_version(self.graph.model_name)
+
+    async def translate_single(
         self,
         text: str,
         target_language: str,
         is_string: bool = False,
         is_json: bool = False,
+        query_info: Optional[QueryInfoState] = None,
+        on_progress: Optional[Callable[[str, Any], Awaitable[None]]] = None,
     ) -> AgentState:
-        """Translate single text using langgraph."""
-        res = translator_graph.execute(
-            text, target_language, is_string=is_string, is_json=is_json
-        )
+        """Translate single text using langgraph.
+
+        With ``on_progress`` the graph is streamed and the callback receives
+        ``("draft", translation)`` and ``("approved", translation)`` events
+        before the result is returned.
+        """
+        if on_progress is None:
+            res = await self.graph.aexecute(
+                text,
+                target_language,
+                is_string=is_string,
+                is_json=is_json,
+                query_info=query_info,
+            )
+        else:
+            async for kind, payload in self.graph.astream_execute(
+                text,
+                target_language,
+                is_string=is_string,
+                is_json=is_json,
+                query_info=query_info,
+            ):
+                if kind == "result":
+                    res = payload
+                else:
+                    await on_progress(kind, payload)
 
         # Extract just the essential data
         return {
@@ -30,132 +146,549 @@ class TranslatorService:
             "review_decision": res["review_state"].review_decision,
             "review_reasoning": res["review_state"].review_reasoning,
             "iterations": res["translation_state"].iteration,
+            "format_issues": res["format_state"].format_issues,
+            "fallback_keys": res["format_state"].fallback_keys,
+            # approved by the iteration cap, not by the review
+            "iteration_limit": res["review_state"].review_reasoning.startswith(
+                ITERATION_LIMIT_REASONING
+            ),
         }
 
-    def chunk_dict(
-        self, data: Dict[str, Any], chunk_size: int = 40
-    ) -> List[Dict[str, Any]]:
-        """Split dictionary into chunks of specified size."""
-        items = list(data.items())
-        chunks = []
-
-        for i in range(0, len(items), chunk_size):
-            chunk_items = items[i : i + chunk_size]
-            chunks.append(dict(chunk_items))
-
-        return chunks
-
-    def translate_chunk(
+    async def translate_chunk(
         self,
         chunk: Dict[str, Any],
         target_language: str,
         on_chunk_translated: Callable[[Dict[str, Any]], None] = lambda x: None,
         on_chunk_failed: Callable[[Dict[str, Any]], None] = lambda x: None,
-    ) -> Dict[str, Any]:
-        """Translate a chunk of data."""
+        on_progress: Optional[Callable[[str, Any], Awaitable[None]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Translate a chunk of data. Returns None if the chunk failed."""
         json_string = json.dumps(chunk, ensure_ascii=False, indent=2)
-        translated_json = self.translate_single(
-            json_string, target_language, is_json=True
-        )
 
         try:
-            if isinstance(translated_json, str):
-                translated_chunk = json.loads(translated_json)
-                on_chunk_translated(translated_chunk)
+            async with self.chunk_limiter:
+                translated_json = await self.translate_single(
+                    json_string, target_language, is_json=True, on_progress=on_progress
+                )
 
-                return translated_chunk
-            else:
-                on_chunk_translated(translated_json)
-                return translated_json
+            if not isinstance(translated_json["final_translation"], dict):
+                raise ValueError("Translated chunk is not a JSON object")
 
-        except (json.JSONDecodeError, Exception) as e:
-            print(f"Failed to translate chunk: {e}")
+        except Exception as e:
+            logger.warning(f"Failed to translate chunk: {e}")
             on_chunk_failed(chunk)
 
-    def translate_dict_batched(
-        self, data: Dict[str, Any], target_language: str, chunk_size: int = 35
+            return None
+
+        on_chunk_translated(translated_json)
+
+        return translated_json
+
+    async def translate_dict_batched(
+        self,
+        data: Dict[str, Any],
+        target_language: str,
+        chunks: Optional[List[Dict[str, Any]]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        completed_chunks: Optional[Dict[int, Dict[str, Any]]] = None,
+        on_chunk_completed: Optional[ChunkCallback] = None,
+        plan: Optional[Plan] = None,
     ) -> Dict[str, Any]:
-        """Translate dictionary by sending chunks as JSON strings."""
+        """Translate dictionary by sending chunks as JSON strings.
 
-        # If small enough, translate as single chunk
-        if len(data) <= chunk_size:
-            print("--------------------------------")
-            print("data")
-            print(data)
-            print("--------------------------------")
+        String values found in the translation memory are not sent to the
+        graph; they are left out of the chunks, which are sized by estimated
+        token budget. Chunks are translated concurrently, bounded by
+        ``chunk_limiter``. Keys of a failed chunk keep their source value and
+        are reported in ``failed_keys`` instead of failing the whole job.
 
-            translated_json = self.translate_chunk(data, target_language)
+        ``chunks`` precomputed for the whole dictionary are reused, minus the
+        keys served from the translation memory, and so is the ``plan``
+        (masking and deduplication) they were made from.
 
-            print("--------------------------------")
-            print("translated_json")
-            print(translated_json)
-            print("--------------------------------")
+        Chunks are numbered by their position in the chunking of the whole
+        dictionary. ``on_chunk_completed`` receives each translated chunk
+        with its number, and chunks found in ``completed_chunks`` are not
+        translated again, so an interrupted job can resume from them.
 
-        # Split into chunks and translate each
-        chunks = self.chunk_dict(data, chunk_size)
-        translated_chunks = []
+        ``on_progress`` receives the keys of each chunk as the model streams
+        them (``draft``, again when a REDO translates them again) and once
+        the review accepted them (``approved``), with the number of approved
+        keys so far.
 
-        for chunk in chunks:
-            print("--------------------------------")
-            print("chunk")
-            print(chunk)
-            print("--------------------------------")
+        With masking, placeholders, markup and links are sent as tokens and
+        restored in every translation coming back. Values with nothing else
+        in them keep their source value without an LLM call.
 
-            translated_json = self.translate_chunk(
+        Repeated values are only sent once, under the first key they appear
+        with, and their translation is copied to the other keys; chunks
+        only hold those first keys.
+        """
+        cached = {}
+
+        if self.memory:
+            cached = await self.memory.aget_many(
+                [value for value in data.values() if isinstance(value, str)],
+                target_language,
+                self.prompt_version,
+            )
+
+        hit_keys = {
+            key
+            for key, value in data.items()
+            if isinstance(value, str) and value in cached
+        }
+        source, spans, untranslatable_keys, dedup = plan or self._plan(data)
+        untranslatable_keys = untranslatable_keys - hit_keys
+        misses = {
+            key
+            for key in data
+            if key not in hit_keys and key not in untranslatable_keys
+        }
+        untranslatable_values.inc(len(untranslatable_keys))
+        deduplicated_values.inc(dedup.total - len(dedup.unique))
+
+        if chunks is None:
+            chunks = self.chunker.chunk(dedup.unique)
+
+        completed_chunks = completed_chunks or {}
+        # numbered before filtering, so numbers survive memory hits changing;
+        # a value is sent if any key repeating it missed the memory
+        numbered_chunks = [
+            (
+                index,
+                {
+                    key: source[key]
+                    for key in chunk
+                    if any(other in misses for other in dedup.keys_of(key))
+                },
+            )
+            for index, chunk in enumerate(chunks)
+        ]
+        numbered_chunks = [(index, chunk) for index, chunk in numbered_chunks if chunk]
+
+        approved_keys = set()
+
+        async def report(status: str, translations: Dict[str, Any]):
+            if status == "approved":
+                approved_keys.update(translations)
+
+            await on_progress(
+                {
+                    "status": status,
+                    "translations": translations,
+                    "completed_count": len(approved_keys),
+                    "total_count": len(data),
+                }
+            )
+
+        def chunk_progress(chunk: Dict[str, Any]):
+            async def on_chunk_progress(kind: str, translation: Dict[str, Any]):
+                translation = {
+                    key: value for key, value in translation.items() if key in chunk
+                }
+
+                if kind == "approved":
+                    translation, _, _ = format_json_translation(
+                        {key: chunk[key] for key in translation}, translation
+                    )
+
+                if translation:
+                    translation = dedup.fan_out(translation, source)
+                    await report(kind, self._unmask_data(translation, spans))
+
+            return on_chunk_progress
+
+        if on_progress and (hit_keys or untranslatable_keys):
+            await report(
+                "approved",
+                {
+                    **{key: cached[data[key]][0] for key in hit_keys},
+                    **{key: data[key] for key in untranslatable_keys},
+                },
+            )
+
+        async def translate_numbered_chunk(index: int, chunk: Dict[str, Any]):
+            if index in completed_chunks:
+                translated = completed_chunks[index]
+
+                if on_progress:
+                    await report("approved", translated["final_translation"])
+
+                return translated
+
+            translated = await self.translate_chunk(
                 chunk,
                 target_language,
-                on_chunk_failed=lambda x: translated_chunks.append(x),
+                on_progress=chunk_progress(chunk) if on_progress else None,
+            )
+
+            if translated is not None:
+                translated["final_translation"] = self._unmask_data(
+                    dedup.fan_out(translated["final_translation"], source), spans
+                )
+
+            if translated is not None and on_chunk_completed:
+                await on_chunk_completed(index, translated)
+
+            return translated
+
+        translated_chunks = await asyncio.gather(
+            *(
+                translate_numbered_chunk(index, chunk)
+                for index, chunk in numbered_chunks
             )
+        )
 
-            translated_chunks.append(translated_json)
+        result = {
+            "is_json": True,
+            "is_string": False,
+            "target_language": target_language,
+            "translation_rating": min(
+                (cached[data[key]][1] for key in hit_keys), default=0
+            ),
+            "review_decision": "APPROVE" if hit_keys else None,
+            "review_reasoning": "Served from translation memory" if hit_keys else "",
+        }
 
-        # Merge all translated chunks
-        print("--------------------------------")
-        print("translated_chunks")
-        print(translated_chunks)
-        print("--------------------------------")
+        merged_translation = {}
+        failed_keys = []
+        format_issues = []
+        total_iterations = 0
 
-        result = {}
+        for (_, chunk), translated in zip(numbered_chunks, translated_chunks):
+            if translated is None:
+                failed_keys.extend(
+                    key
+                    for first_key in chunk
+                    for key in dedup.keys_of(first_key)
+                    if key in misses
+                )
+                continue
 
-        if translated_chunks:
-            # Initialize merged objects
-            merged_final_translation = {}
-            total_iterations = 0
+            merged_translation.update(translated["final_translation"])
+            total_iterations += translated["iterations"]
+            format_issues.extend(translated["format_issues"])
+            # keys the model dropped or mangled only hold their source value
+            fallback_keys = [
+                key
+                for first_key in translated.get("fallback_keys", [])
+                for key in dedup.keys_of(first_key)
+            ]
+            failed_keys.extend(fallback_keys)
 
-            for chunk in translated_chunks:
+            # Take single values from the last translated chunk
+            result["translation_rating"] = translated["translation_rating"]
+            result["review_decision"] = translated["review_decision"]
+            result["review_reasoning"] = translated["review_reasoning"]
 
-                # update final translation and add iterations
-                merged_final_translation.update(chunk["final_translation"])
-                total_iterations += chunk["iterations"]
+            if self.memory and not translated.get("iteration_limit"):
+                await self.memory.aput_many(
+                    {
+                        data[key]: value
+                        for key, value in translated["final_translation"].items()
+                        if isinstance(data.get(key), str)
+                        and isinstance(value, str)
+                        and key not in fallback_keys
+                    },
+                    target_language,
+                    self.prompt_version,
+                    rating=translated["translation_rating"],
+                )
 
-                # Take single values from last chunk
-                result["is_json"] = chunk["is_json"]
-                result["is_string"] = chunk["is_string"]
-                result["target_language"] = chunk["target_language"]
-                result["translation_rating"] = chunk["translation_rating"]
-                result["review_decision"] = chunk["review_decision"]
-                result["review_reasoning"] = chunk["review_reasoning"]
+        for key in hit_keys:
+            merged_translation[key] = cached[data[key]][0]
 
-            result["original_input"] = data
-            result["iterations"] = total_iterations
-            result["final_translation"] = merged_final_translation
+        result["original_input"] = data
+        result["iterations"] = total_iterations
+        # rebuild in source key order, keeping the source value for missing keys
+        result["final_translation"] = {
+            key: merged_translation.get(key, value) for key, value in data.items()
+        }
+        result["failed_keys"] = failed_keys
+        result["format_issues"] = format_issues
+        result["cache_hits"] = len(hit_keys)
+        result["untranslatable_values"] = len(untranslatable_keys)
+        result["dedup_ratio"] = dedup.ratio
 
         return result
 
-    def process_translation(
+    def _plan(self, data: Dict[str, Any]) -> Plan:
+        """Language-independent plan of a dictionary: its values as sent to
+        the model, the spans masked in them, the keys with nothing to
+        translate, and the keys of distinct values among the others."""
+        source, spans = self._mask_data(data)
+        untranslatable_keys = {
+            key
+            for key, value in source.items()
+            if self.masking and not is_translatable(value)
+        }
+        translatable = {
+            key: value
+            for key, value in source.items()
+            if key not in untranslatable_keys
+        }
+        dedup = (
+            deduplicate(translatable) if self.dedup else Deduplication(translatable, {})
+        )
+
+        return source, spans, untranslatable_keys, dedup
+
+    def _mask_data(
+        self, data: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+        """Values as sent to the model, and the spans masked in each of them."""
+        if not self.masking:
+            return data, {}
+
+        masked = {key: mask_value(value) for key, value in data.items()}
+
+        return (
+            {key: value for key, (value, _) in masked.items()},
+            {key: spans for key, (_, spans) in masked.items() if spans},
+        )
+
+    def _unmask_data(
+        self, translation: Dict[str, Any], spans: Dict[str, List[str]]
+    ) -> Dict[str, Any]:
+        return {
+            key: unmask_value(value, spans[key]) if key in spans else value
+            for key, value in translation.items()
+        }
+
+    async def translate_text(
+        self,
+        text: str,
+        target_language: str,
+        query_info: Optional[QueryInfoState] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Translate a plain string, consulting the translation memory first.
+
+        ``on_progress`` receives the text as the model streams it (``draft``)
+        and once the review accepted it (``approved``).
+
+        With masking, text made only of placeholders, markup and links is
+        returned as is.
+        """
+        masked, spans = mask(text) if self.masking else (text, [])
+
+        if not is_translatable(masked) and self.masking:
+            untranslatable_values.inc()
+
+            return {
+                "is_json": False,
+                "is_string": True,
+                "original_input": text,
+                "target_language": target_language,
+                "final_translation": text,
+                "translation_rating": 5,
+                "review_decision": "APPROVE",
+                "review_reasoning": "Nothing to translate",
+                "iterations": 0,
+                "format_issues": [],
+                "cache_hits": 0,
+            }
+
+        if self.memory:
+            cached = await self.memory.aget_many(
+                [text], target_language, self.prompt_version
+            )
+
+            if text in cached:
+                translation, rating = cached[text]
+
+                return {
+                    "is_json": False,
+                    "is_string": True,
+                    "original_input": text,
+                    "target_language": target_language,
+                    "final_translation": translation,
+                    "translation_rating": rating,
+                    "review_decision": "APPROVE",
+                    "review_reasoning": "Served from translation memory",
+                    "iterations": 0,
+                    "format_issues": [],
+                    "cache_hits": 1,
+                }
+
+        async def on_text_progress(kind: str, translation: Any):
+            await on_progress(
+                {
+                    "status": kind,
+                    "text": unmask_value(translation, spans),
+                    "completed_count": int(kind == "approved"),
+                    "total_count": 1,
+                }
+            )
+
+        result = await self.translate_single(
+            masked,
+            target_language,
+            is_string=True,
+            query_info=query_info,
+            on_progress=on_text_progress if on_progress else None,
+        )
+        result["original_input"] = text
+        result["final_translation"] = unmask_value(result["final_translation"], spans)
+
+        # malformed JSON comes back as a repaired object; only cache plain strings
+        if (
+            self.memory
+            and isinstance(result["final_translation"], str)
+            and not result["iteration_limit"]
+        ):
+            await self.memory.aput_many(
+                {text: result["final_translation"]},
+                target_language,
+                self.prompt_version,
+                rating=result["translation_rating"],
+            )
+
+        return result
+
+    async def prepare(self, text: Union[str, Dict[str, Any]]) -> PreparedInput:
+        """Parse, assess, repair and chunk an input once for all target languages."""
+        data = text if isinstance(text, dict) else None
+
+        if data is None:
+            try:
+                parsed = json.loads(text)
+            except json.JSONDecodeError:
+                parsed = None
+
+            if isinstance(parsed, dict):
+                data = parsed
+
+        if data is None:
+            state = await self.graph.aassess(text, is_string=True)
+
+            if not state.is_json:
+                return PreparedInput(text=text, query_info=state.query_info)
+
+            # malformed JSON repaired during assessment; only objects are split
+            # into keys, anything else goes through the graph as text
+            repaired = json.loads(state.original_input_query)
+
+            if not isinstance(repaired, dict):
+                return PreparedInput(
+                    text=state.original_input_query, query_info=state.query_info
+                )
+
+            data = repaired
+
+        # sized by what is sent to the model
+        plan = self._plan(data)
+
+        return PreparedInput(
+            data=data, chunks=self.chunker.chunk(plan[3].unique), plan=plan
+        )
+
+    async def translate_prepared(
+        self,
+        prepared: PreparedInput,
+        target_language: str,
+        on_progress: Optional[ProgressCallback] = None,
+        completed_chunks: Optional[Dict[int, Dict[str, Any]]] = None,
+        on_chunk_completed: Optional[ChunkCallback] = None,
+    ) -> Dict[str, Any]:
+        """Run the language-specific stages for one target language.
+
+        Chunk checkpoints only apply to dictionaries, see
+        ``translate_dict_batched``. The result carries the ``usage`` of the
+        graph nodes and LLM calls the language took, see ``core.usage``.
+        """
+        with track_usage() as usage:
+            if prepared.data is not None:
+                result = await self.translate_dict_batched(
+                    prepared.data,
+                    target_language,
+                    chunks=prepared.chunks,
+                    on_progress=on_progress,
+                    completed_chunks=completed_chunks,
+                    on_chunk_completed=on_chunk_completed,
+                    plan=prepared.plan,
+                )
+            else:
+                result = await self.translate_text(
+                    prepared.text,
+                    target_language,
+                    query_info=prepared.query_info,
+                    on_progress=on_progress,
+                )
+
+        return {**result, "usage": usage.summary()}
+
+    async def process_translation_multi(
+        self,
+        text: Union[str, Dict[str, Any]],
+        target_languages: List[str],
+        on_language_started: Optional[Callable[[str], Awaitable[None]]] = None,
+        on_language_completed: Optional[
+            Callable[[str, Dict[str, Any]], Awaitable[None]]
+        ] = None,
+        on_language_failed: Optional[
+            Callable[[str, Exception], Awaitable[None]]
+        ] = None,
+        on_language_progress: Optional[
+            Callable[[str, Dict[str, Any]], Awaitable[None]]
+        ] = None,
+    ) -> Dict[str, Any]:
+        """Translate an input into several languages concurrently.
+
+        The input is prepared once; only translate/review/format run per
+        language. Without ``on_language_failed`` the first failure is raised,
+        otherwise failed languages are reported through it and left out of
+        the result. ``on_language_progress`` streams partial results of each
+        language, see ``translate_dict_batched`` and ``translate_text``.
+        """
+        prepared = await self.prepare(text)
+
+        async def translate_language(language: str):
+            if on_language_started:
+                await on_language_started(language)
+
+            async def on_progress(event: Dict[str, Any]):
+                await on_language_progress(language, event)
+
+            try:
+                result = await self.translate_prepared(
+                    prepared,
+                    language,
+                    on_progress=on_progress if on_language_progress else None,
+                )
+            except Exception as e:
+                if on_language_failed is None:
+                    raise
+
+                await on_language_failed(language, e)
+                return None
+
+            if on_language_completed:
+                await on_language_completed(language, result)
+
+            return result
+
+        results = await asyncio.gather(
+            *(translate_language(language) for language in target_languages)
+        )
+
+        return {
+            language: result
+            for language, result in zip(target_languages, results)
+            if result is not None
+        }
+
+    async def process_translation(
         self,
         text: Union[str, Dict[str, Any]],
         target_language: str,
-        chunk_size: int = 40,
     ):
         """Process translation for either string or dictionary input."""
+        prepared = await self.prepare(text)
 
-        try:
-            json_data = json.loads(text)
-            return self.translate_dict_batched(json_data, target_language, chunk_size)
-        except json.JSONDecodeError:
-            return self.translate_single(text, target_language, is_string=True)
+        return await self.translate_prepared(prepared, target_language)
 
 
 # Create service instance
-translator_service = TranslatorService()
+translator_service = TranslatorService(memory=TranslationMemory.from_settings())
@@ -0,0 +1,99 @@
+"""Encoding of outgoing WebSocket frames.
+
+Clients that offer none of ``SUBPROTOCOLS`` get full messages as JSON text.
+The compact subprotocols leave out the inputs that results used to echo and
+send completed results as a diff against the keys already approved in
+``language_translation_partial`` messages, as JSON text or MessagePack
+binary frames.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional; frames are serialized with json then
+    orjson = None
+
+try:
+    import ormsgpack
+except ImportError:  # optional; the MessagePack subprotocol is not offered then
+    ormsgpack = None
+
+COMPACT_JSON = "ak-translator.compact.json"
+COMPACT_MSGPACK = "ak-translator.compact.msgpack"
+SUBPROTOCOLS = (COMPACT_MSGPACK, COMPACT_JSON)
+
+
+def encode_json(frame: Dict[str, Any]) -> str:
+    """Serialize a frame; orjson is several times faster than ``json`` on results."""
+    if orjson is None:
+        return json.dumps(frame, separators=(",", ":"), ensure_ascii=False)
+
+    return orjson.dumps(frame, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def encode_msgpack(frame: Dict[str, Any]) -> bytes:
+    return ormsgpack.packb(frame, option=ormsgpack.OPT_NON_STR_KEYS)
+
+
+def negotiate(offered: List[str]) -> Optional[str]:
+    """The first subprotocol offered by the client that this server speaks."""
+    for subprotocol in offered:
+        if subprotocol == COMPACT_MSGPACK and ormsgpack is None:
+            continue
+
+        if subprotocol in SUBPROTOCOLS:
+            return subprotocol
+
+    return None
+
+
+class Compactor:
+    """Rewrites the messages of one connection for the compact subprotocols.
+
+    Remembers the approved keys sent to the client, per job and language,
+    until the language completes; messages must be compacted in the order
+    they are sent.
+    """
+
+    def __init__(self):
+        self.approved: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def compact(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        kind = message["type"]
+        key = (message.get("job_id"), message.get("language"))
+
+        if kind == "language_translation_partial" and "translations" in message:
+            self.approved.setdefault(key, {}).update(message["translations"])
+            return message
+
+        if kind == "language_translation_failed":
+            self.approved.pop(key, None)
+            return message
+
+        if kind != "language_translation_completed":
+            return message
+
+        approved = self.approved.pop(key, None)
+        result = {
+            name: value
+            for name, value in message["translated_text"].items()
+            if name != "original_input"
+        }
+        compacted = {
+            name: value for name, value in message.items() if name != "original_text"
+        }
+        compacted["translated_text"] = result
+        final = result.get("final_translation")
+
+        if approved and isinstance(final, dict):
+            # the client merges these over the approved keys it already has
+            result["final_translation"] = {
+                name: value
+                for name, value in final.items()
+                if name not in approved or approved[name] != value
+            }
+            compacted["diff"] = True
+
+        return compacted
@@ -0,0 +1,212 @@
+"""Outbound queue and writer of one WebSocket client.
+
+Messages are queued without waiting for the socket, so a slow client never
+holds up the job or broadcast producing them. A writer task drains the
+queue, coalescing progress messages that pile up into one ``batch`` frame,
+and encodes frames in the subprotocol negotiated with the client.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from fastapi import WebSocket
+
+from core.metrics import metrics
+from websocket.codec import (
+    COMPACT_MSGPACK,
+    Compactor,
+    encode_json,
+    encode_msgpack,
+)
+
+logger = logging.getLogger(__name__)
+
+# streamed partial results; a later message or the completed result supersedes them
+PROGRESS_MESSAGES = ("language_translation_draft", "language_translation_partial")
+
+# slow clients lose progress messages, and are closed if other messages overflow
+POLICY_DROP_PROGRESS = "drop_progress"
+# slow clients are closed as soon as their queue overflows
+POLICY_CLOSE = "close"
+
+# "try again later"; the client reconnects and subscribes to its job again
+CLOSE_SLOW_CONSUMER = 1013
+
+ws_frames = metrics.counter(
+    "ws_frames_sent_total", "WebSocket frames sent to clients", ["kind"]
+)
+ws_messages = metrics.counter(
+    "ws_messages_sent_total", "Messages sent to clients, batched or not"
+)
+ws_bytes = metrics.counter("ws_bytes_sent_total", "Bytes of WebSocket frames sent")
+ws_dropped = metrics.counter(
+    "ws_messages_dropped_total",
+    "Messages dropped because the client's queue was full",
+    ["type"],
+)
+ws_slow_clients = metrics.counter(
+    "ws_slow_clients_closed_total", "Clients closed for not keeping up"
+)
+ws_encode = metrics.counter(
+    "ws_encode_seconds_total", "Time spent serializing WebSocket frames"
+)
+
+
+def coalesce(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge consecutive progress messages of the same job and language."""
+    merged: List[Dict[str, Any]] = []
+
+    for message in messages:
+        previous = merged[-1] if merged else None
+
+        if (
+            previous is not None
+            and message["type"] in PROGRESS_MESSAGES
+            and previous["type"] == message["type"]
+            and previous.get("job_id") == message.get("job_id")
+            and previous.get("language") == message.get("language")
+            and ("translations" in previous) == ("translations" in message)
+        ):
+            combined = {**previous, **message}
+
+            # keys arrive in pieces; text is sent whole
+            if "translations" in message:
+                combined["translations"] = {
+                    **previous["translations"],
+                    **message["translations"],
+                }
+
+            merged[-1] = combined
+        else:
+            merged.append(message)
+
+    return merged
+
+
+class ClientConnection:
+    def __init__(
+        self,
+        client_id: str,
+        websocket: WebSocket,
+        on_closed: Callable[["ClientConnection"], Awaitable[None]],
+        queue_size: int = 1000,
+        batch_linger: float = 0.02,
+        batch_max_messages: int = 100,
+        slow_client_policy: str = POLICY_DROP_PROGRESS,
+        subprotocol: Optional[str] = None,
+    ):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.on_closed = on_closed
+        self.batch_linger = batch_linger
+        self.batch_max_messages = batch_max_messages
+        self.slow_client_policy = slow_client_policy
+        self.subprotocol = subprotocol
+        # full messages for clients that did not negotiate a compact subprotocol
+        self.compactor = Compactor() if subprotocol else None
+
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.closed = False
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write())
+
+    def stop(self):
+        self.closed = True
+
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+    def enqueue(self, message: Dict[str, Any]) -> bool:
+        """Queue a message. Returns False if the client is closed or was too slow."""
+        if self.closed:
+            return False
+
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if (
+            self.slow_client_policy == POLICY_DROP_PROGRESS
+            and message["type"] in PROGRESS_MESSAGES
+        ):
+            ws_dropped.inc(type=message["type"])
+            return True
+
+        ws_dropped.inc(type=message["type"])
+        ws_slow_clients.inc()
+        logger.warning(
+            f"Closing slow client {self.client_id}: "
+            f"{self.queue.qsize()} messages waiting"
+        )
+        self.closed = True
+        asyncio.create_task(self._close_slow())
+
+        return False
+
+    async def _close_slow(self):
+        try:
+            await self.websocket.close(code=CLOSE_SLOW_CONSUMER)
+        except Exception as e:
+            logger.error(f"Failed to close {self.client_id}: {e}")
+
+        await self.on_closed(self)
+
+    def encode(self, frame: Dict[str, Any]) -> Union[str, bytes]:
+        if self.subprotocol == COMPACT_MSGPACK:
+            return encode_msgpack(frame)
+
+        return encode_json(frame)
+
+    def _next_batch(self, first: Dict[str, Any]) -> List[Dict[str, Any]]:
+        batch = [first]
+
+        while len(batch) < self.batch_max_messages and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+
+        return coalesce(batch)
+
+    async def _write(self):
+        while True:
+            message = await self.queue.get()
+
+            if message["type"] in PROGRESS_MESSAGES and self.batch_linger > 0:
+                # let more progress pile up and go out in the same frame
+                await asyncio.sleep(self.batch_linger)
+
+            batch = self._next_batch(message)
+
+            if self.compactor is not None:
+                batch = [self.compactor.compact(message) for message in batch]
+
+            frame = (
+                batch[0] if len(batch) == 1 else {"type": "batch", "messages": batch}
+            )
+
+            started = time.perf_counter()
+            data = self.encode(frame)
+            ws_encode.inc(time.perf_counter() - started)
+
+            try:
+                if isinstance(data, bytes):
+                    await self.websocket.send_bytes(data)
+                else:
+                    await self.websocket.send_text(data)
+            except Exception as e:
+                logger.error(f"Failed to send to {self.client_id}: {e}")
+                self.closed = True
+                await self.on_closed(self)
+                return
+
+            ws_frames.inc(kind="batch" if len(batch) > 1 else "single")
+            ws_messages.inc(len(batch))
+            ws_bytes.inc(len(data))
+            logger.debug(
+                f"Sent {frame['type']} to {self.client_id}: "
+                f"{len(batch)} messages, {len(data)} bytes"
+            )
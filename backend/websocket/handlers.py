@@ -1,11 +1,26 @@
-import asyncio
-from typing import Any, Dict, List
+import uuid
+import hashlib
+from typing import Any, Dict, Optional
 
 from websocket.manager import ws_manager
-from services.translator import translator_service
+from services.jobs import FINAL_EVENTS, job_queue
 from config.constants import SUPPORTED_LANGUAGES
 
 
+def client_job_id(client_id: str, job_id: Optional[str] = None) -> str:
+    """Scope a job id to a client, so ids sent by clients never reach another's jobs.
+
+    Ids already scoped to the client, as sent back in job events, are kept.
+    """
+    # hex digits only, so no client's prefix is a prefix of another's
+    prefix = f"job_{hashlib.sha256(client_id.encode()).hexdigest()[:32]}_"
+
+    if job_id and job_id.startswith(prefix):
+        return job_id
+
+    return f"{prefix}{job_id or uuid.uuid4().hex}"
+
+
 async def handle_websocket_message(client_id: str, message: Dict[str, Any]):
     """Handle incoming WebSocket messages."""
     msg_type = message.get("type")
@@ -13,105 +28,69 @@ async def handle_websocket_message(client_id: str, message: Dict[str, Any]):
     if msg_type == "translate_multi":
         await handle_multi_translation_request(client_id, message)
 
+    elif msg_type == "subscribe":
+        await handle_subscribe_request(client_id, message)
+
     elif msg_type == "ping":
         await ws_manager.send_to_client(client_id, {"type": "pong"})
 
 
 async def handle_multi_translation_request(client_id: str, message: Dict[str, Any]):
-    """Handle multi-language translation request."""
-    try:
-        text = message.get("text", "")
-        target_languages = SUPPORTED_LANGUAGES
-
-        job_id = message.get(
-            "job_id", f"job_{client_id}_{asyncio.get_event_loop().time()}"
-        )
-
-        if not target_languages:
-            await ws_manager.send_to_client(
-                client_id,
-                {"type": "translation_error", "error": "No target languages specified"},
-            )
-            return
-
-        # Send job started
+    """Queue a multi-language translation job and follow its progress.
+
+    The job runs on the job queue's workers, not on this connection, so it
+    survives a disconnect; the client gets it back with ``subscribe``.
+    Sending the same ``job_id`` again does not queue the job twice; the id
+    is scoped to the client, and events carry the scoped id.
+    """
+    text = message.get("text", "")
+    target_languages = SUPPORTED_LANGUAGES
+    job_id = client_job_id(client_id, message.get("job_id"))
+
+    if not target_languages:
         await ws_manager.send_to_client(
             client_id,
-            {
-                "type": "multi_translation_started",
-                "job_id": job_id,
-                "total_languages": len(target_languages),
-                "languages": target_languages,
-            },
-        )
-
-        # Start translations for all languages concurrently
-        tasks = []
-
-        for language in target_languages:
-            task = asyncio.create_task(
-                translate_single_language(
-                    client_id, job_id, text, language, target_languages
-                )
-            )
-            tasks.append(task)
-
-        # Wait for all translations to complete
-        await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Send completion message
-        await ws_manager.send_to_client(
-            client_id, {"type": "multi_translation_completed", "job_id": job_id}
+            {"type": "translation_error", "error": "No target languages specified"},
         )
+        return
 
+    try:
+        await job_queue.submit(text, target_languages, job_id=job_id)
     except Exception as e:
         await ws_manager.send_to_client(
             client_id, {"type": "translation_error", "job_id": job_id, "error": str(e)}
         )
+        return
 
+    await subscribe_client(client_id, job_id)
 
-async def translate_single_language(
-    client_id: str, job_id: str, text: str, language: str, all_languages: List[str]
-):
-    """Translate text to a single language and send result immediately."""
-    try:
-        # Send progress for this language
-        await ws_manager.send_to_client(
-            client_id,
-            {
-                "type": "language_translation_started",
-                "job_id": job_id,
-                "language": language,
-                "progress": f"Translating to {language}...",
-            },
-        )
 
-        # Perform translation
-        result = translator_service.process_translation(text, language)
+async def handle_subscribe_request(client_id: str, message: Dict[str, Any]):
+    """Follow a job submitted earlier, e.g. after reconnecting.
 
-        # Send completed translation immediately
-        await ws_manager.send_to_client(
-            client_id,
-            {
-                "type": "language_translation_completed",
-                "job_id": job_id,
-                "language": language,
-                "original_text": text,
-                "translated_text": result,
-                "completed_count": len(
-                    [lang for lang in all_languages if lang == language]
-                ),
-                "total_count": len(all_languages),
-            },
-        )
+    Only the client's own jobs can be followed.
+    """
+    job_id = message.get("job_id")
 
-    except Exception as e:
+    if not job_id or not await subscribe_client(
+        client_id, client_job_id(client_id, job_id)
+    ):
         await ws_manager.send_to_client(
             client_id,
-            {
-                "type": "language_translation_failed",
-                "job_id": job_id,
-                "language": language,
-                "error": str(e),
-            },
+            {"type": "translation_error", "job_id": job_id, "error": "Unknown job"},
         )
+
+
+async def subscribe_client(client_id: str, job_id: str) -> bool:
+    """Forward job events to a client until the job ends or the client leaves.
+
+    Job events reach every process, so they are sent to the client's socket
+    only if this process holds it.
+    """
+
+    async def send(event: Dict[str, Any]) -> bool:
+        sent = await ws_manager.send_local(client_id, event)
+
+        return sent and event["type"] not in FINAL_EVENTS
+
+    return await job_queue.subscribe(job_id, send)
@@ -1,64 +1,117 @@
 import logging
-import json
 
 from typing import Dict, Any, Optional
 from fastapi import WebSocket
 
+from config.settings import settings
+from core.pubsub import PubSub, Subscriber, pubsub
+from websocket.connection import ClientConnection
+
 logger = logging.getLogger(__name__)
 
+BROADCAST_CHANNEL = "clients"
+
+
+def client_channel(client_id: str) -> str:
+    return f"clients.{client_id}"
+
 
 class WebSocketManager:
-    def __init__(self):
-        self.connections: Dict[str, WebSocket] = {}
+    """Connections of this process, reachable from every process through ``bus``."""
+
+    def __init__(self, bus: PubSub):
+        self.bus = bus
+        self.connections: Dict[str, ClientConnection] = {}
+        self._subscriptions: Dict[str, Subscriber] = {}
 
-    def connect(self, client_id: str, websocket: WebSocket):
-        """Add a new WebSocket connection."""
-        self.connections[client_id] = websocket
+    async def start(self):
+        await self.bus.subscribe(BROADCAST_CHANNEL, self._on_broadcast)
+
+    async def stop(self):
+        await self.bus.unsubscribe(BROADCAST_CHANNEL, self._on_broadcast)
+
+    async def connect(
+        self, client_id: str, websocket: WebSocket, subprotocol: Optional[str] = None
+    ):
+        """Add a new WebSocket connection, speaking the negotiated ``subprotocol``."""
+        if client_id in self.connections:
+            self.connections[client_id].stop()
+
+        connection = ClientConnection(
+            client_id,
+            websocket,
+            self._on_connection_closed,
+            queue_size=settings.WS_SEND_QUEUE_SIZE,
+            batch_linger=settings.WS_BATCH_LINGER,
+            batch_max_messages=settings.WS_BATCH_MAX_MESSAGES,
+            slow_client_policy=settings.WS_SLOW_CLIENT_POLICY,
+            subprotocol=subprotocol,
+        )
+        connection.start()
+        self.connections[client_id] = connection
+
+        if client_id not in self._subscriptions:
+
+            async def on_message(message: Dict[str, Any]):
+                await self.send_local(client_id, message)
+
+            self._subscriptions[client_id] = on_message
+            await self.bus.subscribe(client_channel(client_id), on_message)
 
         logger.info(
             f"Client {client_id} connected. Total connections: {len(self.connections)}"
         )
 
-    def disconnect(self, client_id: str):
+    async def disconnect(self, client_id: str):
         """Remove WebSocket connection."""
+        on_message = self._subscriptions.pop(client_id, None)
+
+        if on_message is not None:
+            await self.bus.unsubscribe(client_channel(client_id), on_message)
+
         if client_id in self.connections:
-            del self.connections[client_id]
+            self.connections.pop(client_id).stop()
 
             logger.info(
                 f"Client {client_id} disconnected. Total connections: {len(self.connections)}"
             )
 
     async def send_to_client(self, client_id: str, message: Dict[str, Any]):
-        """Send message to specific client."""
+        """Send message to specific client, held by this or another process."""
         if client_id in self.connections:
-            try:
-                logger.info(f"Sending message to {client_id}: {message}")
-                await self.connections[client_id].send_text(json.dumps(message))
-                return True
+            return await self.send_local(client_id, message)
+
+        await self.bus.publish(client_channel(client_id), message)
 
-            except Exception as e:
-                logger.error(f"Failed to send to {client_id}: {e}")
-                self.disconnect(client_id)
+        return True
 
-                return False
-        return False
+    async def send_local(self, client_id: str, message: Dict[str, Any]) -> bool:
+        """Queue message for a client of this process, without waiting for the socket.
 
-    def broadcast(self, message: Dict[str, Any], exclude_client: Optional[str] = None):
-        """Send message to all connected clients."""
-        failed_clients = []
+        Returns False if the client is not here or was closed for being slow.
+        """
+        connection = self.connections.get(client_id)
 
-        for client_id, websocket in self.connections.items():
-            if client_id != exclude_client:
-                try:
-                    websocket.send_json(message)
+        return connection is not None and connection.enqueue(message)
 
-                except Exception as e:
-                    logger.error(f"Failed to broadcast to {client_id}: {e}")
-                    failed_clients.append(client_id)
+    async def _on_connection_closed(self, connection: ClientConnection):
+        # the client may already have reconnected with a new connection
+        if self.connections.get(connection.client_id) is connection:
+            await self.disconnect(connection.client_id)
+
+    async def broadcast(
+        self, message: Dict[str, Any], exclude_client: Optional[str] = None
+    ):
+        """Send message to all connected clients of every process."""
+        await self.bus.publish(
+            BROADCAST_CHANNEL, {"message": message, "exclude_client": exclude_client}
+        )
 
-        # Clean up failed connections
-        for client_id in failed_clients:
-            self.disconnect(client_id)
+    async def _on_broadcast(self, envelope: Dict[str, Any]):
+        # queued for every client at once; each writer sends at its own pace
+        for client_id, connection in list(self.connections.items()):
+            if client_id != envelope["exclude_client"]:
+                connection.enqueue(envelope["message"])
 
     def get_connection_count(self) -> int:
         """Get number of active connections."""
@@ -69,4 +122,4 @@ class WebSocketManager:
         return list(self.connections.keys())
 
 
-ws_manager = WebSocketManager()
+ws_manager = WebSocketManager(pubsub)
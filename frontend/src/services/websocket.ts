@@ -8,18 +8,37 @@ export interface TranslationMessage {
   progress?: string
   error?: string
   job_id?: string
+  // language_translation_partial / language_translation_draft
+  translations?: Record<string, unknown>
+  text?: string
+  // batch: several messages sent in one frame, in order
+  messages?: TranslationMessage[]
+  // compact protocol: final_translation only holds keys not already approved
+  diff?: boolean
+}
+
+export interface PartialTranslation {
+  language: string
+  // reviewed keys (or text) that will not change any more
+  approved: Record<string, unknown> | string
+  // unreviewed model output, replaced as keys get approved
+  draft: Record<string, unknown> | string
+  completed_count: number
+  total_count: number
 }
 
 export interface TranslationResult {
   is_json: boolean
   is_string: boolean
-  original_input: string
+  // left out by the compact protocol
+  original_input?: string
   target_language: string
   final_translation: string | object
   translation_rating: number
   review_decision: string
   review_reasoning: string
   iterations: number
+  failed_keys?: string[]
 }
 
 export interface WebSocketCallbacks {
@@ -31,12 +50,24 @@ export interface WebSocketCallbacks {
   onError?: (error: string, language?: string) => void
 }
 
+// sent by the server when this client's outbound queue overflows
+const SLOW_CONSUMER_CLOSE_CODE = 1013
+
+// results without echoed inputs, as diffs against approved partial results;
+// servers that do not speak it send full messages
+const COMPACT_PROTOCOL = 'ak-translator.compact.json'
+
 // src/services/websocket.ts
 class TranslationWebSocket {
   private ws: WebSocket | null = null
   private clientId: string
   private isConnected: boolean = false
   private translations: Map<string, TranslationResult> = new Map()
+  private partials: Map<string, PartialTranslation> = new Map()
+  // job in progress, followed again after a reconnect
+  private jobId: string | null = null
+  // input of that job, giving the key order of diffed results
+  private sourceText: string = ''
   private wsUrl: string
 
   // Event callbacks
@@ -45,6 +76,7 @@ class TranslationWebSocket {
   public onLanguageCompleted?: (result: TranslationResult) => void
   public onAllCompleted?: (translations: Map<string, TranslationResult>) => void
   public onProgress?: (language: string, message: string) => void
+  public onPartialResult?: (partial: PartialTranslation) => void
   public onTranslationError?: (error: string, language?: string) => void
   public onConnectionError?: (error: string) => void
 
@@ -59,10 +91,16 @@ class TranslationWebSocket {
 
   public connect(): void {
     try {
-      this.ws = new WebSocket(`${this.wsUrl}/ws/${this.clientId}`)
+      this.ws = new WebSocket(`${this.wsUrl}/ws/${this.clientId}`, [COMPACT_PROTOCOL])
 
       this.ws.onopen = () => {
         this.isConnected = true
+
+        if (this.jobId) {
+          // the job kept running on the server; completed languages are replayed
+          this.ws?.send(JSON.stringify({ type: 'subscribe', job_id: this.jobId }))
+        }
+
         this.onConnect?.()
         console.log('WebSocket connected')
       }
@@ -72,10 +110,15 @@ class TranslationWebSocket {
         this.handleMessage(message)
       }
 
-      this.ws.onclose = () => {
+      this.ws.onclose = event => {
         this.isConnected = false
         console.log('WebSocket disconnected')
         this.onDisconnect?.()
+
+        // closed for falling behind; the job is followed again after reconnecting
+        if (event.code === SLOW_CONSUMER_CLOSE_CODE && this.jobId) {
+          this.reconnect()
+        }
       }
 
       this.ws.onerror = error => {
@@ -92,10 +135,25 @@ class TranslationWebSocket {
     const { type } = message
 
     switch (type) {
+      case 'batch':
+        message.messages?.forEach(batched => this.handleMessage(batched))
+        break
+
       case 'language_translation_completed':
         if (message.language && message.translated_text) {
-          this.translations.set(message.language, message.translated_text)
-          this.onLanguageCompleted?.(message.translated_text)
+          const result = message.diff
+            ? this.applyDiff(message.language, message.translated_text)
+            : message.translated_text
+          this.translations.set(message.language, result)
+          this.onLanguageCompleted?.(result)
+        }
+
+        break
+
+      case 'language_translation_partial':
+      case 'language_translation_draft':
+        if (message.language) {
+          this.onPartialResult?.(this.updatePartial(message))
         }
 
         break
@@ -108,16 +166,75 @@ class TranslationWebSocket {
         break
 
       case 'multi_translation_completed':
+        this.jobId = null
         this.onAllCompleted?.(this.translations)
         break
 
-      case 'language_translation_failed':
       case 'translation_error':
+        this.jobId = null
+        this.onTranslationError?.(message.error || 'Unknown error', message.language)
+        break
+
+      case 'language_translation_failed':
         this.onTranslationError?.(message.error || 'Unknown error', message.language)
         break
     }
   }
 
+  private updatePartial(message: TranslationMessage): PartialTranslation {
+    const language = message.language as string
+    const isApproved = message.type === 'language_translation_partial'
+    const partial = this.partials.get(language) || {
+      language,
+      approved: message.text !== undefined ? '' : {},
+      draft: message.text !== undefined ? '' : {},
+      completed_count: 0,
+      total_count: 0,
+    }
+
+    if (message.text !== undefined) {
+      partial[isApproved ? 'approved' : 'draft'] = message.text
+    } else if (message.translations) {
+      const target = isApproved ? 'approved' : 'draft'
+      partial[target] = { ...(partial[target] as Record<string, unknown>), ...message.translations }
+    }
+
+    partial.completed_count = message.completed_count ?? partial.completed_count
+    partial.total_count = message.total_count ?? partial.total_count
+    this.partials.set(language, partial)
+
+    return partial
+  }
+
+  private applyDiff(language: string, result: TranslationResult): TranslationResult {
+    const approved = this.partials.get(language)?.approved
+    const merged: Record<string, unknown> = {
+      ...(approved as Record<string, unknown>),
+      ...(result.final_translation as Record<string, unknown>),
+    }
+    let source: unknown = null
+
+    try {
+      source = JSON.parse(this.sourceText)
+    } catch {
+      // not JSON; keep the order the keys arrived in
+    }
+
+    if (source && typeof source === 'object' && !Array.isArray(source)) {
+      const ordered: Record<string, unknown> = {}
+
+      for (const key of Object.keys(source)) {
+        if (key in merged) {
+          ordered[key] = merged[key]
+        }
+      }
+
+      return { ...result, final_translation: ordered }
+    }
+
+    return { ...result, final_translation: merged }
+  }
+
   private regenerateClientId(): void {
     this.clientId = this.generateClientId()
   }
@@ -128,11 +245,16 @@ class TranslationWebSocket {
     }
 
     this.translations.clear()
+    this.partials.clear()
+    this.sourceText = text
+
+    // unique across clients: resending a known job_id joins that job
+    this.jobId = `job_${Date.now()}_${Math.random().toString(36).substring(2, 11)}`
 
     const message = {
       type: 'translate_multi',
       text: text,
-      job_id: `job_${Date.now()}`,
+      job_id: this.jobId,
     }
 
     this.ws?.send(JSON.stringify(message))